@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import logging
 import os
@@ -5,34 +6,101 @@ import sys
 
 sys.path.append(os.path.abspath("../"))
 from src.core.oracle_core import (
-    load_review_raw,
-    load_review_processed,
-    load_bank_detail
+    init_pool,
+    close_pool,
+    load_chunks,
+    load_concurrently,
+    load_rollups,
+    DEFAULT_BATCH_SIZE,
+    POOL_MIN,
+    POOL_MAX
 )
-from src.utils.utils import load_data, clean_data
+from src.utils.utils import iter_data_chunks, prefetch, clean_data
+from src.utils.instrumentation import export_metrics
+from src.utils.rollups import ReviewRollup
+from src.utils.review_index import ReviewIndex
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s")
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load review data into Oracle.")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="MERGE only rows at or after the per-bank high-water mark "
+             "instead of inserting everything"
+    )
+    parser.add_argument(
+        "--state-path", default="../data/processed/load_high_water_marks.json",
+        help="where the per-bank high-water marks are persisted in incremental mode"
+    )
+    parser.add_argument(
+        "--rollup-dir", default="../data/processed/rollups",
+        help="where the per-bank / per-day aggregates behind bank_detail are persisted"
+    )
+    parser.add_argument(
+        "--index-dir", default="../data/processed/review_index",
+        help="where the keyword / theme / bank / date index of the processed "
+             "reviews is kept"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--chunksize", type=int, default=100_000,
+                        help="CSV rows parsed at a time; the next chunk is parsed "
+                             "while the current one loads")
+    parser.add_argument("--pool-min", type=int, default=POOL_MIN,
+                        help="Oracle sessions kept open")
+    parser.add_argument("--pool-max", type=int, default=POOL_MAX,
+                        help="Oracle sessions allowed at once")
+    parser.add_argument("--metrics", default=None,
+                        help="write per-stage metrics to this file "
+                             "(.prom for Prometheus text, else JSON)")
+    return parser.parse_args(argv)
+
+def folded_into(chunks, *aggregates):
+    for chunk in chunks:
+        for aggregate in aggregates:
+            aggregate.update(chunk)
+        yield chunk
+
+def main(argv=None):
+    args = parse_args(argv)
     raw_csv = "../data/processed/cleaned_reviews.csv"
     processed_csv = "../data/processed/reviews with sentiments and themes.csv"
+    state_path = args.state_path if args.incremental else None
+    init_pool(args.pool_min, args.pool_max)
 
-    # Load review_raw
-    df_raw = load_data(raw_csv)
-    logging.info("Loading review_raw...")
-    load_review_raw(df_raw)
-
-    # Load review_processed
-    df_processed = load_data(processed_csv)
-    df_processed = clean_data(df_processed)
-    logging.info("Loading review_processed...")
-    load_review_processed(df_processed)
+    # review_raw and review_processed load side by side on their own pooled
+    # sessions; the processed chunks are folded into the rollups and the
+    # review index on the way
+    rollup = ReviewRollup.load(args.rollup_dir)
+    index = ReviewIndex.load(args.index_dir)
+    raw_chunks = prefetch(iter_data_chunks(raw_csv, args.chunksize))
+    processed_chunks = folded_into(
+        (
+            clean_data(chunk)
+            for chunk in prefetch(iter_data_chunks(processed_csv, args.chunksize))
+        ),
+        rollup, index
+    )
+    logging.info("Loading review_raw and review_processed...")
+    load_concurrently({
+        "review_raw": lambda conn: load_chunks(
+            raw_chunks, "review_raw", conn, args.batch_size, state_path
+        ),
+        "review_processed": lambda conn: load_chunks(
+            processed_chunks, "review_processed", conn, args.batch_size, state_path
+        )
+    })
 
-    # Load bank_detail from processed
-    logging.info("Loading bank_detail (derived)...")
-    load_bank_detail(df_processed)
+    # bank_detail and bank_review_daily are upserted from the rollups
+    rollup.save(args.rollup_dir)
+    index.save(args.index_dir)
+    logging.info("Loading bank_detail and bank_review_daily...")
+    load_rollups(rollup)
+    close_pool()
 
     logging.info("✅ Data loading complete.")
+    if args.metrics:
+        export_metrics(args.metrics)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -33,7 +33,8 @@ def create_tables():
                     review_date DATE,
                     bank VARCHAR2(255),
                     source VARCHAR2(100),
-                    review_clean CLOB
+                    review_clean CLOB,
+                    content_hash VARCHAR2(64)
                 )
                 """,
                 "review_processed": """
@@ -48,9 +49,39 @@ def create_tables():
                     sentiment_label VARCHAR2(50),
                     sentiment_score FLOAT,
                     keyword_ready CLOB,
-                    identified_theme CLOB
+                    identified_theme CLOB,
+                    content_hash VARCHAR2(64)
                 )
                 """,
+                # Session-private staging for the incremental MERGE loads
+                "review_raw_stage": """
+                CREATE GLOBAL TEMPORARY TABLE BANK_REVIEWS.review_raw_stage (
+                    review_id VARCHAR2(100),
+                    review CLOB,
+                    rating NUMBER,
+                    review_date DATE,
+                    bank VARCHAR2(255),
+                    source VARCHAR2(100),
+                    review_clean CLOB,
+                    content_hash VARCHAR2(64)
+                ) ON COMMIT DELETE ROWS
+                """,
+                "review_processed_stage": """
+                CREATE GLOBAL TEMPORARY TABLE BANK_REVIEWS.review_processed_stage (
+                    review_id VARCHAR2(100),
+                    review CLOB,
+                    rating NUMBER,
+                    review_date DATE,
+                    bank VARCHAR2(255),
+                    source VARCHAR2(100),
+                    review_clean CLOB,
+                    sentiment_label VARCHAR2(50),
+                    sentiment_score FLOAT,
+                    keyword_ready CLOB,
+                    identified_theme CLOB,
+                    content_hash VARCHAR2(64)
+                ) ON COMMIT DELETE ROWS
+                """,
                 "bank_detail": """
                 CREATE TABLE BANK_REVIEWS.bank_detail (
                     bank_id VARCHAR2(100) PRIMARY KEY,
@@ -62,6 +93,28 @@ def create_tables():
                     negative_sentiment_count INT,
                     neutral_sentiment_count INT
                 )
+                """,
+                # Per bank and day rollups (src/utils/rollups.py),
+                # upserted by load_rollups
+                "bank_review_daily": """
+                CREATE TABLE BANK_REVIEWS.bank_review_daily (
+                    bank_id VARCHAR2(100),
+                    review_date DATE,
+                    bank_name VARCHAR2(255) NOT NULL,
+                    num_reviews INT,
+                    rating_sum FLOAT,
+                    rating_count INT,
+                    positive_count INT,
+                    negative_count INT,
+                    neutral_count INT,
+                    score_count INT,
+                    score_sum FLOAT,
+                    score_sqsum FLOAT,
+                    avg_rating FLOAT,
+                    avg_sentiment_score FLOAT,
+                    sentiment_score_std FLOAT,
+                    PRIMARY KEY (bank_id, review_date)
+                )
                 """
             }
 
@@ -80,6 +133,21 @@ def create_tables():
                     cursor.execute(ddl)
                     logging.info(f"Table '{table_name}' created successfully.")
 
+            # Tables created before incremental loads existed lack content_hash
+            for table_name in ("review_raw", "review_processed"):
+                cursor.execute(f"""
+                    SELECT COUNT(*)
+                    FROM user_tab_columns
+                    WHERE table_name = UPPER('{table_name}')
+                      AND column_name = 'CONTENT_HASH'
+                """)
+                if cursor.fetchone()[0] == 0:
+                    logging.info(f"Adding content_hash column to '{table_name}'...")
+                    cursor.execute(
+                        f"ALTER TABLE BANK_REVIEWS.{table_name} "
+                        "ADD (content_hash VARCHAR2(64))"
+                    )
+
     except oracledb.Error as e:
         logging.error(f"Oracle error: {e}")
     except Exception as e:
@@ -1,36 +1,74 @@
+import argparse
 import csv
+import hashlib
+import json
 import os
 import sys
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from google_play_scraper import reviews, Sort
+from google_play_scraper.constants.element import ElementSpecs
+from google_play_scraper.constants.request import Formats
+from google_play_scraper.features.reviews import (
+    MAX_COUNT_EACH_FETCH,
+    _ContinuationToken,
+    _fetch_review_items
+)
 
 sys.path.append(os.path.abspath("../"))
 from config.settings import get_base_data_dir
+from src.utils.instrumentation import instrumented, export_metrics
 
-# Load base directory from .env
-base_dir = get_base_data_dir()
+# 🔗 Bank apps to scrape
+BANK_APPS = {
+    'Commercial Bank of Ethiopia (CBE)': 'com.combanketh.mobilebanking',
+    'Bank of Abyssinia (BOA)': 'com.boa.boaMobileBanking',
+    'Dashen Bank': 'com.dashen.dashensuperapp'
+}
 
-# 📁 Define file path for log
-log_path = os.path.join(base_dir, 'scraped_reviews', 'scraper.log')
+# 🧾 CSV Header
+FIELDNAMES = ['review_id', 'review', 'rating', 'date', 'bank', 'source']
 
-# Create handlers
-console_handler = logging.StreamHandler()
-file_handler = logging.FileHandler(log_path, encoding='utf-8')
 
-# Set logging level
-console_handler.setLevel(logging.INFO)
-file_handler.setLevel(logging.INFO)
+def configure_logging(base_dir):
+    """Logs to the console and to scraped_reviews/scraper.log under base_dir."""
+    # 📁 Define file path for log
+    log_dir = os.path.join(base_dir, 'scraped_reviews')
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, 'scraper.log')
 
-# Define formatter
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(formatter)
-file_handler.setFormatter(formatter)
+    # Create handlers
+    console_handler = logging.StreamHandler()
+    file_handler = logging.FileHandler(log_path, encoding='utf-8')
 
-# Add handlers to root logger
-logging.basicConfig(level=logging.INFO, handlers=[console_handler, file_handler])
+    # Set logging level
+    console_handler.setLevel(logging.INFO)
+    file_handler.setLevel(logging.INFO)
 
+    # Define formatter
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(formatter)
+    file_handler.setFormatter(formatter)
 
+    # Add handlers to root logger
+    logging.basicConfig(level=logging.INFO, handlers=[console_handler, file_handler])
+
+
+def _structure(entry, bank_name):
+    return {
+        'review_id': entry['reviewId'],  # 🆔 Newly added column
+        'review': entry['content'],
+        'rating': entry['score'],
+        'date': entry['at'].strftime('%Y-%m-%d'),
+        'bank': bank_name,
+        'source': 'Google Play'
+    }
+
+
+@instrumented(rows="result", batch_size="count")
 def scrape_play_store_reviews(app_id, bank_name, count=500, lang='en', country='us'):
     """Fetch reviews for a single banking app."""
     logging.info(f"🔍 Scraping reviews for {bank_name}")
@@ -44,30 +82,296 @@ def scrape_play_store_reviews(app_id, bank_name, count=500, lang='en', country='
             filter_score_with=None
         )
 
-        structured_data = []
-        for entry in result:
-            structured_data.append({
-                'review_id': entry['reviewId'],  # 🆔 Newly added column
-                'review': entry['content'],
-                'rating': entry['score'],
-                'date': entry['at'].strftime('%Y-%m-%d'),
-                'bank': bank_name,
-                'source': 'Google Play'
-            })
-
-        return structured_data
+        return [_structure(entry, bank_name) for entry in result]
 
     except Exception as e:
         logging.error(f"❌ Failed scraping for {bank_name}: {e}")
         return []
 
-def main():
-    # 🔗 Define bank apps
-    bank_apps = {
-        'Commercial Bank of Ethiopia (CBE)': 'com.combanketh.mobilebanking',
-        'Bank of Abyssinia (BOA)': 'com.boa.boaMobileBanking',
-        'Dashen Bank': 'com.dashen.dashensuperapp'
-    }
+
+class RateLimiter:
+    """Spaces requests to one host 1 / requests_per_second apart, across threads."""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+def with_retries(fn, retries=4, backoff=1.0, sleep=time.sleep):
+    """Calls fn, retrying failures with exponential backoff (backoff, 2x, 4x, ...)."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logging.warning(f"⚠️ Request failed ({e}), retrying in {delay:.1f}s")
+            sleep(delay)
+
+
+def fetch_review_page(app_id, lang='en', country='us', sort=Sort.NEWEST, count=200,
+                      filter_score_with=None, continuation_token=None):
+    """
+    Fetches one page of reviews, with the same arguments and return value as
+    google_play_scraper.reviews. Unlike reviews(), a failed request raises
+    instead of returning a short page with a null token, which would look
+    like the last page and would never be retried.
+    """
+    if continuation_token is not None:
+        token = continuation_token.token
+        lang, country = continuation_token.lang, continuation_token.country
+        sort, count = continuation_token.sort, continuation_token.count
+        filter_score_with = continuation_token.filter_score_with
+    else:
+        token, sort = None, sort.value
+    items, next_token = _fetch_review_items(
+        Formats.Reviews.build(lang=lang, country=country),
+        app_id,
+        sort,
+        min(count, MAX_COUNT_EACH_FETCH),
+        filter_score_with,
+        None,
+        token
+    )
+    page = [
+        {key: spec.extract_content(item) for key, spec in ElementSpecs.Review.items()}
+        for item in items
+    ]
+    if isinstance(next_token, list):
+        next_token = None
+    next_page = _ContinuationToken(
+        next_token, lang, country, sort, count, filter_score_with, None
+    )
+    return page, next_page
+
+
+def token_to_dict(token):
+    return {slot: getattr(token, slot) for slot in _ContinuationToken.__slots__}
+
+
+def token_from_dict(state):
+    return _ContinuationToken(**state)
+
+
+class ScrapeCheckpoint:
+    """
+    JSON record of a scrape run: its output file and, per app, the last
+    continuation token, the number of reviews written and whether it finished.
+    Saved atomically after every page so an interrupted run can resume.
+    """
+
+    def __init__(self, path, output_file=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {"output_file": output_file, "apps": {}}
+
+    @classmethod
+    def load(cls, path):
+        checkpoint = cls(path)
+        with open(path, encoding='utf-8') as f:
+            checkpoint.state = json.load(f)
+        return checkpoint
+
+    @property
+    def output_file(self):
+        return self.state["output_file"]
+
+    def get(self, app_id):
+        with self._lock:
+            return dict(self.state["apps"].get(app_id, {}))
+
+    def update(self, app_id, **fields):
+        with self._lock:
+            self.state["apps"].setdefault(app_id, {}).update(fields)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class SeenReviewIndex:
+    """
+    Per-app record of the reviews already scraped, kept at <index_dir>/<app_id>.json.
+
+    Each review_id maps to an 8-byte fingerprint of its text and rating, so
+    a review edited since the last run counts as new again. The newest `at`
+    timestamp seen is kept alongside for reporting.
+    """
+
+    def __init__(self, index_dir, app_id):
+        self.path = os.path.join(index_dir, f"{app_id}.json")
+        self.reviews = {}
+        self.newest_at = None
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.reviews = state["reviews"]
+            self.newest_at = state["newest_at"]
+
+    @staticmethod
+    def fingerprint(entry):
+        payload = f"{entry['content']}\x1f{entry['score']}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+    def is_known(self, entry):
+        return self.reviews.get(entry['reviewId']) == self.fingerprint(entry)
+
+    def add(self, entries):
+        for entry in entries:
+            self.reviews[entry['reviewId']] = self.fingerprint(entry)
+            at = entry['at'].isoformat()
+            if self.newest_at is None or at > self.newest_at:
+                self.newest_at = at
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            reviews = dict(sorted(self.reviews.items()))
+            json.dump({"newest_at": self.newest_at, "reviews": reviews}, f)
+        os.replace(tmp_path, self.path)
+
+
+class CsvPageWriter:
+    """Thread-safe CSV appender; the header is written once for a new file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, mode='w', newline='', encoding='utf-8') as file:
+                csv.DictWriter(file, fieldnames=FIELDNAMES).writeheader()
+
+    def write(self, rows):
+        with self._lock:
+            with open(self.path, mode='a', newline='', encoding='utf-8') as file:
+                csv.DictWriter(file, fieldnames=FIELDNAMES).writerows(rows)
+
+
+@instrumented(rows="result", batch_size="page_size")
+def scrape_app(app_id, bank_name, writer, checkpoint, limiter, page_size=200,
+               max_reviews=None, lang='en', country='us', fetch=fetch_review_page,
+               retries=4, backoff=1.0, index_dir=None, index_save_every=20):
+    """
+    Pages through an app's reviews (newest first) with continuation tokens,
+    appending each page to the output as it arrives and checkpointing the
+    token afterwards. Resumes from the checkpoint if the app was interrupted.
+
+    With index_dir (incremental mode) only reviews missing from the app's
+    SeenReviewIndex, or edited since, are written, and paging stops at the
+    first page that is entirely known. The index is rewritten every
+    index_save_every pages and when the app finishes or fails, not per page.
+
+    Returns:
+        total number of reviews written for the app (including earlier runs).
+    """
+    state = checkpoint.get(app_id)
+    count = state.get("count", 0)
+    if state.get("done"):
+        logging.info(f"⏭️ {bank_name} already complete ({count} reviews)")
+        return count
+    token = token_from_dict(state["token"]) if state.get("token") else None
+    resuming = f" (resuming after {count})" if token else ""
+    logging.info(f"🔍 Scraping reviews for {bank_name}{resuming}")
+    seen = SeenReviewIndex(index_dir, app_id) if index_dir else None
+
+    pages = 0
+    try:
+        while True:
+            limiter.wait()
+            page, token = with_retries(
+                lambda: fetch(
+                    app_id,
+                    lang=lang,
+                    country=country,
+                    sort=Sort.NEWEST,
+                    count=page_size,
+                    filter_score_with=None,
+                    continuation_token=token
+                ),
+                retries=retries,
+                backoff=backoff
+            )
+            fresh = page if seen is None else [e for e in page if not seen.is_known(e)]
+            if max_reviews is not None:
+                fresh = fresh[:max_reviews - count]
+            writer.write([_structure(entry, bank_name) for entry in fresh])
+            count += len(fresh)
+            pages += 1
+            if seen is not None:
+                seen.add(fresh)
+                if pages % index_save_every == 0:
+                    seen.save()
+
+            caught_up = seen is not None and bool(page) and not fresh
+            done = (
+                not page or caught_up or token is None or token.token is None
+                or (max_reviews is not None and count >= max_reviews)
+            )
+            next_token = None if done else token_to_dict(token)
+            checkpoint.update(app_id, token=next_token, count=count, done=done)
+            if done:
+                logging.info(f"📝 Collected {count} reviews for {bank_name}")
+                return count
+    finally:
+        if seen is not None and pages % index_save_every:
+            seen.save()
+
+
+def scrape_all(bank_apps, checkpoint, requests_per_second=2.0, workers=None,
+               **scrape_kwargs):
+    """
+    Scrapes every app concurrently into checkpoint.output_file, sharing one
+    rate limiter since all requests go to the same Play Store host.
+    """
+    writer = CsvPageWriter(checkpoint.output_file)
+    limiter = RateLimiter(requests_per_second)
+    with ThreadPoolExecutor(max_workers=workers or len(bank_apps)) as executor:
+        futures = {
+            bank_name: executor.submit(
+                scrape_app, app_id, bank_name, writer, checkpoint, limiter,
+                **scrape_kwargs
+            )
+            for bank_name, app_id in bank_apps.items()
+        }
+        return {bank_name: future.result() for bank_name, future in futures.items()}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scrape Google Play reviews for the bank apps."
+    )
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the run recorded in the checkpoint file")
+    parser.add_argument("--max-reviews", type=int, default=None,
+                        help="stop after this many reviews per app (default: all)")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--requests-per-second", type=float, default=2.0)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--incremental", action="store_true",
+                        help="only emit reviews not seen by earlier runs "
+                             "and stop once caught up")
+    parser.add_argument("--metrics", default=None,
+                        help="write per-stage metrics to this file "
+                             "(.prom for Prometheus text, else JSON)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Load base directory from .env
+    base_dir = get_base_data_dir()
+    configure_logging(base_dir)
 
     # 📁 Define save path
     output_dir = 'scraped_reviews'
@@ -75,26 +379,30 @@ def main():
     os.makedirs(main_path, exist_ok=True)
     logging.info(f"📂 Output directory: {main_path}")
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    output_file = os.path.join(main_path, f'all_bank_reviews_{timestamp}.csv')
-
-    # 🧾 CSV Header
-    fieldnames = ['review_id', 'review', 'rating', 'date', 'bank', 'source']
-
-    all_reviews = []
-
-    for bank_name, app_id in bank_apps.items():
-        bank_reviews = scrape_play_store_reviews(app_id, bank_name)
-        logging.info(f"📝 Collected {len(bank_reviews)} reviews for {bank_name}")
-        all_reviews.extend(bank_reviews)
+    checkpoint_path = os.path.join(main_path, 'scrape_checkpoint.json')
+    if args.resume and os.path.exists(checkpoint_path):
+        checkpoint = ScrapeCheckpoint.load(checkpoint_path)
+        logging.info(f"♻️ Resuming into {checkpoint.output_file}")
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_file = os.path.join(main_path, f'all_bank_reviews_{timestamp}.csv')
+        checkpoint = ScrapeCheckpoint(checkpoint_path, output_file)
 
-    # 🗃️ Write to single CSV
-    with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_reviews)
+    counts = scrape_all(
+        BANK_APPS,
+        checkpoint,
+        requests_per_second=args.requests_per_second,
+        page_size=args.page_size,
+        max_reviews=args.max_reviews,
+        retries=args.retries,
+        index_dir=os.path.join(main_path, 'review_index') if args.incremental else None
+    )
 
-    logging.info(f"✅ Aggregated {len(all_reviews)} reviews into {output_file}")
+    logging.info(
+        f"✅ Aggregated {sum(counts.values())} reviews into {checkpoint.output_file}"
+    )
+    if args.metrics:
+        export_metrics(args.metrics)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import logging
+import os
+import sys
+
+sys.path.append(os.path.abspath("../"))
+from src.core.oracle_core import load_chunks, REVIEW_RAW_COLUMNS, DEFAULT_BATCH_SIZE
+from src.utils.utils import iter_data_chunks, clean_data, clean_review_column
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Clean, score and load a scraped review CSV chunk by chunk."
+    )
+    parser.add_argument("input", help="scraped all_bank_reviews_*.csv")
+    parser.add_argument(
+        "--output", default="../data/processed/reviews_with_sentiments_stream.csv",
+        help="CSV the cleaned (and scored) chunks are appended to"
+    )
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--no-score", action="store_true",
+                        help="skip sentiment scoring")
+    parser.add_argument("--load", action="store_true",
+                        help="MERGE each chunk into review_raw")
+    parser.add_argument("--state-path",
+                        default="../data/processed/load_high_water_marks.json")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    return parser.parse_args(argv)
+
+def process_chunk(chunk, scorer=None):
+    """
+    The Data_Preprocessing notebook steps (plus optional scoring) for one chunk.
+    Duplicates are only dropped within the chunk; the review_id MERGE takes
+    care of repeats across chunks.
+    """
+    chunk = clean_data(chunk)
+    chunk = chunk.assign(review_clean=clean_review_column(chunk["review"]))
+    if scorer is not None:
+        chunk = scorer.score_frame(chunk)
+    return chunk
+
+def processed_chunks(args, scorer=None):
+    """
+    Processes the input chunk by chunk, appends each chunk to args.output and
+    yields it.
+    """
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    total = 0
+    for i, chunk in enumerate(iter_data_chunks(args.input, args.chunksize)):
+        chunk = process_chunk(chunk, scorer)
+        chunk.to_csv(args.output, mode="a", header=(i == 0), index=False)
+        total += len(chunk)
+        logging.info(f"📦 Chunk {i + 1}: {len(chunk)} rows processed ({total} total)")
+        yield chunk
+    logging.info(f"✅ Streamed {total} rows into {args.output}")
+
+def main(argv=None, conn=None):
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s"
+    )
+    args = parse_args(argv)
+    scorer = None
+    if not args.no_score:
+        from src.models.sentiments import SentimentScorer
+        scorer = SentimentScorer()
+
+    chunks = processed_chunks(args, scorer)
+    if args.load:
+        # marks are read once before the first chunk and saved after the last,
+        # so older rows further down a newest-first CSV are not filtered out
+        load_chunks(
+            (chunk[REVIEW_RAW_COLUMNS] for chunk in chunks), "review_raw", conn,
+            args.batch_size, args.state_path
+        )
+    else:
+        for _ in chunks:
+            pass
+
+if __name__ == "__main__":
+    main()
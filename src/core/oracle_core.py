@@ -1,75 +1,509 @@
+import datetime
+import hashlib
+import json
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import pandas as pd
 import oracledb
-import os 
+import os
 import sys
 
 sys.path.append(os.path.abspath("../../"))
 from config.settings import get_db_credentials
+from src.utils.instrumentation import instrumented
+from src.utils.rollups import ReviewRollup
+
+# Rows sent per executemany round trip (and committed together)
+DEFAULT_BATCH_SIZE = 5000
+
+# Session pool sizes when init_pool is not given any
+POOL_MIN = int(os.getenv("ORACLE_POOL_MIN", "1"))
+POOL_MAX = int(os.getenv("ORACLE_POOL_MAX", "4"))
+
+# Columns stored as CLOB in the BANK_REVIEWS schema
+CLOB_COLUMNS = {"review", "review_clean", "keyword_ready", "identified_theme"}
+
+REVIEW_RAW_COLUMNS = [
+    "review_id", "review", "rating", "date", "bank", "source", "review_clean"
+]
+REVIEW_PROCESSED_COLUMNS = REVIEW_RAW_COLUMNS + [
+    "sentiment_label", "sentiment_score", "keyword_ready", "identified_theme"
+]
+BANK_DETAIL_COLUMNS = [
+    "bank_id", "bank", "source_of_data", "num_reviews", "avg_rating",
+    "positive_sentiment_count", "negative_sentiment_count", "neutral_sentiment_count"
+]
+# Sums are stored next to the derived metrics so any date range can be
+# re-aggregated exactly (add the sums, then divide)
+BANK_DAILY_COLUMNS = [
+    "bank_id", "date", "bank", "num_reviews", "rating_sum", "rating_count",
+    "positive_count", "negative_count", "neutral_count",
+    "score_count", "score_sum", "score_sqsum",
+    "avg_rating", "avg_sentiment_score", "sentiment_score_std"
+]
+
+INSERT_REVIEW_RAW_SQL = """
+    INSERT INTO BANK_REVIEWS.review_raw (
+        review_id, review, rating, review_date, bank, source, review_clean
+    ) VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'), :5, :6, :7)
+"""
+
+INSERT_REVIEW_PROCESSED_SQL = """
+    INSERT INTO BANK_REVIEWS.review_processed (
+        review_id, review, rating, review_date, bank, source, review_clean,
+        sentiment_label, sentiment_score, keyword_ready, identified_theme
+    ) VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'), :5, :6, :7, :8, :9, :10, :11)
+"""
+
+def _upsert_sql(table, columns, keys):
+    """
+    Builds a single-row MERGE of bind values into BANK_REVIEWS.<table> on
+    `keys`, so reloading a summary row overwrites it instead of colliding.
+    """
+    select = ", ".join(
+        f"TO_DATE(:{i}, 'YYYY-MM-DD') AS {col}" if col == "review_date"
+        else f":{i} AS {col}"
+        for i, col in enumerate(columns, start=1)
+    )
+    on = " AND ".join(f"t.{col} = s.{col}" for col in keys)
+    update_set = ", ".join(f"t.{col} = s.{col}" for col in columns if col not in keys)
+    return f"""
+    MERGE INTO BANK_REVIEWS.{table} t
+    USING (SELECT {select} FROM dual) s
+    ON ({on})
+    WHEN MATCHED THEN UPDATE SET {update_set}
+    WHEN NOT MATCHED THEN INSERT ({", ".join(columns)})
+        VALUES ({", ".join(f"s.{col}" for col in columns)})
+"""
+
+UPSERT_BANK_DETAIL_SQL = _upsert_sql("bank_detail", [
+    "bank_id", "bank_name", "source_of_data", "num_reviews", "avg_rating",
+    "positive_sentiment_count", "negative_sentiment_count", "neutral_sentiment_count"
+], ["bank_id"])
+
+UPSERT_BANK_DAILY_SQL = _upsert_sql(
+    "bank_review_daily",
+    ["bank_id", "review_date", "bank_name"] + BANK_DAILY_COLUMNS[3:],
+    ["bank_id", "review_date"]
+)
+
+# Process-wide session pool, created on first use (see init_pool)
+_pool = None
+_pool_lock = threading.Lock()
+
+def init_pool(min_size=None, max_size=None, increment=1, pool=None):
+    """
+    Creates the process-wide oracledb session pool once (credentials are read
+    from .env only then); later calls return the existing pool.
+
+    Args:
+        min_size / max_size: sessions kept open / allowed at once, default
+            ORACLE_POOL_MIN and ORACLE_POOL_MAX (1 and 4).
+        increment: sessions opened at a time when the pool grows.
+        pool: an existing pool to install instead, e.g. the test stand-in.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if pool is None:
+                creds = get_db_credentials()
+                dsn = oracledb.makedsn(
+                    creds["host"], creds["port"], service_name=creds["service_name"]
+                )
+                pool = oracledb.create_pool(
+                    user=creds["username"], password=creds["password"], dsn=dsn,
+                    min=min_size or POOL_MIN, max=max_size or POOL_MAX,
+                    increment=increment
+                )
+            _pool = pool
+        return _pool
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
 
 def get_oracle_connection():
-    creds = get_db_credentials()
-    dsn = oracledb.makedsn(creds["host"], creds["port"], service_name=creds["service_name"])
-    return oracledb.connect(user=creds["username"], password=creds["password"], dsn=dsn)
+    """
+    A session from the pool; close() (or leaving a `with` block) returns it.
+    """
+    return init_pool().acquire()
 
-def load_review_raw(df):
-    with get_oracle_connection() as conn:
-        cursor = conn.cursor()
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT INTO BANK_REVIEWS.review_raw (
-                    review_id, review, rating, review_date, bank, source, review_clean
-                ) VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'), :5, :6, :7)
-            """, (
-                row["review_id"], row["review"], row["rating"],
-                row["date"], row["bank"], row["source"], row["review_clean"]
-            ))
-        conn.commit()
+@contextmanager
+def _connection(conn=None):
+    """
+    Yields the caller's connection untouched, or borrows (and returns) a
+    pooled one.
+    """
+    if conn is not None:
+        yield conn
+        return
+    with get_oracle_connection() as new_conn:
+        yield new_conn
 
-def load_review_processed(df):
-    with get_oracle_connection() as conn:
-        cursor = conn.cursor()
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT INTO BANK_REVIEWS.review_processed (
-                    review_id, review, rating, review_date, bank, source, review_clean,
-                    sentiment_label, sentiment_score, keyword_ready, identified_theme
-                ) VALUES (:1, :2, :3, TO_DATE(:4, 'YYYY-MM-DD'), :5, :6, :7, :8, :9, :10, :11)
-            """, (
-                row["review_id"], row["review"], row["rating"], row["date"],
-                row["bank"], row["source"], row["review_clean"],
-                row["sentiment_label"], row["sentiment_score"],
-                row["keyword_ready"], row["identified_theme"]
-            ))
+def _column_values(df, column):
+    """
+    Returns a column as a list of Python scalars ready for binding
+    (NaN/NaT become None, dates become 'YYYY-MM-DD' strings and list-typed
+    themes from the Parquet store become the same "['A', 'B']" text the CSVs hold).
+    """
+    series = df[column]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime("%Y-%m-%d")
+    values = series.astype(object).where(series.notna(), None).tolist()
+    first = next((v for v in values if v is not None), None)
+    if series.dtype == object and isinstance(first, list):
+        values = [str(v) if isinstance(v, list) else v for v in values]
+    return values
+
+def bulk_execute(conn, sql, df, columns, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Executes `sql` for every row of `df` using array DML.
+
+    Rows are bound column-wise in batches of `batch_size` with a single
+    executemany call per batch, CLOB columns are declared via setinputsizes and
+    each batch is committed on its own. Rows rejected by the database are
+    collected through batcherrors instead of aborting the load.
+
+    Args:
+        conn: open Oracle (DB-API) connection.
+        sql: statement with positional binds matching `columns`.
+        df: DataFrame holding the rows to load.
+        columns: DataFrame columns in bind order; the first one identifies the row.
+        batch_size: rows per round trip / commit.
+
+    Returns:
+        list of dicts (row, key, message) for every row the database rejected.
+    """
+    cursor = conn.cursor()
+    input_sizes = [
+        oracledb.DB_TYPE_CLOB if col in CLOB_COLUMNS else None for col in columns
+    ]
+    errors = []
+
+    for start in range(0, len(df), batch_size):
+        chunk = df.iloc[start:start + batch_size]
+        rows = list(zip(*(_column_values(chunk, col) for col in columns)))
+        cursor.setinputsizes(*input_sizes)
+        cursor.executemany(sql, rows, batcherrors=True)
+        for error in cursor.getbatcherrors():
+            errors.append({
+                "row": start + error.offset,
+                "key": rows[error.offset][0],
+                "message": error.message
+            })
         conn.commit()
 
-def load_bank_detail(df):
-    summary = (
-        df.groupby("bank")
-        .agg(
-            num_reviews=("review_id", "count"),
-            avg_rating=("rating", "mean"),
-            positive_sentiment_count=("sentiment_label", lambda x: (x == "POSITIVE").sum()),
-            negative_sentiment_count=("sentiment_label", lambda x: (x == "NEGATIVE").sum()),
-            neutral_sentiment_count=("sentiment_label", lambda x: (x == "NEUTRAL").sum())
+    if errors:
+        logging.warning(f"⚠️ {len(errors)} of {len(df)} rows rejected")
+    return errors
+
+@instrumented(rows="df", batch_size="batch_size")
+def load_review_raw(df, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    with _connection(conn) as conn:
+        return bulk_execute(
+            conn, INSERT_REVIEW_RAW_SQL, df, REVIEW_RAW_COLUMNS, batch_size
         )
-        .reset_index()
-    )
-    summary["bank_id"] = summary["bank"].apply(
-        lambda x: "BOA" if "BOA" in x else ("CBE" if "CBE" in x else "Dashen")
-        )  # simple ID generation
+
+@instrumented(rows="df", batch_size="batch_size")
+def load_review_processed(df, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    with _connection(conn) as conn:
+        return bulk_execute(
+            conn, INSERT_REVIEW_PROCESSED_SQL, df, REVIEW_PROCESSED_COLUMNS, batch_size
+        )
+
+def bank_id(bank):
+    # simple ID generation
+    return "BOA" if "BOA" in bank else ("CBE" if "CBE" in bank else "Dashen")
+
+def _bank_detail_rows(rollup):
+    summary = rollup.bank_summary().rename(columns={
+        "positive_count": "positive_sentiment_count",
+        "negative_count": "negative_sentiment_count",
+        "neutral_count": "neutral_sentiment_count"
+    })
+    summary["bank_id"] = summary["bank"].map(bank_id)
     summary["source_of_data"] = "Google Play"
+    return summary
+
+@instrumented(rows="df")
+def load_bank_detail(df, conn=None, rollup=None):
+    """
+    Folds `df` into a ReviewRollup and upserts it with load_rollups, so
+    bank_detail (and bank_review_daily) hold totals rather than the counts
+    of whichever slice was loaded last.
+
+    Args:
+        rollup: the persisted ReviewRollup (see ReviewRollup.load) when df
+            is a chunk or a delta; without one, df must be the full corpus.
+    """
+    rollup = rollup if rollup is not None else ReviewRollup()
+    rollup.update(df)
+    return load_rollups(rollup, conn=conn)
+
+@instrumented(rows=lambda arguments, result: len(arguments["rollup"].daily))
+def load_rollups(rollup, conn=None):
+    """
+    Upserts a ReviewRollup into bank_detail (one row per bank) and
+    bank_review_daily (one row per bank and day). Both are MERGEs of the
+    precomputed rows, so dashboards never have to scan review_processed.
+    """
+    daily = rollup.daily_summary()
+    daily["bank_id"] = daily["bank"].map(bank_id)
+    with _connection(conn) as conn:
+        errors = bulk_execute(
+            conn, UPSERT_BANK_DETAIL_SQL, _bank_detail_rows(rollup), BANK_DETAIL_COLUMNS
+        )
+        errors += bulk_execute(conn, UPSERT_BANK_DAILY_SQL, daily, BANK_DAILY_COLUMNS)
+    banks = rollup.daily.index.get_level_values("bank").nunique()
+    logging.info(f"📊 Rollups loaded: {banks} banks, {len(daily)} bank-days")
+    return errors
+
+# DataFrame columns whose table column is named differently
+_SQL_COLUMNS = {"date": "review_date"}
+
+# Joins column values before hashing so ("ab", "c") and ("a", "bc") differ
+HASH_SEPARATOR = "\x1f"
+
+# Hashed in place of missing values, distinct from the text "None" or "nan"
+HASH_NULL = "\x00"
+
+def _merge_sql(table, columns):
+    """
+    Builds the MERGE that folds BANK_REVIEWS.<table>_stage into <table> on
+    review_id, updating matched rows only when their content hash changed.
+    """
+    columns = [col for col in columns if col != "review_id"] + ["content_hash"]
+    update_set = ",\n            ".join(f"t.{col} = s.{col}" for col in columns)
+    insert_cols = ", ".join(["review_id"] + columns)
+    insert_vals = ", ".join(f"s.{col}" for col in ["review_id"] + columns)
+    return f"""
+    MERGE INTO BANK_REVIEWS.{table} t
+    USING BANK_REVIEWS.{table}_stage s
+    ON (t.review_id = s.review_id)
+    WHEN MATCHED THEN UPDATE SET
+            {update_set}
+        WHERE t.content_hash IS NULL OR t.content_hash <> s.content_hash
+    WHEN NOT MATCHED THEN INSERT ({insert_cols})
+        VALUES ({insert_vals})
+"""
+
+def _stage_sql(table, columns):
+    sql_columns = [_SQL_COLUMNS.get(col, col) for col in columns] + ["content_hash"]
+    binds = [
+        f"TO_DATE(:{i}, 'YYYY-MM-DD')" if col == "date" else f":{i}"
+        for i, col in enumerate(columns + ["content_hash"], start=1)
+    ]
+    return f"""
+    INSERT INTO BANK_REVIEWS.{table}_stage (
+        {", ".join(sql_columns)}
+    ) VALUES ({", ".join(binds)})
+"""
+
+UPSERT_TABLES = {
+    "review_raw": REVIEW_RAW_COLUMNS,
+    "review_processed": REVIEW_PROCESSED_COLUMNS
+}
+
+def _hash_token(value):
+    """
+    Canonical text for one value so equal content hashes equally whatever its
+    dtype: integral floats read as ints (5.0 -> "5"), None/NaN share one token
+    and dates are written as 'YYYY-MM-DD' like `_column_values` binds them.
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return HASH_NULL
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    return str(value)
 
-    with get_oracle_connection() as conn:
+def content_hash(df, columns):
+    """
+    SHA-256 over the given columns of each row, used to skip unchanged reviews.
+    """
+    values = zip(*(map(_hash_token, _column_values(df, col)) for col in columns))
+    return pd.Series(
+        [
+            hashlib.sha256(HASH_SEPARATOR.join(row).encode("utf-8")).hexdigest()
+            for row in values
+        ],
+        index=df.index
+    )
+
+@instrumented(rows="df", batch_size="batch_size")
+def upsert_reviews(df, table="review_raw", batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    """
+    Idempotent load of review_raw / review_processed.
+
+    Each batch is bulk inserted into the table's global temporary staging table
+    and folded into the target with a single MERGE on review_id. Rows whose
+    content hash matches what is already stored are left untouched.
+
+    Returns:
+        dict with the number of rows staged, merged (inserted or changed) and
+        the staging errors reported through batcherrors.
+    """
+    columns = UPSERT_TABLES[table]
+    bind_columns = columns + ["content_hash"]
+    df = df.drop_duplicates(subset="review_id", keep="last")
+    hashed = [col for col in columns if col != "review_id"]
+    df = df.assign(content_hash=content_hash(df, hashed))
+    stage_sql = _stage_sql(table, columns)
+    merge_sql = _merge_sql(table, [_SQL_COLUMNS.get(col, col) for col in columns])
+    input_sizes = [
+        oracledb.DB_TYPE_CLOB if col in CLOB_COLUMNS else None for col in bind_columns
+    ]
+    result = {"staged": 0, "merged": 0, "errors": []}
+
+    with _connection(conn) as conn:
         cursor = conn.cursor()
-        for _, row in summary.iterrows():
-            cursor.execute("""
-                INSERT INTO BANK_REVIEWS.bank_detail (
-                    bank_id, bank_name, source_of_data, num_reviews, avg_rating,
-                    positive_sentiment_count, negative_sentiment_count, neutral_sentiment_count
-                ) VALUES (:1, :2, :3, :4, :5, :6, :7, :8)
-            """, (
-                row["bank_id"], row["bank"], row["source_of_data"], int(row["num_reviews"]),
-                float(row["avg_rating"]), int(row["positive_sentiment_count"]),
-                int(row["negative_sentiment_count"]), int(row["neutral_sentiment_count"])
-            ))
-        conn.commit()
\ No newline at end of file
+        for start in range(0, len(df), batch_size):
+            chunk = df.iloc[start:start + batch_size]
+            rows = list(zip(*(_column_values(chunk, col) for col in bind_columns)))
+            cursor.setinputsizes(*input_sizes)
+            cursor.executemany(stage_sql, rows, batcherrors=True)
+            batch_errors = cursor.getbatcherrors()
+            for error in batch_errors:
+                result["errors"].append({
+                    "row": start + error.offset,
+                    "key": rows[error.offset][0],
+                    "message": error.message
+                })
+            cursor.execute(merge_sql)
+            result["staged"] += len(rows) - len(batch_errors)
+            result["merged"] += cursor.rowcount
+            conn.commit()  # also empties the ON COMMIT DELETE ROWS staging table
+
+    logging.info(
+        f"🔁 {table}: staged {result['staged']} rows, "
+        f"merged {result['merged']} new or changed"
+    )
+    return result
+
+def read_high_water_marks(path):
+    """
+    Loads the persisted {table: {bank: 'YYYY-MM-DD'}} high-water marks.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_high_water_marks(path, marks):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(marks, f, indent=4, ensure_ascii=False)
+
+# Concurrent loads of different tables share the state file
+_marks_lock = threading.Lock()
+
+def save_high_water_marks(path, table, marks):
+    """
+    Merges `table`'s advanced marks into the state file, keeping the other
+    tables' marks as concurrent loads may have just written them.
+    """
+    with _marks_lock:
+        state = read_high_water_marks(path)
+        merged = dict(state.get(table, {}))
+        for bank, date in marks.items():
+            merged[bank] = max(merged.get(bank, date), date)
+        state[table] = merged
+        write_high_water_marks(path, state)
+
+def filter_new_rows(df, marks):
+    """
+    Keeps rows dated on or after their bank's high-water mark. The mark day
+    itself is reloaded since the MERGE makes overlapping rows harmless.
+    """
+    if not marks:
+        return df
+    dates = pd.to_datetime(df["date"])
+    cutoff = pd.to_datetime(df["bank"].map(marks))
+    return df[cutoff.isna() | (dates >= cutoff)]
+
+def advance_high_water_marks(marks, df):
+    latest = (
+        pd.to_datetime(df["date"]).groupby(df["bank"], observed=True).max()
+        .dt.strftime("%Y-%m-%d")
+    )
+    marks = dict(marks)
+    for bank, date in latest.items():
+        marks[bank] = max(marks.get(bank, date), date)
+    return marks
+
+def incremental_load(df, table, state_path, batch_size=DEFAULT_BATCH_SIZE, conn=None):
+    """
+    Upserts only the delta since the last run for `table` and persists the
+    advanced per-bank high-water marks once the load has succeeded.
+    """
+    marks = read_high_water_marks(state_path).get(table, {})
+    delta = filter_new_rows(df, marks)
+    logging.info(
+        f"📅 {table}: {len(delta)} of {len(df)} rows at or after the high-water mark"
+    )
+    result = upsert_reviews(delta, table, batch_size, conn)
+    if len(delta):
+        save_high_water_marks(state_path, table, advance_high_water_marks(marks, delta))
+    return result
+
+LOADERS = {"review_raw": load_review_raw, "review_processed": load_review_processed}
+
+def load_chunks(chunks, table, conn=None, batch_size=DEFAULT_BATCH_SIZE,
+                state_path=None):
+    """
+    Loads an iterable of DataFrames (e.g. CSV chunks) into review_raw or
+    review_processed over a single connection.
+
+    With state_path the load is incremental: every chunk is filtered against
+    the high-water marks as they were when the load started (chunks need not
+    be in date order), upserted, and the advanced marks are saved once all
+    chunks are in.
+
+    Returns:
+        number of rows sent to the database.
+    """
+    marks = read_high_water_marks(state_path).get(table, {}) if state_path else None
+    latest, sent = {}, 0
+    with _connection(conn) as conn:
+        for chunk in chunks:
+            if marks is None:
+                LOADERS[table](chunk, batch_size, conn)
+            else:
+                chunk = filter_new_rows(chunk, marks)
+                upsert_reviews(chunk, table, batch_size, conn)
+                if len(chunk):
+                    latest = advance_high_water_marks(latest, chunk)
+            sent += len(chunk)
+    if latest:
+        save_high_water_marks(state_path, table, latest)
+    logging.info(f"📦 {table}: {sent} rows loaded")
+    return sent
+
+def load_concurrently(jobs, workers=None):
+    """
+    Runs independent loads in parallel threads, each on its own pooled
+    session (the driver releases the GIL while waiting on the database).
+
+    Args:
+        jobs: {name: callable(conn)}.
+        workers: threads, one per job by default; the pool must allow as
+            many sessions or jobs wait for a free one.
+
+    Returns:
+        {name: result}. A failed job's exception is raised once all are done.
+    """
+    def run(job):
+        with get_oracle_connection() as conn:
+            return job(conn)
+
+    with ThreadPoolExecutor(max_workers=workers or len(jobs)) as executor:
+        futures = {name: executor.submit(run, job) for name, job in jobs.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -1,23 +1,83 @@
 import numpy as np
 import json
 import os
+import joblib
+from types import SimpleNamespace
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+from sklearn.preprocessing import normalize
+from scipy.special import digamma
+from src.utils.instrumentation import instrumented
+
+# Settings used for every bank in the thematic analysis notebook
+TFIDF_PARAMS = {
+    "max_df": 0.1, "min_df": 1, "stop_words": "english", "ngram_range": (3, 4)
+}
+LDA_PARAMS = {
+    "n_components": 5, "max_iter": 70, "learning_method": "batch", "random_state": 42
+}
+# Streaming mode: a fixed 2**18-bucket feature space and online variational LDA
+HASHING_PARAMS = {
+    "n_features": 2**18, "ngram_range": (3, 4), "stop_words": "english",
+    "alternate_sign": False, "norm": None
+}
+ONLINE_LDA_PARAMS = {
+    "n_components": 5, "learning_method": "online", "learning_offset": 10.0,
+    "batch_size": 512, "total_samples": 1_000_000, "random_state": 42
+}
+
+def _top_k(values, k):
+    """
+    Column indices of the k largest values of every row, largest first, with
+    ties broken towards the higher index exactly as a reversed argsort does.
+    np.partition finds each row's k-th largest value without sorting the row;
+    only the k selected entries are then ordered.
+    """
+    n_rows, n_cols = values.shape
+    k = min(k, n_cols)
+    kth = np.partition(values, n_cols - k, axis=1)[:, n_cols - k][:, np.newaxis]
+    above = values > kth
+    ties = values == kth
+    # among values equal to the k-th, keep the right-most ones that are still needed
+    needed = k - above.sum(axis=1, keepdims=True)
+    ties_from_right = np.cumsum(ties[:, ::-1], axis=1)[:, ::-1]
+    selected = above | (ties & (ties_from_right <= needed))
+    top = np.nonzero(selected)[1].reshape(n_rows, k)
+    top_values = np.take_along_axis(values, top, axis=1)
+    order = np.lexsort((-top, -top_values), axis=1)
+    return np.take_along_axis(top, order, axis=1)
 
 def extract_topic_keywords(model, feature_names, top_n=10):
-    topic_dict = {}
-    for topic_idx, topic in enumerate(model.components_):
-        top_keywords = [feature_names[i] for i in topic.argsort()[:-top_n - 1:-1]]
-        topic_dict[f"Topic {topic_idx + 1}"] = top_keywords
-    return topic_dict
-
-def map_topics_to_labels(lda_model, tfidf_matrix, theme_labels):
-    topic_distributions = lda_model.transform(tfidf_matrix)
+    feature_names = np.asarray(feature_names, dtype=object)
+    top = _top_k(model.components_, top_n)
+    return {
+        f"Topic {topic_idx + 1}": feature_names[idxs].tolist()
+        for topic_idx, idxs in enumerate(top)
+    }
+
+@instrumented(rows="tfidf_matrix", batch_size="chunk_size")
+def map_topics_to_labels(lda_model, tfidf_matrix, theme_labels, top_n=3,
+                         chunk_size=100_000, empty=None, verbose=True):
+    """
+    Labels of the top_n most likely topics of every document.
+
+    The TF-IDF matrix is transformed chunk_size rows at a time, so only one
+    chunk of the dense document-topic matrix is in memory. Output stays
+    aligned with the input rows: documents whose topic distribution is all
+    zero get `empty` instead of a label list. verbose=False skips the
+    progress print (for callers mapping many small batches).
+    """
+    labels = np.array([theme_labels[i] for i in range(len(theme_labels))], dtype=object)
     top_labels = []
-    for dist in topic_distributions:
-        if np.all(dist == 0):
-            continue
-        idxs = dist.argsort()[-3:][::-1]
-        top_labels.append([theme_labels[i] for i in idxs])
-    print("✅ Topics mapped to labels")
+    for start in range(0, tfidf_matrix.shape[0], chunk_size):
+        distributions = lda_model.transform(tfidf_matrix[start:start + chunk_size])
+        chunk_labels = labels[_top_k(distributions, top_n)].tolist()
+        for row in np.flatnonzero(~distributions.any(axis=1)):
+            chunk_labels[row] = empty
+        top_labels.extend(chunk_labels)
+    if verbose:
+        print("✅ Topics mapped to labels")
     return top_labels
 
 def save_topics_with_labels(bank, topic_keywords, theme_labels, save_path):
@@ -41,4 +101,251 @@ def save_topics_with_labels(bank, topic_keywords, theme_labels, save_path):
     file_path = os.path.join(save_path, f"{bank}_theme_map.json")
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(labeled_topics, f, indent=4, ensure_ascii=False)
-    print(f"✅ Saved to: {file_path}")
\ No newline at end of file
+    print(f"✅ Saved to: {file_path}")
+
+def load_theme_labels(bank, save_path):
+    """
+    Reads the {topic index: label} mapping back from <bank>_theme_map.json.
+    """
+    file_path = os.path.join(save_path, f"{bank}_theme_map.json")
+    with open(file_path, encoding='utf-8') as f:
+        labeled_topics = json.load(f)
+    return {
+        int(topic.split()[-1]) - 1: entry["label"]
+        for topic, entry in labeled_topics.items()
+    }
+
+class BankTopicModel:
+    """
+    TF-IDF (3-4 word n-grams) + LDA topic model of one bank's reviews.
+
+    Fit once on the bank's keyword_ready texts, label the topics, then save;
+    later batches of reviews are themed with `transform` (vectorizer and LDA
+    transform only, no refit). The fitted vectorizer and LDA are stored as
+    <bank>_topic_model.joblib next to <bank>_theme_map.json.
+
+    For corpora that keep growing see OnlineBankTopicModel.
+
+    Args:
+        bank: bank key used in file names ("cbe", "boa", "dashen").
+        tfidf_params: overrides of TFIDF_PARAMS.
+        lda_params: overrides of LDA_PARAMS.
+    """
+
+    model_file = "topic_model"
+
+    def __init__(self, bank, tfidf_params=None, lda_params=None):
+        self.bank = bank
+        self.vectorizer = TfidfVectorizer(**{**TFIDF_PARAMS, **(tfidf_params or {})})
+        self.lda = LatentDirichletAllocation(**{**LDA_PARAMS, **(lda_params or {})})
+        self.theme_labels = None
+
+    def fit(self, texts):
+        tfidf_matrix = self.vectorizer.fit_transform(texts)
+        self.lda.fit(tfidf_matrix)
+        print(f"✅ Topic model fitted for {self.bank}")
+        return self
+
+    def topic_keywords(self, top_n=20):
+        feature_names = self.vectorizer.get_feature_names_out()
+        return extract_topic_keywords(self.lda, feature_names, top_n)
+
+    def transform(self, texts, verbose=True):
+        """
+        Top-3 theme labels for each text, as map_topics_to_labels returns them.
+        """
+        if self.theme_labels is None:
+            raise ValueError(
+                f"No theme labels set for {self.bank}; "
+                "assign theme_labels or load a saved model"
+            )
+        return map_topics_to_labels(
+            self.lda, self.vectorizer.transform(texts), self.theme_labels,
+            verbose=verbose
+        )
+
+    def save(self, save_path, topic_keywords=None):
+        """
+        Saves the fitted model and its theme map (topic_keywords defaults to
+        the top 20 n-grams of each topic).
+        """
+        if self.theme_labels is None:
+            raise ValueError(f"No theme labels set for {self.bank}")
+        topic_keywords = topic_keywords or self.topic_keywords()
+        save_topics_with_labels(self.bank, topic_keywords, self.theme_labels, save_path)
+        self.save_model(save_path)
+
+    def save_model(self, save_path):
+        """
+        Saves the fitted model only, e.g. before its topics are labelled.
+        """
+        os.makedirs(save_path, exist_ok=True)
+        model_path = os.path.join(save_path, f"{self.bank}_{self.model_file}.joblib")
+        joblib.dump(self._fitted_state(), model_path)
+
+    def _fitted_state(self):
+        return {"vectorizer": self.vectorizer, "lda": self.lda}
+
+    @classmethod
+    def load(cls, bank, save_path):
+        """
+        Loads a saved model; theme_labels is None when the bank has no
+        <bank>_theme_map.json yet.
+        """
+        model = cls(bank)
+        model_path = os.path.join(save_path, f"{bank}_{cls.model_file}.joblib")
+        model.__dict__.update(joblib.load(model_path))
+        if os.path.exists(os.path.join(save_path, f"{bank}_theme_map.json")):
+            model.theme_labels = load_theme_labels(bank, save_path)
+        return model
+
+
+class OnlineBankTopicModel(BankTopicModel):
+    """
+    Streaming variant of BankTopicModel that is updated chunk by chunk with
+    online variational LDA (`partial_fit`) instead of being refit.
+
+    N-grams are hashed into a fixed HASHING_PARAMS["n_features"] space, so
+    memory does not grow with the vocabulary, and TF-IDF weighting uses
+    running document frequencies (n-grams in more than `max_df` of the
+    documents get zero weight, as in the batch vectorizer). partial_fit
+    never reorders topics, so theme labels keep applying as the model is
+    updated. One representative n-gram per hash bucket is kept for
+    topic_keywords; only texts hitting a bucket without one yet are
+    analysed again, so that map is bounded by n_features too. Saved as
+    <bank>_online_topic_model.joblib.
+
+    Args:
+        bank: bank key used in file names.
+        hashing_params: overrides of HASHING_PARAMS.
+        lda_params: overrides of ONLINE_LDA_PARAMS.
+        max_df: document frequency ceiling, as a share of documents seen.
+    """
+
+    model_file = "online_topic_model"
+
+    def __init__(
+        self, bank, hashing_params=None, lda_params=None, max_df=TFIDF_PARAMS["max_df"]
+    ):
+        self.bank = bank
+        self.vectorizer = HashingVectorizer(
+            **{**HASHING_PARAMS, **(hashing_params or {})}
+        )
+        self.lda = LatentDirichletAllocation(
+            **{**ONLINE_LDA_PARAMS, **(lda_params or {})}
+        )
+        self.max_df = max_df
+        self.theme_labels = None
+        self.doc_freq = np.zeros(self.vectorizer.n_features, dtype=np.int64)
+        self.n_docs = 0
+        self.bucket_terms = {}
+
+    def _buckets(self, terms):
+        hasher = FeatureHasher(
+            self.vectorizer.n_features, input_type="string", alternate_sign=False
+        )
+        return hasher.transform([[term] for term in terms]).indices
+
+    def _track_terms(self, texts, counts):
+        known = np.fromiter(
+            self.bucket_terms, dtype=np.int64, count=len(self.bucket_terms)
+        )
+        missing = np.setdiff1d(counts.indices, known)
+        if not len(missing):
+            return
+        # rows holding a bucket that has no representative n-gram yet
+        entry_rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        rows = np.unique(entry_rows[np.isin(counts.indices, missing)])
+        analyzer = self.vectorizer.build_analyzer()
+        terms = sorted({term for row in rows for term in analyzer(texts[row])})
+        wanted = set(missing.tolist())
+        for bucket, term in zip(self._buckets(terms), terms):
+            if int(bucket) in wanted:
+                self.bucket_terms.setdefault(int(bucket), term)
+
+    def _tfidf(self, counts):
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+        idf[self.doc_freq > self.max_df * self.n_docs] = 0
+        return normalize(counts.multiply(idf).tocsr())
+
+    def partial_fit(self, texts):
+        """
+        Updates document frequencies and the LDA topics with one chunk of texts.
+        """
+        texts = list(texts)
+        counts = self.vectorizer.transform(texts)
+        self.doc_freq += np.bincount(
+            counts.indices, minlength=self.vectorizer.n_features
+        )
+        self.n_docs += counts.shape[0]
+        self._track_terms(texts, counts)
+        self.lda.partial_fit(self._tfidf(counts))
+        return self
+
+    def fit(self, texts, chunk_size=10_000):
+        texts = list(texts)
+        for start in range(0, len(texts), chunk_size):
+            self.partial_fit(texts[start:start + chunk_size])
+        print(f"✅ Online topic model updated for {self.bank}")
+        return self
+
+    def topic_keywords(self, top_n=20):
+        buckets = np.fromiter(
+            self.bucket_terms, dtype=np.int64, count=len(self.bucket_terms)
+        )
+        components = np.full_like(self.lda.components_, -np.inf)
+        components[:, buckets] = self.lda.components_[:, buckets]
+        feature_names = np.empty(self.vectorizer.n_features, dtype=object)
+        feature_names[buckets] = list(self.bucket_terms.values())
+        return extract_topic_keywords(
+            SimpleNamespace(components_=components), feature_names, top_n
+        )
+
+    def transform(self, texts, verbose=True):
+        if self.theme_labels is None:
+            raise ValueError(
+                f"No theme labels set for {self.bank}; "
+                "assign theme_labels or load a saved model"
+            )
+        return map_topics_to_labels(
+            self.lda, self._tfidf(self.vectorizer.transform(texts)), self.theme_labels,
+            verbose=verbose
+        )
+
+    def _fitted_state(self):
+        return {
+            "vectorizer": self.vectorizer, "lda": self.lda, "max_df": self.max_df,
+            "doc_freq": self.doc_freq, "n_docs": self.n_docs,
+            "bucket_terms": self.bucket_terms
+        }
+
+    @classmethod
+    def from_batch(cls, batch_model, **kwargs):
+        """
+        Starts an online model from a fitted BankTopicModel: its topic-word
+        weights are hashed into the online feature space, so topic i keeps
+        meaning what it meant in the batch model and its theme labels carry over.
+        """
+        model = cls(
+            batch_model.bank,
+            lda_params={"n_components": batch_model.lda.n_components},
+            **kwargs
+        )
+        lda, n_features = model.lda, model.vectorizer.n_features
+        lda._init_latent_vars(n_features)
+        vocabulary = batch_model.vectorizer.get_feature_names_out()
+        buckets = model._buckets(vocabulary)
+        components = np.full((lda.n_components, n_features), lda.topic_word_prior_)
+        batch_lda = batch_model.lda
+        weights = batch_lda.components_ - batch_lda.topic_word_prior_
+        np.add.at(components.T, buckets, weights.T)
+        lda.components_ = components
+        lda.exp_dirichlet_component_ = np.exp(
+            digamma(components) - digamma(components.sum(axis=1))[:, np.newaxis]
+        )
+        lda.n_features_in_ = n_features
+        model.bucket_terms = {
+            int(bucket): term for bucket, term in zip(buckets, vocabulary)
+        }
+        model.theme_labels = batch_model.theme_labels
+        return model
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import sqlite3
+from collections import OrderedDict
+
+# SQLite caps the number of host parameters per statement
+_SQLITE_CHUNK = 500
+
+def normalize_text(text):
+    """
+    Collapses whitespace and lowercases, matching what the uncased DistilBERT
+    tokenizer sees, so trivially different copies share one cache entry.
+    """
+    if not isinstance(text, str):
+        return ""
+    return " ".join(text.split()).lower()
+
+class SentimentCache:
+    """
+    Content-addressed, disk-backed store of sentiment results.
+
+    Entries are keyed by a SHA-256 of the model name, model revision and the
+    normalized review text, persisted in SQLite and fronted by an in-memory LRU
+    of `max_memory_items` entries. Hit and miss counters cover both layers.
+
+    Args:
+        path: SQLite file, created if missing (":memory:" for a throwaway cache).
+        model_name: model identifier the results were produced with.
+        revision: model revision / commit hash.
+        max_memory_items: LRU capacity, 0 disables the memory layer.
+    """
+
+    def __init__(self, path, model_name, revision="main", max_memory_items=100_000):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment_cache "
+            "(key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL)"
+        )
+        self.namespace = f"{model_name}@{revision}\x1f"
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text):
+        payload = (self.namespace + normalize_text(text)).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _remember(self, key, value):
+        if not self.max_memory_items:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """
+        Returns {key: (label, score)} for the keys found in memory or on disk.
+        """
+        found = {}
+        on_disk = []
+        for key in keys:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                found[key] = self._memory[key]
+            else:
+                on_disk.append(key)
+
+        for start in range(0, len(on_disk), _SQLITE_CHUNK):
+            chunk = on_disk[start:start + _SQLITE_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT key, label, score FROM sentiment_cache "
+                f"WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for key, label, score in rows:
+                found[key] = (label, score)
+                self._remember(key, (label, score))
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """
+        Stores {key: (label, score)} results on disk and in memory.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache (key, label, score) "
+                "VALUES (?, ?, ?)",
+                [(key, label, float(score)) for key, (label, score) in items.items()]
+            )
+        for key, value in items.items():
+            self._remember(key, value)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_items": len(self._memory)
+        }
+
+    def close(self):
+        self.conn.close()
@@ -1,10 +1,287 @@
 from transformers import pipeline
 import torch
-import pandas as pd
+import numpy as np
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from src.models.sentiment_cache import SentimentCache
+from src.utils.instrumentation import instrumented
 
-def load_sentiment_model():
-    return pipeline(
-        "sentiment-analysis",
-        model="distilbert-base-uncased-finetuned-sst-2-english",
-        device=0 if torch.cuda.is_available() else -1
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+BACKENDS = ("pytorch", "quantized", "onnx")
+
+def _load_quantized(model_name, artifact_dir):
+    """
+    Dynamic int8 quantization of every Linear layer. The quantized weights are
+    saved once; later loads rebuild the architecture from the config and
+    restore them without touching the fp32 checkpoint.
+    """
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+
+    weights_path = os.path.join(artifact_dir, "quantized_state_dict.pt")
+    if os.path.exists(weights_path):
+        config = AutoConfig.from_pretrained(artifact_dir)
+        model = AutoModelForSequenceClassification.from_config(config)
+        model = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        # packed int8 params are not plain tensors; the file is our own artifact
+        model.load_state_dict(torch.load(weights_path, weights_only=False))
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        model = torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        os.makedirs(artifact_dir, exist_ok=True)
+        model.config.save_pretrained(artifact_dir)
+        torch.save(model.state_dict(), weights_path)
+    return model.eval()
+
+def _load_onnx(model_name, artifact_dir):
+    """
+    ONNX export run under onnxruntime (needs the `onnx` extra). The exported
+    graph is cached in `artifact_dir` and reused on later loads.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError(
+            "The onnx backend needs optimum[onnxruntime]: pip install '.[onnx]'"
+        ) from e
+
+    if os.path.exists(os.path.join(artifact_dir, "model.onnx")):
+        return ORTModelForSequenceClassification.from_pretrained(artifact_dir)
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(artifact_dir)
+    return model
+
+def load_sentiment_model(backend="pytorch", cache_dir="../data/cache/sentiment_models"):
+    """
+    Loads the DistilBERT SST-2 sentiment pipeline.
+
+    Args:
+        backend: "pytorch" (fp32), "quantized" (dynamic int8 PyTorch) or
+            "onnx" (exported graph on onnxruntime); the last two are CPU-only.
+        cache_dir: where quantized / exported artifacts are kept between runs.
+    """
+    if backend == "pytorch":
+        return pipeline(
+            "sentiment-analysis",
+            model=SENTIMENT_MODEL,
+            device=0 if torch.cuda.is_available() else -1
+        )
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+    from transformers import AutoTokenizer
+
+    artifact_dir = os.path.join(cache_dir, f"{SENTIMENT_MODEL}-{backend}")
+    loader = _load_quantized if backend == "quantized" else _load_onnx
+    model = loader(SENTIMENT_MODEL, artifact_dir)
+    tokenizer = AutoTokenizer.from_pretrained(SENTIMENT_MODEL)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=-1)
+
+def label_agreement(reference, candidate):
+    """
+    Compares a backend's (labels, scores) against the fp32 reference.
+
+    Returns:
+        dict with the share of identical labels, the number of flipped labels
+        and the mean / max absolute score difference where labels agree.
+    """
+    ref_labels, ref_scores = reference
+    labels, scores = candidate
+    same = np.asarray(ref_labels) == np.asarray(labels)
+    ref_scores = np.asarray(ref_scores, dtype=np.float64)
+    diff = np.abs(ref_scores - np.asarray(scores, dtype=np.float64))[same]
+    return {
+        "agreement": float(same.mean()) if len(same) else 1.0,
+        "flipped": int((~same).sum()),
+        "mean_score_diff": float(diff.mean()) if len(diff) else 0.0,
+        "max_score_diff": float(diff.max()) if len(diff) else 0.0
+    }
+
+def model_identity(model):
+    """
+    Returns (name, revision) of a loaded pipeline, used to namespace cached results.
+    """
+    config = model.model.config
+    return config._name_or_path, getattr(config, "_commit_hash", None) or "main"
+
+def open_sentiment_cache(model, path="../data/cache/sentiment_cache.sqlite", **kwargs):
+    name, revision = model_identity(model)
+    return SentimentCache(path, name, revision, **kwargs)
+
+def configure_cpu_threads(num_threads=None, interop_threads=1):
+    """
+    Pins torch's intra-op thread pool (defaults to every available core) and
+    keeps the inter-op pool small, which suits CPU-only batch inference.
+    """
+    torch.set_num_threads(num_threads or torch.get_num_threads())
+    try:
+        torch.set_num_interop_threads(interop_threads)
+    except RuntimeError:
+        pass  # can only be set once, before any parallel work has started
+
+class SentimentScorer:
+    """
+    Batched sentiment inference over a column of review texts.
+
+    Texts are sorted by length so every batch is padded only to its own
+    longest review, run through the model under torch.inference_mode and
+    scattered back into input order. With a SentimentCache, only texts the
+    cache has never seen reach the model.
+
+    Args:
+        model: pipeline from load_sentiment_model(); loaded when omitted.
+        batch_size: reviews per forward pass.
+        max_length: token limit, longer reviews are truncated.
+        num_threads: torch CPU threads, see configure_cpu_threads.
+        cache: optional SentimentCache (see open_sentiment_cache).
+    """
+
+    def __init__(self, model=None, batch_size=64, max_length=512, num_threads=None,
+                 cache=None):
+        self.model = model if model is not None else load_sentiment_model()
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache = cache
+        if self.model.device.type == "cpu":
+            configure_cpu_threads(num_threads)
+        self.id2label = self.model.model.config.id2label
+
+    def _batches(self, texts):
+        # Character length is a cheap proxy for token length when bucketing
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(lengths, kind="stable")
+        for start in range(0, len(order), self.batch_size):
+            yield order[start:start + self.batch_size]
+
+    @instrumented(
+        "sentiment_score",
+        rows=lambda arguments, result: len(result[0]),
+        batch_size="batch_size"
     )
+    def score(self, texts):
+        """
+        Scores an iterable or Series of texts.
+
+        Returns:
+            (labels, scores): NumPy arrays aligned with the input order, holding
+            the predicted label and its softmax probability.
+        """
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        if self.cache is None:
+            return self._infer(texts)
+
+        keys = [self.cache.key(text) for text in texts]
+        first_seen = {}
+        for i, key in enumerate(keys):
+            first_seen.setdefault(key, i)
+        results = self.cache.get_many(list(first_seen))
+        missing = [key for key in first_seen if key not in results]
+        if missing:
+            labels, scores = self._infer([texts[first_seen[key]] for key in missing])
+            fresh = dict(zip(missing, zip(labels.tolist(), scores.tolist())))
+            self.cache.put_many(fresh)
+            results.update(fresh)
+
+        labels = np.array([results[key][0] for key in keys], dtype=object)
+        scores = np.fromiter(
+            (results[key][1] for key in keys), dtype=np.float32, count=len(keys)
+        )
+        return labels, scores
+
+    def _infer(self, texts):
+        labels = np.empty(len(texts), dtype=object)
+        scores = np.empty(len(texts), dtype=np.float32)
+        tokenizer, model = self.model.tokenizer, self.model.model
+
+        with torch.inference_mode():
+            for idx in self._batches(texts):
+                encoded = tokenizer(
+                    [texts[i] for i in idx],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="pt"
+                ).to(self.model.device)
+                probs = model(**encoded).logits.softmax(dim=-1)
+                best, label_ids = probs.max(dim=-1)
+                scores[idx] = best.cpu().numpy()
+                labels[idx] = [self.id2label[i] for i in label_ids.tolist()]
+        return labels, scores
+
+    def score_frame(self, df, text_column="review_clean"):
+        """
+        Returns a copy of `df` with sentiment_label and sentiment_score columns.
+        """
+        labels, scores = self.score(df[text_column])
+        return df.assign(sentiment_label=labels, sentiment_score=scores)
+
+
+# Per-process scorer, built once by _init_worker
+_worker_scorer = None
+
+def _init_worker(model_loader, batch_size, num_threads):
+    global _worker_scorer
+    torch.set_num_threads(num_threads)
+    _worker_scorer = SentimentScorer(
+        model_loader(), batch_size=batch_size, num_threads=num_threads
+    )
+
+def _score_shard(texts):
+    return _worker_scorer.score(texts)
+
+def iter_sentiment_shards(texts, workers=None, shard_size=2000, batch_size=64,
+                          model_loader=load_sentiment_model):
+    """
+    Scores texts across a pool of processes and yields (labels, scores) per
+    shard, in input order.
+
+    Every worker loads the model once and gets an equal share of the CPU
+    cores as its torch thread budget. Shards are submitted lazily with at
+    most two per worker in flight, so an arbitrarily long iterable is
+    streamed with bounded memory.
+
+    Args:
+        texts: iterable or Series of review texts.
+        workers: number of processes (defaults to the CPU count).
+        shard_size: texts sent to a worker per task.
+        batch_size: forward-pass batch size inside each worker.
+        model_loader: picklable zero-argument callable returning the pipeline.
+    """
+    workers = workers or os.cpu_count()
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    texts = iter(texts)
+    pending = deque()
+    # spawn avoids inheriting torch's thread pools through fork
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_loader, batch_size, threads_per_worker)
+    ) as executor:
+        while True:
+            while len(pending) < 2 * workers:
+                shard = list(islice(texts, shard_size))
+                if not shard:
+                    break
+                pending.append(executor.submit(_score_shard, shard))
+            if not pending:
+                return
+            yield pending.popleft().result()
+
+def score_sentiments_parallel(texts, **kwargs):
+    """
+    Collects iter_sentiment_shards into full label and score arrays.
+    """
+    labels, scores = [], []
+    for shard_labels, shard_scores in iter_sentiment_shards(texts, **kwargs):
+        labels.append(shard_labels)
+        scores.append(shard_scores)
+    if not labels:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.float32)
+    return np.concatenate(labels), np.concatenate(scores)
@@ -0,0 +1,434 @@
+"""
+Multi-bank analysis pipeline: the Sentiment_and_Thematic_Analysis notebook
+flow (sentiment scoring, then keyword preprocessing, TF-IDF + LDA and theme
+mapping per bank) as a DAG of cached stages.
+
+Run from the repository root:
+    python -m src.pipeline --workers 3
+"""
+import argparse
+import ast
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+import pandas as pd
+from src.utils import instrumentation
+
+# Root of the top-level package (src/), whose modules' sources feed stage fingerprints
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bank names in the review data -> keys of the saved topic models / theme maps
+BANK_KEYS = {
+    "Dashen Bank": "dashen",
+    "Commercial Bank of Ethiopia (CBE)": "cbe",
+    "Bank of Abyssinia (BOA)": "boa"
+}
+
+
+class Stage:
+    """
+    One step of a Pipeline.
+
+    Args:
+        name: unique stage name.
+        func: module-level function called as func(*dep_outputs, **params);
+            it must be picklable to run in a worker process.
+        deps: names of the stages whose outputs are passed in, in order.
+        params: keyword arguments, part of the cache fingerprint.
+        in_process: run in the main process instead of the pool (for stages
+            that manage their own threads, e.g. model inference).
+    """
+
+    def __init__(self, name, func, deps=(), params=None, in_process=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.params = params or {}
+        self.in_process = in_process
+
+
+def _run_stage(func, args, params):
+    start = time.perf_counter()
+    result = func(*args, **params)
+    return result, time.perf_counter() - start
+
+
+def _run_stage_in_worker(func, args, params, instrumentation_config):
+    # metrics recorded in the worker are shipped back to the parent's registry
+    instrumentation.configure(**instrumentation_config)
+    instrumentation.reset()
+    result, seconds = _run_stage(func, args, params)
+    return result, seconds, instrumentation.snapshot()
+
+
+class Pipeline:
+    """
+    Runs Stages in dependency order. Stages whose dependencies are done run
+    concurrently in a process pool, so independent branches (one per bank)
+    proceed in parallel.
+
+    Each stage's output is pickled under cache_dir, keyed by a fingerprint
+    of the stage name, its function's source and the source files of the
+    package modules it uses (see stage_source_files), its params and the
+    fingerprints of its dependencies. A rerun with unchanged inputs loads
+    the output instead of recomputing it, and any change invalidates the
+    stage and everything downstream of it.
+
+    After run(), `timings` holds {"stage", "seconds", "cached"} per stage.
+    """
+
+    def __init__(self, stages, cache_dir="data/cache/pipeline", workers=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.timings = []
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise ValueError(
+                    f"Stage '{stage.name}' depends on unknown stages {missing}"
+                )
+
+    def fingerprint(self, stage, dep_keys):
+        payload = json.dumps(
+            [stage.name, code_fingerprint(stage.func), stage.params, dep_keys],
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _cache_path(self, stage, key):
+        return os.path.join(self.cache_dir, f"{stage.name}-{key}.pkl")
+
+    def _finish(self, stage, key, result, seconds, cached, results):
+        results[stage.name] = result
+        if not cached:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_path(stage, key), "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.timings.append({"stage": stage.name, "seconds": seconds, "cached": cached})
+        print(f"⏱️ {stage.name}: {seconds:.2f}s" + (" (cached)" if cached else ""))
+
+    def run(self, force=False):
+        """
+        Executes every stage and returns {stage name: output}.
+
+        Args:
+            force: ignore cached outputs (they are still rewritten).
+        """
+        pending = dict(self.stages)
+        keys, results, running = {}, {}, {}
+        self.timings = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while pending or running:
+                ready = [
+                    stage for stage in pending.values()
+                    if all(dep in results for dep in stage.deps)
+                ]
+                # pool stages are submitted before in-process ones block the loop
+                ready.sort(key=lambda stage: stage.in_process)
+                for stage in ready:
+                    del pending[stage.name]
+                    dep_keys = [keys[dep] for dep in stage.deps]
+                    key = keys[stage.name] = self.fingerprint(stage, dep_keys)
+                    cache_path = self._cache_path(stage, key)
+                    if not force and os.path.exists(cache_path):
+                        start = time.perf_counter()
+                        with open(cache_path, "rb") as f:
+                            result = pickle.load(f)
+                        seconds = time.perf_counter() - start
+                        self._finish(stage, key, result, seconds, True, results)
+                        continue
+                    args = [results[dep] for dep in stage.deps]
+                    if stage.in_process:
+                        result, seconds = _run_stage(stage.func, args, stage.params)
+                        self._finish(stage, key, result, seconds, False, results)
+                    else:
+                        running[executor.submit(
+                            _run_stage_in_worker, stage.func, args, stage.params,
+                            instrumentation.current_config()
+                        )] = stage
+                if ready:
+                    continue  # finished stages may have unblocked others
+                if not running:
+                    raise RuntimeError(
+                        f"Stages {list(pending)} can never run (dependency cycle)"
+                    )
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    result, seconds, metrics = future.result()
+                    instrumentation.merge(metrics)
+                    self._finish(
+                        stage, keys[stage.name], result, seconds, False, results
+                    )
+        return results
+
+
+def file_fingerprint(path, block_size=1 << 20):
+    """
+    SHA-256 of a file's content, so the pipeline reruns when its input changes.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _package_imports(nodes):
+    package = os.path.basename(PACKAGE_DIR)
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            # `from src.utils import utils` imports a module, `... import f` does not
+            names = [node.module]
+            names += [f"{node.module}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        yield from (name for name in names if name.split(".")[0] == package)
+
+def _module_file(name):
+    path = os.path.join(os.path.dirname(PACKAGE_DIR), *name.split("."))
+    for candidate in (f"{path}.py", os.path.join(path, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+@lru_cache(maxsize=None)
+def _file_imports(path, mtime_ns, top_level=False):
+    # parsed once per file version; mtime_ns only keys the cache
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return tuple(_package_imports(tree.body if top_level else ast.walk(tree)))
+
+def stage_source_files(func):
+    """
+    Source files of the package modules func depends on: those imported in
+    its body or at the top of its module, their parent packages and,
+    transitively, everything those modules import from the package.
+    """
+    body = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    module_file = inspect.getsourcefile(func)
+    todo = [
+        *_package_imports(ast.walk(body)),
+        *_file_imports(module_file, os.stat(module_file).st_mtime_ns, top_level=True)
+    ]
+    files = set()
+    while todo:
+        name = todo.pop()
+        if "." in name:
+            todo.append(name.rsplit(".", 1)[0])
+        path = _module_file(name)
+        if path is None or path in files:
+            continue
+        files.add(path)
+        todo += _file_imports(path, os.stat(path).st_mtime_ns)
+    return sorted(files)
+
+def code_fingerprint(func):
+    """
+    Fingerprint of func's source and of every package module it depends on,
+    so editing a helper a stage calls invalidates the stage's cache.
+    """
+    sources = [
+        [os.path.relpath(path, PACKAGE_DIR), file_fingerprint(path)]
+        for path in stage_source_files(func)
+    ]
+    return [inspect.getsource(func), sources]
+
+
+# --- stages of the analysis ---
+
+def load_reviews(path, source_hash):
+    """
+    Loads the cleaned reviews; review_clean is derived when the file lacks it.
+    (source_hash only feeds the cache fingerprint.)
+    """
+    from src.utils.utils import clean_review_column
+
+    df = pd.read_csv(path)
+    df = df.drop(columns=[col for col in df if col.startswith("Unnamed:")])
+    if "review_clean" not in df:
+        df["review_clean"] = clean_review_column(df["review"])
+    return df
+
+def score_sentiment(df, backend="pytorch", batch_size=64):
+    """
+    sentiment_label / sentiment_score for every review, aligned with df's index.
+    """
+    from src.models.sentiments import SentimentScorer, load_sentiment_model
+
+    scorer = SentimentScorer(load_sentiment_model(backend), batch_size=batch_size)
+    labels, scores = scorer.score(df["review_clean"])
+    return pd.DataFrame(
+        {"sentiment_label": labels, "sentiment_score": scores}, index=df.index
+    )
+
+def bank_themes(df, bank, themes_dir, saved_model_hash=None):
+    """
+    keyword_ready and identified_theme for one bank's reviews, from the
+    bank's saved BankTopicModel (see fit_topic_models). Topics of a model
+    without a theme map yet are reported as "Topic <n>". (saved_model_hash
+    only feeds the cache fingerprint, so relabelling or replacing a saved
+    model reruns the stage.)
+    """
+    from src.utils.keyword_text_processor import preprocess_column_for_keywords
+    from src.models.keyword_and_topicmodeling import BankTopicModel
+
+    bank_key = BANK_KEYS[bank]
+    bank_df = df[df["bank"] == bank]
+    keyword_ready = preprocess_column_for_keywords(bank_df["review_clean"])
+
+    model = BankTopicModel.load(bank_key, themes_dir)
+    if model.theme_labels is None:
+        model.theme_labels = {
+            i: f"Topic {i + 1}" for i in range(model.lda.n_components)
+        }
+
+    return pd.DataFrame(
+        {
+            "keyword_ready": keyword_ready,
+            "identified_theme": model.transform(keyword_ready)
+        },
+        index=bank_df.index
+    )
+
+def combine(df, *parts):
+    """
+    Joins the sentiment and per-bank theme columns back onto the reviews,
+    keeping only reviews of the analysed banks (as the notebook's concat did).
+    """
+    sentiment = [part for part in parts if "sentiment_label" in part]
+    themes = pd.concat([part for part in parts if "identified_theme" in part])
+    combined = df.loc[themes.index]
+    for part in sentiment:
+        combined = combined.join(part)
+    return combined.join(themes).reset_index(drop=True)
+
+
+def fit_topic_models(input_path, themes_dir, banks=tuple(BANK_KEYS)):
+    """
+    Fits and saves the topic model of every bank in `banks` that has none
+    under themes_dir yet. Runs before the pipeline, outside its cache, so
+    the theme stages only read saved models and their fingerprints do not
+    change under them. Only the model is saved: label its topics in
+    <bank>_theme_map.json (see save_topics_with_labels).
+
+    Returns:
+        bank keys of the newly fitted models.
+    """
+    from src.utils.keyword_text_processor import preprocess_column_for_keywords
+    from src.models.keyword_and_topicmodeling import BankTopicModel
+
+    missing = [
+        bank for bank in banks
+        if not os.path.exists(os.path.join(
+            themes_dir, f"{BANK_KEYS[bank]}_{BankTopicModel.model_file}.joblib"
+        ))
+    ]
+    if not missing:
+        return []
+    df = load_reviews(input_path, source_hash=None)
+    for bank in missing:
+        bank_key = BANK_KEYS[bank]
+        texts = df.loc[df["bank"] == bank, "review_clean"]
+        model = BankTopicModel(bank_key).fit(preprocess_column_for_keywords(texts))
+        model.save_model(themes_dir)
+        print(f"💾 Saved an unlabelled topic model for {bank}; "
+              f"label its topics in {bank_key}_theme_map.json")
+    return [BANK_KEYS[bank] for bank in missing]
+
+def _saved_model_hash(themes_dir, bank_key):
+    paths = [
+        os.path.join(themes_dir, f"{bank_key}_topic_model.joblib"),
+        os.path.join(themes_dir, f"{bank_key}_theme_map.json")
+    ]
+    return [file_fingerprint(path) if os.path.exists(path) else None for path in paths]
+
+def build_pipeline(input_path, themes_dir, cache_dir, banks=tuple(BANK_KEYS),
+                   sentiment=True, backend="pytorch", batch_size=64, workers=None):
+    stages = [Stage("load", load_reviews, params={
+        "path": input_path, "source_hash": file_fingerprint(input_path)
+    })]
+    if sentiment:
+        stages.append(Stage("sentiment", score_sentiment, ["load"],
+                            {"backend": backend, "batch_size": batch_size},
+                            in_process=True))
+    theme_stages = [f"themes_{BANK_KEYS[bank]}" for bank in banks]
+    stages += [
+        Stage(name, bank_themes, ["load"], {
+            "bank": bank, "themes_dir": themes_dir,
+            "saved_model_hash": _saved_model_hash(themes_dir, BANK_KEYS[bank])
+        })
+        for name, bank in zip(theme_stages, banks)
+    ]
+    combine_deps = ["load"] + (["sentiment"] if sentiment else []) + theme_stages
+    stages.append(Stage("combine", combine, combine_deps))
+    return Pipeline(stages, cache_dir=cache_dir, workers=workers)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sentiment and per-bank theme analysis pipeline."
+    )
+    parser.add_argument("--input", default="data/processed/cleaned_reviews.csv")
+    parser.add_argument(
+        "--output", default="data/processed/reviews with sentiments and themes.csv"
+    )
+    parser.add_argument("--themes-dir", default="data/processed/bank_themes")
+    parser.add_argument("--cache-dir", default="data/cache/pipeline")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for the per-bank branches")
+    parser.add_argument("--backend", default="pytorch",
+                        help="sentiment backend, see load_sentiment_model")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--no-sentiment", action="store_true",
+                        help="skip sentiment scoring")
+    parser.add_argument("--force", action="store_true", help="recompute every stage")
+    parser.add_argument("--timings", default=None,
+                        help="write per-stage timings to this JSON file")
+    parser.add_argument("--metrics", default=None,
+                        help="write function-level metrics to this file "
+                             "(.prom for Prometheus text, else JSON)")
+    parser.add_argument("--profile-stage", default=None,
+                        help="profile one instrumented stage, "
+                             "e.g. sentiment_score or map_topics_to_labels")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"],
+                        default="cprofile")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    instrumentation.configure(
+        profile_stage=args.profile_stage,
+        profiler=args.profiler,
+        profile_dir=os.path.join(args.cache_dir, "profiles")
+    )
+    fit_topic_models(args.input, args.themes_dir)
+    pipeline = build_pipeline(
+        args.input, args.themes_dir, args.cache_dir,
+        sentiment=not args.no_sentiment, backend=args.backend,
+        batch_size=args.batch_size, workers=args.workers
+    )
+    start = time.perf_counter()
+    results = pipeline.run(force=args.force)
+    results["combine"].to_csv(args.output, index=False)
+    seconds = time.perf_counter() - start
+    print(f"✅ Saved {len(results['combine'])} reviews to {args.output} "
+          f"in {seconds:.1f}s")
+    if args.timings:
+        with open(args.timings, "w", encoding="utf-8") as f:
+            json.dump(pipeline.timings, f, indent=4)
+    if args.metrics:
+        instrumentation.export_metrics(args.metrics)
+
+if __name__ == "__main__":
+    main()
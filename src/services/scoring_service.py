@@ -0,0 +1,379 @@
+"""
+Long-running local scoring service for on-demand review classification.
+
+The sentiment pipeline and every bank's saved topic model are loaded once at
+startup and kept warm. Concurrent requests are queued and scored together
+in micro-batches: a batch is sent to the models once it holds `max_batch`
+reviews or `max_wait` seconds after its first review arrived, whichever
+comes first, so a lone request waits at most max_wait and a burst shares
+one forward pass.
+
+Run from the repository root:
+    python -m src.services.scoring_service --port 8008
+
+    curl -s localhost:8008/score \
+        -d '{"reviews": [{"review": "OTP never arrives", "bank": "Dashen Bank"}]}'
+    {"results": [{"sentiment_label": "NEGATIVE", "sentiment_score": 0.99,
+                  "themes": [...]}]}
+
+GET /health reports the loaded banks and the batching counters.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+import pandas as pd
+from src.pipeline import BANK_KEYS
+from src.utils.utils import clean_review_column
+
+MAX_BATCH = 32
+MAX_WAIT = 0.005
+MAX_QUEUE = 10_000
+MAX_BODY_BYTES = 1_000_000
+
+
+class ReviewScorer:
+    """
+    Scores a batch of {"review": text, "bank": name} items: sentiment label
+    and score from the sentiment scorer, top-3 themes from the bank's topic
+    model (None for banks without one).
+
+    Args:
+        sentiment: SentimentScorer (or anything with its score(texts) method).
+        topic_models: {bank key: fitted BankTopicModel with theme labels}.
+        keyword_preprocessor: column-level keyword preprocessing, defaults
+            to preprocess_column_for_keywords.
+    """
+
+    def __init__(self, sentiment, topic_models, keyword_preprocessor=None):
+        self.sentiment = sentiment
+        self.topic_models = topic_models
+        if keyword_preprocessor is None:
+            from src.utils.keyword_text_processor import preprocess_column_for_keywords
+            keyword_preprocessor = preprocess_column_for_keywords
+        self.keyword_preprocessor = keyword_preprocessor
+
+    @classmethod
+    def load(cls, themes_dir, backend="pytorch", batch_size=MAX_BATCH):
+        """
+        Loads the sentiment pipeline and the saved topic model of every bank
+        found in themes_dir (as written by src.pipeline).
+        """
+        from src.models.sentiments import SentimentScorer, load_sentiment_model
+        from src.models.keyword_and_topicmodeling import BankTopicModel
+
+        topic_models = {
+            key: BankTopicModel.load(key, themes_dir) for key in BANK_KEYS.values()
+            if os.path.exists(
+                os.path.join(themes_dir, f"{key}_{BankTopicModel.model_file}.joblib")
+            )
+        }
+        # a model whose topics are not labelled yet cannot name themes
+        topic_models = {
+            key: model for key, model in topic_models.items()
+            if model.theme_labels is not None
+        }
+        sentiment = SentimentScorer(
+            load_sentiment_model(backend), batch_size=batch_size
+        )
+        return cls(sentiment, topic_models)
+
+    def bank_key(self, bank):
+        return BANK_KEYS.get(bank, bank)
+
+    def warm_up(self):
+        """
+        Runs one review per bank through every model, so lazy imports, NLTK
+        corpora and the first-call costs are paid before serving.
+        """
+        self([
+            {"review": "The app works well but the OTP is slow", "bank": bank}
+            for bank in self.topic_models
+        ])
+
+    def __call__(self, items):
+        reviews = pd.Series([item.get("review") for item in items], dtype=object)
+        texts = clean_review_column(reviews).tolist()
+        labels, scores = self.sentiment.score(texts)
+        themes = [None] * len(items)
+
+        by_bank = {}
+        for i, item in enumerate(items):
+            key = self.bank_key(item.get("bank"))
+            if key in self.topic_models:
+                by_bank.setdefault(key, []).append(i)
+        for key, positions in by_bank.items():
+            keyword_ready = self.keyword_preprocessor(
+                pd.Series([texts[i] for i in positions], dtype=object)
+            )
+            bank_themes = self.topic_models[key].transform(keyword_ready, verbose=False)
+            for i, review_themes in zip(positions, bank_themes):
+                themes[i] = review_themes
+
+        return [
+            {
+                "sentiment_label": label, "sentiment_score": float(score),
+                "themes": review_themes
+            }
+            for label, score, review_themes in zip(labels, scores, themes)
+        ]
+
+
+class MicroBatcher:
+    """
+    Groups items submitted from concurrent coroutines into batches for a
+    blocking `process(items) -> results` function, run on one worker thread
+    so the event loop keeps accepting requests while a batch is scored.
+
+    A batch closes at max_batch items or max_wait seconds after its first
+    item; items arriving meanwhile start the next batch. Once max_queue
+    items wait, submit raises asyncio.QueueFull.
+    """
+
+    def __init__(self, process, max_batch=MAX_BATCH, max_wait=MAX_WAIT,
+                 max_queue=MAX_QUEUE):
+        self.process = process
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self._arrived = asyncio.Event()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.batches = 0
+        self.items = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self.queue.qsize()
+        }
+
+    async def submit(self, items):
+        """
+        Queues items and returns their results, in order.
+        """
+        if self.queue.qsize() + len(items) > self.queue.maxsize:
+            raise asyncio.QueueFull
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in items]
+        for item, future in zip(items, futures):
+            self.queue.put_nowait((item, future))
+        self._arrived.set()
+        return await asyncio.gather(*futures)
+
+    async def _next_batch(self):
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while True:
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch or remaining <= 0:
+                return batch
+            # wait on an event rather than queue.get, so a timeout never drops an item
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            # requests whose client went away are not scored
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.process, [item for item, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+class ScoringService:
+    """
+    Minimal HTTP/1.1 JSON server (keep-alive, asyncio streams) in front of a
+    MicroBatcher.
+
+    POST /score  {"reviews": [{"review": ..., "bank": ...}, ...]} or a single
+                 {"review": ..., "bank": ...}
+                 -> {"results": [...]} in request order
+    GET /health  -> {"status": "ok", "banks": [...], "batches": ..., ...}
+    """
+
+    def __init__(self, scorer, max_batch=MAX_BATCH, max_wait=MAX_WAIT,
+                 max_queue=MAX_QUEUE):
+        self.scorer = scorer
+        self.batcher = MicroBatcher(scorer, max_batch, max_wait, max_queue)
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=8008):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._serve_connection, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await _respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                   {"error": "request head too large"})
+                    break
+                try:
+                    method, path, version, headers = _parse_head(head)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(f"negative Content-Length {length}")
+                except ValueError as e:
+                    await _respond(writer, HTTPStatus.BAD_REQUEST,
+                                   {"error": f"malformed request: {e}"})
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                   {"error": "body too large"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self._handle(method, path, body)
+                await _respond(writer, status, payload)
+                closing = headers.get("connection", "").lower() == "close"
+                if closing or version == "HTTP/1.0":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, method, path, body):
+        if path == "/health" and method == "GET":
+            banks = sorted(getattr(self.scorer, "topic_models", {}))
+            return HTTPStatus.OK, {"status": "ok", "banks": banks,
+                                   **self.batcher.stats()}
+        if path != "/score":
+            return HTTPStatus.NOT_FOUND, {"error": f"no route {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+        try:
+            request = json.loads(body)
+            items = request["reviews"] if "reviews" in request else [request]
+            if not all(isinstance(item, dict) for item in items):
+                raise ValueError("each review must be an object")
+            # checked here so one bad item cannot fail its whole micro-batch
+            for item in items:
+                for field in ("review", "bank"):
+                    if not isinstance(item.get(field), (str, type(None))):
+                        raise ValueError(f"{field} must be a string or null")
+        except (ValueError, TypeError, KeyError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"invalid request: {e}"}
+        try:
+            return HTTPStatus.OK, {"results": await self.batcher.submit(items)}
+        except asyncio.QueueFull:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "scoring queue is full"}
+        except Exception as e:
+            logging.exception("❌ Scoring failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+def _parse_head(head):
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, path.split("?", 1)[0], version, headers
+
+async def _respond(writer, status, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve sentiment and theme scoring over HTTP."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8008)
+    parser.add_argument("--themes-dir", default="data/processed/bank_themes",
+                        help="saved per-bank topic models and theme maps "
+                             "(see src.pipeline)")
+    parser.add_argument("--backend", default="pytorch",
+                        help="sentiment backend, see load_sentiment_model")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help="reviews per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT * 1000,
+                        help="longest a review waits for its batch to fill")
+    parser.add_argument("--max-queue", type=int, default=MAX_QUEUE,
+                        help="queued reviews before 503s")
+    return parser.parse_args(argv)
+
+async def serve(args):
+    start = time.perf_counter()
+    scorer = ReviewScorer.load(args.themes_dir, args.backend, args.max_batch)
+    scorer.warm_up()
+    service = ScoringService(
+        scorer, args.max_batch, args.max_wait_ms / 1000, args.max_queue
+    )
+    host, port = await service.start(args.host, args.port)
+    logging.info(f"✅ Models warm in {time.perf_counter() - start:.1f}s "
+                 f"(topic models: {sorted(scorer.topic_models) or 'none'}); "
+                 f"serving on http://{host}:{port}")
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.stop()
+
+def main(argv=None):
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s"
+    )
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        logging.info("👋 Scoring service stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import string
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from src.utils.utils import map_unique
+
+# Multiplier of the rolling shingle hash (arithmetic wraps modulo 2**64)
+_ROLLING_BASE = np.uint64(1_000_003)
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+def normalize_for_dedup(text):
+    """
+    Lowercases, drops ASCII punctuation and collapses whitespace, so
+    "Great app!!" and "great  app" hash to the same exact-duplicate key.
+    Emojis and Amharic script are kept.
+    """
+    if not isinstance(text, str):
+        return ""
+    return " ".join(text.lower().translate(_PUNCTUATION).split())
+
+def _permutations(num_perm, seed):
+    rng = np.random.default_rng(seed)
+    # odd multipliers
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+def _shingle_hashes(texts, shingle_size):
+    """
+    Rolling hashes of every character k-shingle of every text, computed over
+    the concatenated code points in one pass.
+
+    Returns:
+        (hashes, starts, eligible): the hashes grouped by text, the offset of
+        each eligible text's first hash, and which texts have at least one
+        full shingle.
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    code_points = "".join(texts).encode("utf-32-le")
+    codes = np.frombuffer(code_points, dtype=np.uint32).astype(np.uint64)
+    n_windows = len(codes) - shingle_size + 1
+    eligible = lengths >= shingle_size
+    if n_windows <= 0 or not eligible.any():
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), eligible
+
+    hashes = np.zeros(n_windows, dtype=np.uint64)
+    for j in range(shingle_size):
+        hashes = hashes * _ROLLING_BASE + codes[j:j + n_windows]
+
+    # keep windows that lie inside a single text
+    ends = np.cumsum(lengths)
+    owner = np.repeat(np.arange(len(texts)), lengths)[:n_windows]
+    inside = np.arange(n_windows) + shingle_size <= ends[owner]
+    counts = np.maximum(lengths - shingle_size + 1, 0)[eligible]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return hashes[inside], starts, eligible
+
+def minhash_signatures(texts, num_perm=64, shingle_size=5, seed=1, chunk_size=50_000):
+    """
+    MinHash signatures over character shingles.
+
+    Each permutation is a multiply-shift hash of the shingle hashes, and its
+    minimum per text is taken with np.minimum.reduceat, so the cost is linear
+    in the total text length.
+
+    Args:
+        texts: list of (normalized) strings.
+        num_perm: signature length.
+        shingle_size: characters per shingle.
+        seed: seed of the hash permutations.
+        chunk_size: texts hashed at a time, bounds memory.
+
+    Returns:
+        (signatures, eligible): a (len(texts), num_perm) uint32 array and a
+        mask of texts long enough to have a signature (other rows are 0).
+    """
+    a, b = _permutations(num_perm, seed)
+    signatures = np.zeros((len(texts), num_perm), dtype=np.uint32)
+    eligible = np.zeros(len(texts), dtype=bool)
+    for start in range(0, len(texts), chunk_size):
+        hashes, starts, chunk_eligible = _shingle_hashes(
+            texts[start:start + chunk_size], shingle_size
+        )
+        eligible[start:start + len(chunk_eligible)] = chunk_eligible
+        if not len(hashes):
+            continue
+        rows = start + np.flatnonzero(chunk_eligible)
+        permuted = np.empty_like(hashes)  # reused across permutations
+        for p in range(num_perm):
+            np.multiply(hashes, a[p], out=permuted)
+            np.add(permuted, b[p], out=permuted)
+            np.right_shift(permuted, np.uint64(32), out=permuted)
+            signatures[rows, p] = np.minimum.reduceat(permuted, starts)
+    return signatures, eligible
+
+def _lsh_edges(signatures, bands, threshold):
+    """
+    Candidate pairs from banded LSH: within each band, every text is paired
+    with the first text sharing its bucket, and the pair is kept when the
+    signature agreement (estimated Jaccard) reaches the threshold.
+    """
+    rows_per_band = signatures.shape[1] // bands
+    rng = np.random.default_rng(0)
+    mix = rng.integers(1, 2**63, size=rows_per_band, dtype=np.uint64) | np.uint64(1)
+    sources, targets = [], []
+    for band in range(bands):
+        band_columns = slice(band * rows_per_band, (band + 1) * rows_per_band)
+        block = signatures[:, band_columns].astype(np.uint64)
+        keys = (block * mix).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        run_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        rep = order[np.flatnonzero(run_start)[np.cumsum(run_start) - 1]]
+        pair = rep != order
+        left, right = rep[pair], order[pair]
+        if not len(left):
+            continue
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        keep = similarity >= threshold
+        sources.append(left[keep])
+        targets.append(right[keep])
+    if not sources:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(sources), np.concatenate(targets)
+
+def find_duplicate_groups(texts, threshold=0.8, num_perm=64, bands=16, shingle_size=5,
+                          seed=1, chunk_size=50_000):
+    """
+    Groups exact and near-duplicate texts.
+
+    Texts are normalized (normalize_for_dedup) and identical ones collapse to
+    one entry. The distinct texts are MinHashed and bucketed with LSH
+    (`bands` bands of num_perm / bands rows), and candidates whose estimated
+    Jaccard similarity is at least `threshold` are merged, transitively.
+    Texts shorter than a shingle only take part in exact matching.
+
+    Returns:
+        int64 array of group ids aligned with `texts`, numbered by first appearance.
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+    texts = pd.Series(texts, dtype=object)
+    normalized = map_unique(texts, normalize_for_dedup)
+    codes, uniques = pd.factorize(normalized)
+    n_unique = len(uniques)
+
+    signatures, eligible = minhash_signatures(
+        list(uniques), num_perm, shingle_size, seed, chunk_size
+    )
+    members = np.flatnonzero(eligible)
+    left, right = _lsh_edges(signatures[members], bands, threshold)
+    graph = coo_matrix(
+        (np.ones(len(left), dtype=np.int8), (members[left], members[right])),
+        shape=(n_unique, n_unique)
+    )
+    _, components = connected_components(graph, directed=False)
+    return pd.factorize(components[codes])[0].astype(np.int64)
+
+def assign_dup_groups(df, text_column="review_clean", **kwargs):
+    """
+    Returns a copy of `df` with a `dup_group_id` column (see find_duplicate_groups).
+    """
+    return df.assign(dup_group_id=find_duplicate_groups(df[text_column], **kwargs))
+
+def group_representatives(df):
+    """
+    First row of every duplicate group: the rows to send through the
+    expensive stages (sentiment, topic modeling).
+    """
+    return df.drop_duplicates("dup_group_id")
+
+def fan_out(df, representatives, columns):
+    """
+    Copies `columns` computed on the representatives back to every row of
+    their duplicate group.
+    """
+    results = representatives.set_index("dup_group_id")[columns]
+    df = df.drop(columns=[col for col in columns if col in df])
+    return df.join(results, on="dup_group_id")
@@ -0,0 +1,338 @@
+"""
+Lightweight per-stage metrics: wall time, rows/sec, peak memory and batch
+sizes of the pipeline stages (scraping, cleaning, keyword preprocessing,
+sentiment scoring, theme mapping, Oracle loads).
+
+Functions are wrapped with @instrumented; ad-hoc blocks use measure().
+Results accumulate per stage in a process-wide registry that is exported
+with export_json / export_prometheus (or export_metrics by file extension).
+One stage at a time can additionally be profiled with cProfile or
+pyinstrument, see configure().
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_config = {
+    "enabled": os.getenv("CEA_METRICS", "1") != "0",
+    "profile_stage": os.getenv("CEA_PROFILE_STAGE") or None,
+    "profiler": "cprofile",
+    "profile_dir": "../data/cache/profiles",
+    "sample_interval": 0.01
+}
+_lock = threading.Lock()
+_registry = {}
+_profilers = {}
+
+
+def configure(**settings):
+    """
+    Updates the instrumentation settings:
+
+    - enabled: record metrics at all (CEA_METRICS=0 disables by default).
+    - profile_stage: name of the stage to profile (also CEA_PROFILE_STAGE).
+    - profiler: "cprofile" (stats in <profile_dir>/<stage>.prof) or
+      "pyinstrument" (HTML report in <profile_dir>/<stage>.html).
+    - profile_dir: where profiles are written.
+    - sample_interval: seconds between RSS samples while a stage runs.
+    """
+    unknown = set(settings) - set(_config)
+    if unknown:
+        raise ValueError(f"Unknown instrumentation settings {sorted(unknown)}")
+    _config.update(settings)
+
+
+def current_config():
+    return dict(_config)
+
+
+class StageMetrics:
+    """
+    Accumulated metrics of one stage.
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.calls = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.peak_memory_bytes = 0
+        self.batch_size = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add(self, seconds, rows=None, peak_memory_bytes=None, batch_size=None, calls=1):
+        self.calls += calls
+        self.seconds += seconds
+        self.rows += rows or 0
+        self.peak_memory_bytes = max(self.peak_memory_bytes, peak_memory_bytes or 0)
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+    def to_dict(self):
+        return {
+            "stage": self.stage,
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "rows": self.rows,
+            "rows_per_second": self.rows_per_second,
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "batch_size": self.batch_size
+        }
+
+
+class _PeakRssSampler:
+    """
+    Samples the process RSS on a daemon thread while a stage runs (psutil),
+    falling back to the lifetime peak from getrusage when psutil is missing.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        try:
+            import psutil
+            self._process = psutil.Process()
+        except ImportError:
+            self._process = None
+
+    def _rss(self):
+        return self._process.memory_info().rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self._rss())
+
+    def __enter__(self):
+        if self._process is not None:
+            self.peak = self._rss()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._process is None:
+            try:
+                import resource
+                self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            except ImportError:
+                pass
+            return
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._rss())
+
+
+@contextmanager
+def _profiled(stage):
+    if stage != _config["profile_stage"]:
+        yield
+        return
+    os.makedirs(_config["profile_dir"], exist_ok=True)
+    if _config["profiler"] == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            path = os.path.join(_config["profile_dir"], f"{stage}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+        return
+
+    import cProfile
+
+    # one profile per stage, accumulated over calls
+    profiler = _profilers.setdefault(stage, cProfile.Profile())
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(_config["profile_dir"], f"{stage}.prof"))
+
+
+class _Record:
+    """
+    Handle yielded by measure(); set rows / batch_size inside the block.
+    """
+
+    def __init__(self):
+        self.rows = None
+        self.batch_size = None
+
+
+def _record(stage, seconds, rows=None, peak_memory_bytes=None, batch_size=None):
+    with _lock:
+        metrics = _registry.setdefault(stage, StageMetrics(stage))
+        metrics.add(seconds, rows, peak_memory_bytes, batch_size)
+
+
+@contextmanager
+def measure(stage, rows=None, batch_size=None, track_memory=True):
+    """
+    Times the enclosed block as one call of `stage`.
+
+    Example:
+        with measure("lda_fit", rows=len(texts)) as record:
+            model.fit(texts)
+    """
+    record = _Record()
+    record.rows, record.batch_size = rows, batch_size
+    if not _config["enabled"]:
+        yield record
+        return
+    sampler = _PeakRssSampler(_config["sample_interval"]) if track_memory else None
+    start = time.perf_counter()
+    with _profiled(stage):
+        if sampler is None:
+            yield record
+        else:
+            with sampler:
+                yield record
+    peak = sampler.peak if sampler else None
+    _record(stage, time.perf_counter() - start, record.rows, peak, record.batch_size)
+
+
+def _resolve(spec, arguments, result):
+    if spec is None or isinstance(spec, int):
+        return spec
+    if callable(spec):
+        return spec(arguments, result)
+    value = result if spec == "result" else arguments.get(spec)
+    if isinstance(value, int):
+        return value
+    if hasattr(value, "shape"):
+        return value.shape[0]
+    return len(value) if hasattr(value, "__len__") else None
+
+
+def instrumented(stage=None, rows=None, batch_size=None, track_memory=True):
+    """
+    Decorator recording every call of a function as a `stage` call (the
+    function name by default).
+
+    Args:
+        rows: parameter name whose len() (or shape[0]) is the row count,
+            "result" for the return value, a constant int, or
+            callable(arguments, result).
+        batch_size: parameter name (or callable) giving the batch size.
+        track_memory: sample peak RSS. Turn off for functions called once
+            per row: they then only pay for two clock reads per call.
+    """
+    def decorator(func):
+        name = stage or func.__name__
+        signature = inspect.signature(func)
+        needs_arguments = (
+            not (rows is None or isinstance(rows, int)) or batch_size is not None
+        )
+
+        def details(args, kwargs, result):
+            if not needs_arguments:
+                return rows, None
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if "self" in arguments:
+                arguments.update(vars(arguments["self"]))
+            return (
+                _resolve(rows, arguments, result),
+                _resolve(batch_size, arguments, None)
+            )
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _config["enabled"]:
+                return func(*args, **kwargs)
+            if not track_memory and name != _config["profile_stage"]:
+                start = time.perf_counter()
+                result = func(*args, **kwargs)
+                seconds = time.perf_counter() - start
+                _record(name, seconds, *details(args, kwargs, result))
+                return result
+            with measure(name, track_memory=track_memory) as record:
+                result = func(*args, **kwargs)
+                record.rows, record.batch_size = details(args, kwargs, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """
+    Current metrics as a list of dicts, one per stage.
+    """
+    with _lock:
+        return [metrics.to_dict() for metrics in _registry.values()]
+
+
+def merge(records):
+    """
+    Adds metrics recorded elsewhere (e.g. snapshot() of a worker process).
+    """
+    with _lock:
+        for record in records:
+            metrics = _registry.setdefault(
+                record["stage"], StageMetrics(record["stage"])
+            )
+            metrics.add(record["seconds"], record["rows"], record["peak_memory_bytes"],
+                        record["batch_size"], calls=record["calls"])
+
+
+def reset():
+    with _lock:
+        _registry.clear()
+
+
+def export_json(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=4)
+
+
+_PROMETHEUS_METRICS = [
+    ("calls", "cea_stage_calls_total", "counter", "Number of calls of the stage"),
+    ("seconds", "cea_stage_seconds_total", "counter", "Wall time spent in the stage"),
+    ("rows", "cea_stage_rows_total", "counter", "Rows processed by the stage"),
+    ("rows_per_second", "cea_stage_rows_per_second", "gauge",
+     "Rows per second of wall time"),
+    ("peak_memory_bytes", "cea_stage_peak_memory_bytes", "gauge",
+     "Peak process RSS during the stage"),
+    ("batch_size", "cea_stage_batch_size", "gauge", "Batch size of the last call"),
+]
+
+def export_prometheus(path):
+    """
+    Writes the metrics in the Prometheus text exposition format (for the
+    node_exporter textfile collector or a push gateway).
+    """
+    records = snapshot()
+    lines = []
+    for key, metric, kind, help_text in _PROMETHEUS_METRICS:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        for record in records:
+            if record[key] is not None:
+                lines.append(f'{metric}{{stage="{record["stage"]}"}} {record[key]}')
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def export_metrics(path):
+    """
+    Prometheus text for *.prom paths, JSON otherwise.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".prom"):
+        export_prometheus(path)
+    else:
+        export_json(path)
+    print(f"📈 Metrics written to {path}")
@@ -1,13 +1,37 @@
+import os
 import re
-import emoji
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from src.utils.utils import map_unique
+from src.utils.instrumentation import instrumented
 
-stop_words = set(stopwords.words('english'))
-lemmatizer = WordNetLemmatizer()
+# NLTK and emoji cost seconds to import and the corpora more to load, so both
+# are pulled in on first use instead of at import time.
 
+@lru_cache(maxsize=1)
+def get_stop_words():
+    from nltk.corpus import stopwords
+    return set(stopwords.words('english'))
+
+@lru_cache(maxsize=1)
+def get_lemmatizer():
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+def __getattr__(name):
+    # Keeps the former module-level `stop_words` / `lemmatizer` available
+    if name == "stop_words":
+        return get_stop_words()
+    if name == "lemmatizer":
+        return get_lemmatizer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# called once per review, so only time and row counts are recorded
+@instrumented(rows=1, track_memory=False)
 def preprocess_for_keywords(text):
     """
     Prepares review text for keyword extraction:
@@ -15,12 +39,140 @@ def preprocess_for_keywords(text):
     - Tokenizes, lowers, removes stopwords
     - Applies lemmatization
     """
+    import emoji
+    from nltk.tokenize import word_tokenize
+
     if not isinstance(text, str):
         return ""
     text = emoji.replace_emoji(text, replace='')
     text = re.sub(r'[^\w\s]', '', text)
     text = re.sub(r'\d+', '', text)
     tokens = word_tokenize(text.lower())
+    stop_words, lemmatizer = get_stop_words(), get_lemmatizer()
     filtered = [word for word in tokens if word not in stop_words]
     lemmatized = [lemmatizer.lemmatize(word) for word in filtered]
-    return ' '.join(lemmatized)
\ No newline at end of file
+    return ' '.join(lemmatized)
+
+# After punctuation and digits are stripped only word characters and
+# whitespace remain, so the two substitutions collapse into one character pass.
+_NON_WORD_OR_DIGIT_RE = re.compile(r"[^\w\s]|\d")
+
+@lru_cache(maxsize=1)
+def _emoji_word_chars():
+    """
+    Emoji characters that are also word characters (e.g. 'ℹ'). Every other
+    emoji character is dropped by _NON_WORD_OR_DIGIT_RE anyway, so
+    emoji.replace_emoji only changes the result when one of these is present.
+    """
+    import emoji
+
+    word, digit = re.compile(r"\w"), re.compile(r"\d")
+    return frozenset(
+        char for emj in emoji.EMOJI_DATA for char in emj
+        if word.match(char) and not digit.match(char)
+    )
+
+@lru_cache(maxsize=None)
+def _keyword_tokens(token):
+    """
+    Tokenizes, stopword-filters and lemmatizes one whitespace-delimited token.
+    With punctuation gone, word_tokenize only splits contractions such as
+    'cannot' within a token, so results can be memoized per vocabulary entry.
+    """
+    from nltk.tokenize import word_tokenize
+
+    stop_words, lemmatizer = get_stop_words(), get_lemmatizer()
+    return tuple(
+        lemmatizer.lemmatize(word)
+        for word in word_tokenize(token) if word not in stop_words
+    )
+
+def _preprocess_fast(text):
+    if not isinstance(text, str):
+        return ""
+    if not _emoji_word_chars().isdisjoint(text):
+        import emoji
+        text = emoji.replace_emoji(text, replace='')
+    text = _NON_WORD_OR_DIGIT_RE.sub('', text).lower()
+    return ' '.join(word for token in text.split() for word in _keyword_tokens(token))
+
+@instrumented(rows="series")
+def preprocess_column_for_keywords(series):
+    """
+    Column-level preprocess_for_keywords with identical output: each distinct
+    text is processed once and tokenization, stopword filtering and
+    lemmatization are cached per distinct token.
+    """
+    return map_unique(series, _preprocess_fast)
+
+def _init_keyword_worker():
+    """
+    Pool initializer: loads the stopwords, WordNet and the emoji lookup once
+    per process instead of on the first text of the first chunk.
+    """
+    from nltk.corpus import wordnet
+
+    get_stop_words()
+    wordnet.ensure_loaded()
+    get_lemmatizer().lemmatize("warmup")
+    _emoji_word_chars()
+
+def _preprocess_chunk(texts):
+    return [_preprocess_fast(text) for text in texts]
+
+def _series_chunks(texts, chunk_size):
+    if isinstance(texts, pd.Series):
+        for start in range(0, len(texts), chunk_size):
+            yield texts.iloc[start:start + chunk_size]
+        return
+    texts, start = iter(texts), 0
+    while True:
+        chunk = list(islice(texts, chunk_size))
+        if not chunk:
+            return
+        yield pd.Series(chunk, index=range(start, start + len(chunk)), dtype=object)
+        start += len(chunk)
+
+def iter_preprocessed_chunks(texts, chunk_size=50_000, workers=None):
+    """
+    Runs preprocess_for_keywords over a column in a process pool and yields
+    the processed chunks in input order, keeping the source index.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    for long columns or lazy iterables. Each chunk is deduplicated and
+    token-memoized inside its worker (see preprocess_column_for_keywords).
+
+    Args:
+        texts: Series (e.g. df['review_clean']) or any iterable of texts.
+        chunk_size: texts per task.
+        workers: number of processes (defaults to the CPU count).
+    """
+    workers = workers or os.cpu_count()
+    chunks = _series_chunks(texts, chunk_size)
+    pending = deque()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_keyword_worker)
+    with pool as executor:
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                codes, uniques = pd.factorize(chunk)
+                future = executor.submit(_preprocess_chunk, list(uniques))
+                pending.append((chunk, codes, future))
+            if not pending:
+                return
+            chunk, codes, future = pending.popleft()
+            # code -1 (missing text) picks the trailing ""
+            processed = np.array(future.result() + [""], dtype=object)
+            yield pd.Series(processed[codes], index=chunk.index, name=chunk.name)
+
+@instrumented(rows="result", batch_size="chunk_size")
+def preprocess_column_parallel(texts, chunk_size=50_000, workers=None):
+    """
+    Collects iter_preprocessed_chunks into a single Series.
+    """
+    chunks = list(iter_preprocessed_chunks(texts, chunk_size, workers))
+    if not chunks:
+        return pd.Series([], dtype=object, name=getattr(texts, "name", None))
+    return pd.concat(chunks)
@@ -0,0 +1,130 @@
+import ast
+import os
+import re
+import uuid
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Typed schemas for the three pipeline datasets. `bank` and `scrape_date` are
+# hive partition keys, so they live in the directory names, not the files.
+RAW_SCHEMA = pa.schema([
+    ("review_id", pa.string()),
+    ("review", pa.string()),
+    ("rating", pa.int8()),
+    ("date", pa.date32()),
+    ("source", pa.dictionary(pa.int8(), pa.string())),
+])
+CLEANED_SCHEMA = RAW_SCHEMA.append(pa.field("review_clean", pa.string()))
+PROCESSED_SCHEMA = pa.schema(list(CLEANED_SCHEMA) + [
+    ("sentiment_label", pa.dictionary(pa.int8(), pa.string())),
+    ("sentiment_score", pa.float32()),
+    ("keyword_ready", pa.string()),
+    ("identified_theme", pa.list_(pa.string())),
+])
+SCHEMAS = {"raw": RAW_SCHEMA, "cleaned": CLEANED_SCHEMA, "processed": PROCESSED_SCHEMA}
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("bank", pa.string()), ("scrape_date", pa.string())]), flavor="hive"
+)
+
+def parse_theme_list(value):
+    """
+    Turns the stringified "['A', 'B', 'C']" themes found in the CSVs back into
+    a list; lists pass through and missing values become None.
+    """
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return None
+    parsed = ast.literal_eval(value)
+    return [str(theme) for theme in parsed]
+
+def parse_theme_column(themes):
+    """
+    parse_theme_list over a Series of themes, parsing each distinct value once.
+    """
+    codes, uniques = pd.factorize(themes.astype(str).where(themes.notna()))
+    parsed = pd.Series(
+        [parse_theme_list(value) for value in uniques] + [None], dtype=object
+    )
+    return parsed.iloc[codes].set_axis(themes.index)
+
+def _to_table(df, schema):
+    df = df.copy()
+    if "date" in df:
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+    if "identified_theme" in df:
+        df["identified_theme"] = df["identified_theme"].map(parse_theme_list)
+    columns = schema.names + ["bank", "scrape_date"]
+    full_schema = schema.append(pa.field("bank", pa.string()))
+    full_schema = full_schema.append(pa.field("scrape_date", pa.string()))
+    return pa.Table.from_pandas(df[columns], schema=full_schema, preserve_index=False)
+
+def write_reviews(df, root, dataset="raw", scrape_date=None):
+    """
+    Appends reviews to a Parquet dataset partitioned as
+    <root>/bank=<bank>/scrape_date=<YYYY-MM-DD>/.
+
+    Args:
+        df: reviews with the columns of the dataset's schema plus `bank`.
+        root: dataset directory.
+        dataset: "raw", "cleaned" or "processed" (selects the schema).
+        scrape_date: date of the scrape run (defaults to today); ignored when
+            df already has a scrape_date column.
+    """
+    if "scrape_date" not in df:
+        scrape_date = scrape_date or date.today()
+        df = df.assign(scrape_date=pd.Timestamp(scrape_date).strftime("%Y-%m-%d"))
+    table = _to_table(df, SCHEMAS[dataset])
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore"
+    )
+
+def read_reviews(root, columns=None, filters=None):
+    """
+    Reads a review dataset into pandas.
+
+    Args:
+        root: dataset directory written by write_reviews.
+        columns: columns to load (projection); all when omitted.
+        filters: predicates pushed down to partitions and row groups, in
+            pyarrow's DNF form, e.g. [("bank", "=", "Dashen Bank"),
+            ("date", ">=", date(2025, 6, 1))].
+    """
+    table = pq.read_table(
+        root, columns=columns, filters=filters, partitioning=PARTITIONING
+    )
+    df = table.to_pandas(date_as_object=False)
+    if "identified_theme" in df:
+        df["identified_theme"] = df["identified_theme"].map(
+            lambda themes: None if themes is None else list(themes)
+        )
+    return df
+
+def scrape_date_from_path(path):
+    """
+    Extracts the run date from all_bank_reviews_<YYYYMMDD>_<HHMMSS>.csv names.
+    """
+    match = re.search(r"(\d{8})_\d{6}", os.path.basename(path))
+    return pd.to_datetime(match.group(1), format="%Y%m%d").date() if match else None
+
+def csv_to_parquet(csv_path, root, dataset="raw", scrape_date=None, chunksize=100_000):
+    """
+    Converts one of the pipeline CSVs into a partitioned Parquet dataset,
+    chunk by chunk. The scrape date defaults to the one in the file name.
+    """
+    from src.utils.utils import iter_data_chunks
+
+    scrape_date = scrape_date or scrape_date_from_path(csv_path)
+    for chunk in iter_data_chunks(csv_path, chunksize):
+        chunk = chunk.drop(columns=[col for col in chunk if col.startswith("Unnamed:")])
+        write_reviews(chunk, root, dataset, scrape_date)
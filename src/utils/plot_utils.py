@@ -1,61 +1,170 @@
+"""
+Plots of the processed reviews.
+
+Every plot reduces its input to a small table first (the *_table /
+keyword_frequencies helpers, vectorized groupbys over the reviews) and only
+draws that, so render time does not grow with the number of reviews. The
+plot functions accept either the reviews or the already aggregated table,
+e.g. the daily rollups of ReviewRollup.daily_summary() for the trends, and
+return the figure after showing it.
+"""
+from collections import Counter
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.dates as mdates
-from matplotlib.dates import DateFormatter, MonthLocator
 from wordcloud import WordCloud
+from src.utils.parquet_store import parse_theme_column
+
+# z of the 95% normal confidence interval around bucket means
+CI_Z = 1.96
+
 
-def plot_sentiment_trends(data):
+def score_sums(data):
+    """
+    Per bank and day sentiment score count, sum and sum of squares: the
+    columns of ReviewRollup.daily_summary(), which pass through unchanged.
+    """
+    if "score_sum" in data:
+        return data
+    score = pd.to_numeric(data["sentiment_score"], errors="coerce")
+    sums = pd.DataFrame({
+        "bank": data["bank"].to_numpy(),
+        "date": pd.to_datetime(data["date"]).dt.normalize().to_numpy(),
+        "score_count": score.notna().to_numpy(dtype=np.int64),
+        "score_sum": score.fillna(0).to_numpy(),
+        "score_sqsum": score.fillna(0).to_numpy() ** 2
+    })
+    return sums.groupby(["bank", "date"], observed=True, as_index=False).sum()
 
-    # Make sure 'date' column is in datetime format
-    data['date'] = pd.to_datetime(data['date'])
+def sentiment_trend_table(data, freq="W"):
+    """
+    Mean sentiment score per bank and time bucket (pandas period alias, e.g.
+    "D", "W", "M") with a 95% normal confidence interval, computed from
+    summed scores rather than by bootstrapping every review.
+    """
+    sums = score_sums(data)
+    buckets = pd.to_datetime(sums["date"]).dt.to_period(freq).dt.start_time
+    table = (
+        sums.assign(date=buckets)
+        .groupby(["bank", "date"], observed=True)
+        [["score_count", "score_sum", "score_sqsum"]]
+        .sum()
+        .reset_index()
+    )
+    table = table[table["score_count"] > 0]
+    count = table["score_count"]
+    mean = table["score_sum"] / count
+    std = np.sqrt((table["score_sqsum"] / count - mean ** 2).clip(lower=0))
+    margin = CI_Z * std / np.sqrt(count)
+    return table.assign(mean=mean, std=std, ci_low=mean - margin, ci_high=mean + margin)
 
-    plt.figure(figsize=(10, 6))
-    sns.lineplot(data=data, x='date', y='sentiment_score', hue='bank')
+def plot_sentiment_trends(data, freq="W"):
+    """
+    Bucketed mean sentiment per bank with its confidence band. `data` is
+    the reviews, their daily score sums (see score_sums) or a
+    sentiment_trend_table. The caller's frame is not modified.
+    """
+    table = data if "ci_low" in data else sentiment_trend_table(data, freq)
 
-    plt.title('Sentiment Trends Over Time')
-    plt.xlabel('Date')
-    plt.ylabel('Sentiment Score')
-    plt.legend(title='Bank')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for bank, rows in table.groupby("bank", observed=True):
+        rows = rows.sort_values("date")
+        ax.plot(rows["date"], rows["mean"], label=bank)
+        ax.fill_between(rows["date"], rows["ci_low"], rows["ci_high"], alpha=0.2)
 
-    # Set weekly x-axis ticks
-    ax = plt.gca()
+    ax.set_title('Sentiment Trends Over Time')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Sentiment Score')
+    ax.legend(title='Bank')
     ax.xaxis.set_major_locator(mdates.MonthLocator())
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-
     plt.xticks(rotation=45)
     plt.tight_layout()
     plt.show()
+    return fig
+
+def rating_count_table(data):
+    """
+    Number of reviews per bank and rating.
+    """
+    return (
+        data.groupby(["bank", "rating"], observed=True).size().reset_index(name="count")
+    )
 
 def plot_rating_distributions(data):
+    """
+    Stacked rating histogram by bank with a KDE curve per bank, from the
+    reviews or a rating_count_table (the counts weight both).
+    """
+    counts = data if "count" in data else rating_count_table(data)
 
-    plt.figure(figsize=(10, 6))
-    sns.histplot(data=data, x='rating', hue='bank', multiple='stack', kde=True)
+    fig = plt.figure(figsize=(10, 6))
+    sns.histplot(
+        data=counts, x='rating', weights='count', hue='bank', multiple='stack',
+        discrete=True, kde=True
+    )
     plt.title('Rating Distributions by Bank')
     plt.xlabel('Rating')
     plt.ylabel('Frequency')
     plt.tight_layout()
     plt.show()
+    return fig
+
+def keyword_frequencies(data):
+    """
+    {bank: Counter of keyword_ready tokens}. Each distinct text is split once
+    and its tokens weighted by how often the text occurs.
+    """
+    frequencies = {}
+    texts = data[["bank", "keyword_ready"]].dropna()
+    for (bank, text), n in texts.value_counts(sort=False).items():
+        counter = frequencies.setdefault(bank, Counter())
+        for word in text.split():
+            counter[word] += n
+    return frequencies
 
-def plot_keyword_clouds(data):
-    
-    for bank in data['bank'].unique():
-        keywords = ' '.join(data[data['bank'] == bank]['keyword_ready'].dropna())
-        wordcloud = WordCloud(width=800, height=400, background_color='white').generate(keywords)
+def plot_keyword_clouds(data, max_words=200):
+    """
+    One word cloud per bank, drawn with generate_from_frequencies from the
+    reviews or a {bank: {word: count}} mapping (see keyword_frequencies).
+    """
+    frequencies = data if isinstance(data, dict) else keyword_frequencies(data)
+    figures = []
+    for bank, counts in frequencies.items():
+        if not counts:
+            continue
+        wordcloud = WordCloud(
+            width=800, height=400, background_color='white', max_words=max_words
+        ).generate_from_frequencies(dict(Counter(counts).most_common(max_words)))
 
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         plt.imshow(wordcloud, interpolation='bilinear')
         plt.title(f'Keyword Cloud for {bank}')
         plt.axis('off')
         plt.tight_layout()
         plt.show()
+        figures.append(fig)
+    return figures
+
+def theme_count_table(data, min_count=10):
+    """
+    Reviews per bank and theme (themes as lists or their "['A', 'B']" text),
+    keeping themes seen more than min_count times.
+    """
+    themes = data["identified_theme"]
+    if themes.map(type).eq(str).any():
+        themes = parse_theme_column(themes)
+    theme_counts = data.assign(identified_theme=themes).explode('identified_theme') \
+                       .groupby(['bank', 'identified_theme'], observed=True) \
+                       .size().reset_index(name='count')
+    return theme_counts[theme_counts["count"] > min_count]
 
 def plot_theme_distributions(data):
-    theme_counts = data.explode('identified_theme') \
-                       .groupby(['bank', 'identified_theme']).size().reset_index(name='count')
-    theme_counts= theme_counts[theme_counts["count"] > 10]
+    theme_counts = data if "count" in data else theme_count_table(data)
 
-    plt.figure(figsize=(12, 8))
+    fig = plt.figure(figsize=(12, 8))
     sns.barplot(data=theme_counts, x='identified_theme', y='count', hue='bank')
     plt.title('Theme Distributions by Bank')
     plt.xlabel('Theme')
@@ -63,40 +172,90 @@ def plot_theme_distributions(data):
     plt.xticks(rotation=90, ha='right')
     plt.tight_layout()
     plt.show()
+    return fig
 
 def plot_sentiment_counts(data):
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-
-    sentiment_counts = data.groupby(['bank', 'sentiment_label']) \
-                           .size().reset_index(name='count')
+    sentiment_counts = data if "count" in data else (
+        data.groupby(['bank', 'sentiment_label'], observed=True)
+        .size().reset_index(name='count')
+    )
 
-    plt.figure(figsize=(10, 6))
+    fig = plt.figure(figsize=(10, 6))
     sns.barplot(data=sentiment_counts, x='sentiment_label', y='count', hue='bank')
     plt.title('Sentiment Label Counts by Bank')
     plt.xlabel('Sentiment')
     plt.ylabel('Count')
     plt.tight_layout()
     plt.show()
+    return fig
 
 def plot_sentiment_variability(data):
+    """
+    Sentiment score std per bank, from the reviews or a per-bank summary
+    with a sentiment_score_std column (ReviewRollup.bank_summary()).
+    """
+    if "sentiment_score_std" in data:
+        variability = data.rename(columns={"sentiment_score_std": "std_dev"})
+    else:
+        variability = data.groupby('bank', observed=True)['sentiment_score'] \
+                          .std().reset_index(name='std_dev')
 
-    variability = data.groupby('bank')['sentiment_score'].std().reset_index(name='std_dev')
-
-    plt.figure(figsize=(8, 6))
+    fig = plt.figure(figsize=(8, 6))
     sns.barplot(data=variability, x='bank', y='std_dev')
     plt.title('Sentiment Score Variability by Bank')
     plt.xlabel('Bank')
     plt.ylabel('Standard Deviation')
     plt.tight_layout()
     plt.show()
+    return fig
 
-def plot_sentiment_vs_rating(data):
+def rating_score_density(data, score_bins=20):
+    """
+    Review counts per bank, rating and sentiment score bin: a 2D histogram
+    with `score_bins` equal bins over [0, 1]. Returns columns bank, rating,
+    score_low, score_high, count.
+    """
+    score = pd.to_numeric(data["sentiment_score"], errors="coerce").to_numpy()
+    edges = np.linspace(0, 1, score_bins + 1)
+    bins = np.clip(np.searchsorted(edges, score, side="right") - 1, 0, score_bins - 1)
+    binned = pd.DataFrame({
+        "bank": data["bank"].to_numpy(),
+        "rating": data["rating"].to_numpy(),
+        "bin": bins
+    })
+    density = (
+        binned[~np.isnan(score)]
+        .groupby(["bank", "rating", "bin"], observed=True)
+        .size()
+        .reset_index(name="count")
+    )
+    return density.assign(
+        score_low=edges[density["bin"]], score_high=edges[density["bin"] + 1]
+    ).drop(columns="bin")
 
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(data=data, x='rating', y='sentiment_score', hue='bank', alpha=0.6)
-    plt.title('Sentiment Score vs. Rating')
-    plt.xlabel('Rating')
-    plt.ylabel('Sentiment Score')
+def plot_sentiment_vs_rating(data, score_bins=20):
+    """
+    Density of sentiment score against rating, one 2D histogram per bank,
+    from the reviews or a rating_score_density table.
+    """
+    density = data if "score_low" in data else rating_score_density(data, score_bins)
+    banks = list(density["bank"].drop_duplicates())
+    edges = np.union1d(density["score_low"], density["score_high"])
+    ratings = np.arange(1, 7) - 0.5
+
+    fig, axes = plt.subplots(1, max(len(banks), 1), figsize=(5 * max(len(banks), 1), 5),
+                             sharey=True, squeeze=False)
+    for ax, bank in zip(axes[0], banks):
+        rows = density[density["bank"] == bank]
+        grid = np.zeros((len(edges) - 1, 5))
+        bin_rows = np.searchsorted(edges, rows["score_low"])
+        grid[bin_rows, rows["rating"].astype(int) - 1] = rows["count"]
+        mesh = ax.pcolormesh(ratings, edges, grid, cmap="Blues")
+        fig.colorbar(mesh, ax=ax, label="Reviews")
+        ax.set_title(bank)
+        ax.set_xlabel('Rating')
+    axes[0][0].set_ylabel('Sentiment Score')
+    fig.suptitle('Sentiment Score vs. Rating')
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+    return fig
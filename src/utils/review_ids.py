@@ -0,0 +1,34 @@
+"""
+Sets of already-processed review ids, kept as sorted arrays of 64-bit
+fingerprints so incremental aggregates and indexes can skip reviews they
+have folded in before (see rollups.ReviewRollup and review_index.ReviewIndex).
+"""
+import numpy as np
+import pandas as pd
+
+def id_fingerprints(review_ids):
+    """
+    uint64 hash of each review id.
+    """
+    review_ids = pd.Series(review_ids, dtype=object)
+    return pd.util.hash_pandas_object(review_ids, index=False).to_numpy()
+
+def unseen_mask(seen, fingerprints):
+    """
+    True for fingerprints missing from the sorted `seen` array; within the
+    batch only the last occurrence of a repeated id is marked.
+    """
+    if len(seen):
+        positions = np.searchsorted(seen, fingerprints).clip(max=len(seen) - 1)
+        known = seen[positions] == fingerprints
+    else:
+        known = np.zeros(len(fingerprints), dtype=bool)
+    return ~known & ~pd.Series(fingerprints).duplicated(keep="last").to_numpy()
+
+def with_fingerprints(seen, new):
+    """
+    The sorted `seen` array with the (unseen, distinct) fingerprints in new
+    inserted in order.
+    """
+    new = np.sort(new)
+    return np.insert(seen, np.searchsorted(seen, new), new)
@@ -0,0 +1,444 @@
+"""
+On-disk inverted index over the processed reviews.
+
+Every `keyword_ready` token and `identified_theme` label maps to a posting
+list of review numbers, stored as deltas in variable-byte encoding, and bank,
+sentiment_label and rating keep one packed bitmap per value. A question such
+as "negative BOA reviews mentioning otp since June" then intersects a few
+short lists and masks them against the bitmaps instead of scanning every
+review with str.contains.
+
+The index is a list of immutable segments. Each batch passed to `update`
+becomes a new segment, `save` writes only the segments not on disk yet, and
+`compact` merges them into one when they pile up.
+
+Layout of <path>:
+    index.json                  segment names, in order
+    segment-<id>/docs.parquet   the indexed reviews (rows returned by `rows`)
+    segment-<id>/lexicon.parquet  term, offset, nbytes, doc_count
+    segment-<id>/postings.bin   concatenated variable-byte posting lists
+    segment-<id>/filters.npz    per-value bitmaps and the review days
+"""
+import json
+import os
+import shutil
+import uuid
+from functools import reduce
+import numpy as np
+import pandas as pd
+from src.utils.parquet_store import parse_theme_column
+from src.utils.review_ids import id_fingerprints, unseen_mask, with_fingerprints
+
+FILTER_FIELDS = ["bank", "sentiment_label", "rating"]
+# segments kept before save() merges them into one
+MAX_SEGMENTS = 16
+MANIFEST = "index.json"
+
+
+def varbyte_encode(values):
+    """
+    Variable-byte encoding of non-negative integers below 2^35: 7 bits per
+    byte, low bits first, high bit set on every byte but a value's last.
+
+    Returns:
+        (encoded uint8 array, bytes used by each value)
+    """
+    values = np.asarray(values, dtype=np.int64)
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 5):
+        nbytes += values >= 1 << (7 * k)
+    starts = np.cumsum(nbytes) - nbytes
+    encoded = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max(initial=0))):
+        has = nbytes > k
+        more = (nbytes[has] > k + 1) << 7
+        encoded[starts[has] + k] = ((values[has] >> (7 * k)) & 0x7F) | more
+    return encoded, nbytes
+
+def varbyte_decode(encoded):
+    """
+    Inverse of varbyte_encode.
+    """
+    encoded = np.asarray(encoded, dtype=np.uint8)
+    if not len(encoded):
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero(encoded < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    position = np.arange(len(encoded)) - np.repeat(starts, ends - starts + 1)
+    parts = (encoded & 0x7F).astype(np.int64) << (7 * position)
+    return np.add.reduceat(parts, starts)
+
+def _term_postings(values, terms_of):
+    """
+    Sorted (term, review numbers) pairs of a column. Each distinct value is
+    split into terms once (terms_of) and paired with every review holding it.
+
+    Returns:
+        (terms, term index per posting, review number per posting), sorted by
+        term then review number
+    """
+    codes, uniques = pd.factorize(values)
+    value_terms = [sorted(set(terms_of(value))) for value in uniques]
+    lengths = np.fromiter(map(len, value_terms), dtype=np.int64, count=len(value_terms))
+    entry_terms, terms = pd.factorize(
+        np.array([term for terms in value_terms for term in terms], dtype=object),
+        sort=True
+    )
+    docs = np.flatnonzero(codes >= 0)
+    docs = docs[np.argsort(codes[docs], kind="stable")]
+    doc_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    doc_starts = np.cumsum(doc_counts) - doc_counts
+
+    # every (value, term) entry is repeated once per review holding the value
+    entry_values = np.repeat(np.arange(len(uniques)), lengths)
+    repeats = doc_counts[entry_values]
+    entries = np.repeat(np.arange(len(entry_values)), repeats)
+    within = np.arange(len(entries)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    entry_docs = docs[doc_starts[entry_values[entries]] + within]
+    key = entry_terms[entries].astype(np.int64) * len(values) + entry_docs
+    key.sort()
+    return terms, key // max(len(values), 1), key % max(len(values), 1)
+
+def _encode_postings(term_ids, docs, n_terms):
+    """
+    Delta + variable-byte encodes postings sorted by term then review number.
+
+    Returns:
+        (encoded bytes, byte offset, byte length and doc count of each term)
+    """
+    first = np.ones(len(docs), dtype=bool)
+    first[1:] = term_ids[1:] != term_ids[:-1]
+    deltas = np.where(first, docs, docs - np.concatenate(([0], docs[:-1])))
+    encoded, nbytes = varbyte_encode(deltas)
+    doc_counts = np.bincount(term_ids, minlength=n_terms)
+    term_bytes = np.bincount(
+        term_ids, weights=nbytes, minlength=n_terms
+    ).astype(np.int64)
+    return encoded, np.cumsum(term_bytes) - term_bytes, term_bytes, doc_counts
+
+def _days(dates):
+    days = pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]")
+    return days.astype("datetime64[D]").astype(np.int64)
+
+def _day(value):
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+def _filter_key(field, value):
+    if field == "rating":
+        value = int(value)
+    return f"{field}={value}"
+
+
+class _Segment:
+    """
+    One immutable batch of indexed reviews. Reviews are numbered 0..n-1 in
+    the order they were added; postings and bitmaps refer to those numbers.
+    """
+
+    def __init__(self, name, review_ids, lexicon, postings, filters, docs=None,
+                 path=None):
+        self.name = name
+        self.review_ids = review_ids
+        self.lexicon_frame = lexicon
+        self.lexicon = dict(zip(
+            lexicon["term"],
+            zip(lexicon["offset"].tolist(), lexicon["nbytes"].tolist())
+        ))
+        self.postings = postings
+        self.filters = filters
+        self.days = filters["days"]
+        self._docs = docs
+        self.path = path
+
+    def __len__(self):
+        return len(self.review_ids)
+
+    @classmethod
+    def build(cls, df):
+        df = df.reset_index(drop=True).assign(
+            date=pd.to_datetime(df["date"]).to_numpy(),
+            identified_theme=parse_theme_column(df["identified_theme"]).to_numpy()
+        )
+        parts, terms, offsets, nbytes, doc_counts, base = [], [], [], [], [], 0
+        for kind, values, terms_of in [
+            ("keyword", df["keyword_ready"], str.split),
+            ("theme",
+             df["identified_theme"].map(
+                 lambda themes: None if themes is None else tuple(themes)
+             ),
+             lambda themes: themes)
+        ]:
+            kind_terms, term_ids, docs = _term_postings(values, terms_of)
+            encoded, term_offsets, term_bytes, term_counts = _encode_postings(
+                term_ids, docs, len(kind_terms)
+            )
+            parts.append(encoded)
+            terms += [f"{kind}:{term}" for term in kind_terms]
+            offsets.append(term_offsets + base)
+            nbytes.append(term_bytes)
+            doc_counts.append(term_counts)
+            base += len(encoded)
+        lexicon = pd.DataFrame({
+            "term": terms,
+            "offset": np.concatenate(offsets),
+            "nbytes": np.concatenate(nbytes),
+            "doc_count": np.concatenate(doc_counts)
+        })
+
+        filters = {"days": _days(df["date"])}
+        for field in FILTER_FIELDS:
+            values = df[field]
+            if field == "rating":
+                values = pd.to_numeric(values, errors="coerce")
+            codes, uniques = pd.factorize(values)
+            for i, value in enumerate(uniques):
+                filters[_filter_key(field, value)] = np.packbits(codes == i)
+        return cls(
+            f"segment-{uuid.uuid4().hex[:12]}", df["review_id"].to_numpy(dtype=object),
+            lexicon, np.concatenate(parts), filters, docs=df
+        )
+
+    def write(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.docs().to_parquet(os.path.join(path, "docs.parquet"), index=False)
+        self.lexicon_frame.to_parquet(
+            os.path.join(path, "lexicon.parquet"), index=False
+        )
+        np.asarray(self.postings).tofile(os.path.join(path, "postings.bin"))
+        np.savez(os.path.join(path, "filters.npz"), **self.filters)
+
+    @classmethod
+    def read(cls, path):
+        review_ids = pd.read_parquet(
+            os.path.join(path, "docs.parquet"), columns=["review_id"]
+        )["review_id"]
+        postings_path = os.path.join(path, "postings.bin")
+        postings = (np.memmap(postings_path, dtype=np.uint8, mode="r")
+                    if os.path.getsize(postings_path) else np.empty(0, dtype=np.uint8))
+        with np.load(os.path.join(path, "filters.npz")) as filters:
+            filters = dict(filters)
+        lexicon = pd.read_parquet(os.path.join(path, "lexicon.parquet"))
+        return cls(
+            os.path.basename(path), review_ids.to_numpy(dtype=object), lexicon,
+            postings, filters, path=path
+        )
+
+    def docs(self):
+        """
+        The indexed reviews, read from disk on first use.
+        """
+        if self._docs is None:
+            docs = pd.read_parquet(os.path.join(self.path, "docs.parquet"))
+            docs["identified_theme"] = docs["identified_theme"].map(
+                lambda themes: None if themes is None else list(themes)
+            )
+            self._docs = docs
+        return self._docs
+
+    def posting(self, term):
+        if term not in self.lexicon:
+            return np.empty(0, dtype=np.int64)
+        offset, nbytes = self.lexicon[term]
+        return np.cumsum(varbyte_decode(self.postings[offset:offset + nbytes]))
+
+    def bitmap(self, field, values):
+        """
+        Packed bitmap of the reviews whose field is any of values.
+        """
+        empty = np.zeros((len(self) + 7) // 8, dtype=np.uint8)
+        bitmaps = (
+            self.filters.get(_filter_key(field, value), empty) for value in values
+        )
+        return reduce(np.bitwise_or, bitmaps, empty)
+
+    def match(self, terms, filters, day_range, match_all):
+        """
+        Review numbers (sorted) having all / any of terms and passing the
+        filters ({field: values}) and the inclusive (first, last) day range.
+        """
+        ids = None
+        if terms:
+            postings = sorted((self.posting(term) for term in terms), key=len)
+            ids = reduce(_intersect if match_all else np.union1d, postings)
+        bits = None
+        if filters:
+            bits = reduce(np.bitwise_and, [
+                self.bitmap(field, values) for field, values in filters.items()
+            ])
+
+        if ids is None:
+            if bits is not None:
+                keep = np.unpackbits(bits, count=len(self)).astype(bool)
+            else:
+                keep = np.ones(len(self), dtype=bool)
+            if day_range:
+                keep &= (self.days >= day_range[0]) & (self.days <= day_range[1])
+            return np.flatnonzero(keep)
+        if bits is not None:
+            ids = ids[(bits[ids >> 3] >> (7 - (ids & 7))) & 1 == 1]
+        if day_range:
+            days = self.days[ids]
+            ids = ids[(days >= day_range[0]) & (days <= day_range[1])]
+        return ids
+
+def _intersect(small, large):
+    """
+    Intersection of two sorted unique arrays, looking the shorter one up in
+    the longer one.
+    """
+    if len(small) > len(large):
+        small, large = large, small
+    if not len(large):
+        return small[:0]
+    found = large[np.searchsorted(large, small).clip(max=len(large) - 1)] == small
+    return small[found]
+
+
+class ReviewIndex:
+    """
+    Inverted index over processed reviews, queried by keyword, theme, bank,
+    sentiment label, rating and date.
+
+    `update` indexes a batch in O(batch) as a new segment. Review ids already
+    indexed are skipped, so reloading an overlapping batch does not duplicate
+    results; an edited review keeps its first indexed version.
+
+    Example:
+        index = ReviewIndex.load("../data/processed/review_index")
+        index.update(new_reviews)
+        index.save("../data/processed/review_index")
+        index.search(keywords=["otp"], bank="Bank of Abyssinia (BOA)",
+                     sentiment="NEGATIVE", since="2025-06-01")
+    """
+
+    def __init__(self, segments=None):
+        self.segments = list(segments or [])
+        self.seen = np.sort(np.concatenate(
+            [id_fingerprints(segment.review_ids) for segment in self.segments]
+            or [np.empty(0, dtype=np.uint64)]
+        ))
+
+    def __len__(self):
+        return sum(len(segment) for segment in self.segments)
+
+    @classmethod
+    def from_frame(cls, df):
+        index = cls()
+        index.update(df)
+        return index
+
+    def update(self, df):
+        """
+        Indexes the reviews of `df` that were not indexed before.
+
+        Returns:
+            number of reviews added to the index.
+        """
+        fingerprints = id_fingerprints(df["review_id"])
+        fresh_mask = unseen_mask(self.seen, fingerprints)
+        if fresh_mask.any():
+            self.segments.append(_Segment.build(df[fresh_mask]))
+            self.seen = with_fingerprints(self.seen, fingerprints[fresh_mask])
+        return int(fresh_mask.sum())
+
+    def compact(self):
+        """
+        Rebuilds the index as a single segment.
+        """
+        if len(self.segments) > 1:
+            docs = pd.concat([segment.docs() for segment in self.segments])
+            self.segments = [_Segment.build(docs)]
+        return self
+
+    def _matches(self, keywords, themes, bank, sentiment, rating, since, until, match):
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+        terms = [f"keyword:{word.lower()}" for word in _as_list(keywords)] + \
+                [f"theme:{theme}" for theme in _as_list(themes)]
+        filters = {
+            field: _as_list(values)
+            for field, values in zip(FILTER_FIELDS, [bank, sentiment, rating])
+            if values is not None
+        }
+        day_range = None
+        if since is not None or until is not None:
+            day_range = (_day(since) if since is not None else np.iinfo(np.int64).min,
+                         _day(until) if until is not None else np.iinfo(np.int64).max)
+        for segment in self.segments:
+            yield segment, segment.match(terms, filters, day_range, match == "all")
+
+    def search(self, keywords=(), themes=(), bank=None, sentiment=None, rating=None,
+               since=None, until=None, match="all"):
+        """
+        review_ids of the matching reviews, in indexing order.
+
+        Args:
+            keywords: tokens as they appear in keyword_ready (e.g. "otp").
+            themes: identified_theme labels.
+            bank, sentiment, rating: a value or a list of accepted values.
+            since, until: inclusive date bounds (anything pd.Timestamp accepts).
+            match: "all" keeps reviews with every keyword and theme, "any"
+                with at least one. Filters always all apply.
+        """
+        matches = self._matches(
+            keywords, themes, bank, sentiment, rating, since, until, match
+        )
+        ids = [segment.review_ids[ids] for segment, ids in matches]
+        return np.concatenate(ids) if ids else np.empty(0, dtype=object)
+
+    def rows(self, keywords=(), themes=(), bank=None, sentiment=None, rating=None,
+             since=None, until=None, match="all", columns=None):
+        """
+        The matching reviews as a DataFrame (same arguments as search).
+        """
+        matches = self._matches(
+            keywords, themes, bank, sentiment, rating, since, until, match
+        )
+        frames = [segment.docs().iloc[ids] for segment, ids in matches]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        rows = pd.concat(frames, ignore_index=True)
+        return rows[columns] if columns is not None else rows
+
+    def save(self, path, max_segments=MAX_SEGMENTS):
+        """
+        Writes the segments not yet under `path` and the manifest, compacting
+        first when there are more than max_segments.
+        """
+        if len(self.segments) > max_segments:
+            self.compact()
+        os.makedirs(path, exist_ok=True)
+        for segment in self.segments:
+            segment_path = os.path.join(path, segment.name)
+            if not os.path.exists(segment_path):
+                segment.write(segment_path)
+        manifest_path = os.path.join(path, MANIFEST)
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump({"segments": [segment.name for segment in self.segments]}, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        # segments merged away by compaction
+        names = {segment.name for segment in self.segments}
+        for name in os.listdir(path):
+            if name.startswith("segment-") and name not in names:
+                shutil.rmtree(os.path.join(path, name))
+        print(f"💾 Review index saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """
+        The index saved under `path`, or an empty one when nothing was saved yet.
+        """
+        manifest_path = os.path.join(path, MANIFEST)
+        if not os.path.exists(manifest_path):
+            return cls()
+        with open(manifest_path) as f:
+            names = json.load(f)["segments"]
+        return cls([_Segment.read(os.path.join(path, name)) for name in names])
+
+def _as_list(values):
+    if values is None:
+        return []
+    if isinstance(values, (str, int, np.integer)):
+        return [values]
+    return list(values)
@@ -0,0 +1,166 @@
+"""
+Mergeable per-bank and per-day review aggregates.
+
+Each (bank, day) cell holds sums rather than averages (review count, rating
+sum and count, per-label counts, sentiment score count, sum and sum of
+squares), so a new batch is folded in by adding its own cell sums and two
+rollups built separately combine by addition. Averages and standard
+deviations are derived when the summaries are read.
+"""
+import os
+import numpy as np
+import pandas as pd
+from src.utils.review_ids import id_fingerprints, unseen_mask, with_fingerprints
+
+KEYS = ["bank", "date"]
+LABEL_COUNTS = {
+    "POSITIVE": "positive_count",
+    "NEGATIVE": "negative_count",
+    "NEUTRAL": "neutral_count"
+}
+MEASURES = [
+    "num_reviews", "rating_sum", "rating_count", *LABEL_COUNTS.values(),
+    "score_count", "score_sum", "score_sqsum"
+]
+FLOAT_MEASURES = {"rating_sum", "score_sum", "score_sqsum"}
+
+
+def _empty_daily():
+    index = pd.MultiIndex.from_arrays(
+        [pd.Series([], dtype=object), pd.Series([], dtype="datetime64[ns]")], names=KEYS
+    )
+    return _typed(pd.DataFrame(0, index=index, columns=MEASURES))
+
+def _typed(daily):
+    return daily.astype({
+        col: "float64" if col in FLOAT_MEASURES else "int64" for col in MEASURES
+    })
+
+def summarize_batch(df):
+    """
+    Per (bank, day) sums of a batch of processed reviews, one vectorized
+    groupby over precomputed indicator columns.
+    """
+    rating = pd.to_numeric(df["rating"], errors="coerce")
+    score = pd.to_numeric(df["sentiment_score"], errors="coerce")
+    label = df["sentiment_label"].astype(object)
+    parts = pd.DataFrame({
+        "bank": df["bank"].astype(object).to_numpy(),
+        "date": pd.to_datetime(df["date"]).dt.normalize().to_numpy(),
+        "num_reviews": 1,
+        "rating_sum": rating.fillna(0).to_numpy(dtype=float),
+        "rating_count": rating.notna().to_numpy(dtype=np.int64),
+        **{
+            column: (label == value).to_numpy(dtype=np.int64)
+            for value, column in LABEL_COUNTS.items()
+        },
+        "score_count": score.notna().to_numpy(dtype=np.int64),
+        "score_sum": score.fillna(0).to_numpy(dtype=float),
+        "score_sqsum": score.fillna(0).to_numpy(dtype=float) ** 2
+    })
+    return _typed(parts.groupby(KEYS, sort=True)[MEASURES].sum())
+
+def _with_metrics(sums):
+    """
+    Adds avg_rating, avg_sentiment_score and sentiment_score_std (population)
+    to a frame of MEASURES sums.
+    """
+    sums = sums.copy()
+    rating_count = sums["rating_count"].where(sums["rating_count"] > 0)
+    score_count = sums["score_count"].where(sums["score_count"] > 0)
+    sums["avg_rating"] = sums["rating_sum"] / rating_count
+    sums["avg_sentiment_score"] = sums["score_sum"] / score_count
+    variance = sums["score_sqsum"] / score_count - sums["avg_sentiment_score"] ** 2
+    sums["sentiment_score_std"] = np.sqrt(variance.clip(lower=0))
+    return sums
+
+
+class ReviewRollup:
+    """
+    Running per-bank / per-day aggregates of the processed reviews.
+
+    `update` folds a batch in O(batch): the batch is summarized on its own
+    and added cell by cell. Review ids already folded are skipped (tracked as
+    a sorted array of 64-bit fingerprints), so reloading an overlapping batch
+    does not double count; an edited review keeps its first contribution.
+
+    Example:
+        rollup = ReviewRollup.load("../data/processed/rollups")
+        rollup.update(new_reviews)
+        rollup.save("../data/processed/rollups")
+        rollup.bank_summary()
+    """
+
+    daily_file = "daily.parquet"
+    seen_file = "review_ids.npy"
+
+    def __init__(self, daily=None, seen=None):
+        self.daily = _empty_daily() if daily is None else _typed(daily)
+        self.seen = np.empty(0, dtype=np.uint64) if seen is None else seen
+
+    @classmethod
+    def from_frame(cls, df):
+        rollup = cls()
+        rollup.update(df)
+        return rollup
+
+    def _fold(self, sums):
+        self.daily = _typed(self.daily.add(sums, fill_value=0).sort_index())
+
+    def update(self, df):
+        """
+        Folds the reviews of `df` that were not folded before.
+
+        Returns:
+            number of reviews added to the aggregates.
+        """
+        df = df[[
+            "review_id", "bank", "date", "rating", "sentiment_label", "sentiment_score"
+        ]]
+        fingerprints = id_fingerprints(df["review_id"])
+        fresh_mask = unseen_mask(self.seen, fingerprints)
+        fresh = df[fresh_mask]
+        if len(fresh):
+            self._fold(summarize_batch(fresh))
+            self.seen = with_fingerprints(self.seen, fingerprints[fresh_mask])
+        return len(fresh)
+
+    def merge(self, other):
+        """
+        Adds another rollup built from disjoint reviews (e.g. another shard).
+        """
+        self._fold(other.daily)
+        self.seen = np.union1d(self.seen, other.seen)
+        return self
+
+    def daily_summary(self):
+        """
+        One row per bank and day: the sums plus the derived averages and std.
+        """
+        return _with_metrics(self.daily).reset_index()
+
+    def bank_summary(self):
+        """
+        One row per bank over all days, same columns as daily_summary minus date.
+        """
+        return _with_metrics(self.daily.groupby(level="bank").sum()).reset_index()
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.daily.reset_index().to_parquet(
+            os.path.join(path, self.daily_file), index=False
+        )
+        np.save(os.path.join(path, self.seen_file), self.seen)
+        print(f"💾 Rollups saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """
+        The rollup saved under `path`, or an empty one when nothing was saved yet.
+        """
+        daily_path = os.path.join(path, cls.daily_file)
+        if not os.path.exists(daily_path):
+            return cls()
+        daily = pd.read_parquet(daily_path)
+        daily["date"] = pd.to_datetime(daily["date"])
+        return cls(daily.set_index(KEYS), np.load(os.path.join(path, cls.seen_file)))
@@ -1,6 +1,8 @@
+import queue
+import threading
 import pandas as pd 
-import seaborn as sns
-import matplotlib.pyplot as plt
+import numpy as np
+from src.utils.instrumentation import instrumented
 
 def load_data(file_path):
     """
@@ -20,6 +22,97 @@ def load_data(file_path):
         return None
     
 
+# Compact dtypes for the review CSVs (raw, cleaned and processed); columns a
+# given file does not have are simply ignored
+REVIEW_DTYPES = {
+    "review_id": "string[pyarrow]",
+    "review": "string[pyarrow]",
+    "review_clean": "string[pyarrow]",
+    "keyword_ready": "string[pyarrow]",
+    "identified_theme": "string[pyarrow]",
+    "bank": "category",
+    "source": "category",
+    "sentiment_label": "category",
+    "rating": "Int8",
+    "sentiment_score": "float32"
+}
+REVIEW_DATE_COLUMNS = ["date"]
+
+def iter_data_chunks(file_path, chunksize=100_000, dtype=None, date_columns=None):
+    """
+    Streams a review CSV as DataFrames of at most `chunksize` rows so files
+    larger than memory can be processed chunk by chunk.
+
+    Parameters:
+    file_path (str): The path to the CSV file.
+    chunksize (int): Rows per yielded DataFrame.
+    dtype (dict): Column dtypes, defaults to REVIEW_DTYPES (pyarrow strings,
+        categorical bank/source/sentiment_label, nullable int8 rating).
+    date_columns (list): Columns parsed as datetimes, defaults to ['date'].
+
+    Yields:
+    pd.DataFrame: The next chunk. Unlike load_data, read errors are raised.
+    """
+    dtype = REVIEW_DTYPES if dtype is None else dtype
+    date_columns = REVIEW_DATE_COLUMNS if date_columns is None else date_columns
+    header = pd.read_csv(file_path, nrows=0).columns
+    with pd.read_csv(
+        file_path,
+        chunksize=chunksize,
+        dtype={col: kind for col, kind in dtype.items() if col in header},
+        parse_dates=[col for col in date_columns if col in header]
+    ) as reader:
+        yield from reader
+
+def prefetch(iterable, depth=1):
+    """
+    Iterates `iterable` on a background thread that keeps up to `depth`
+    items ready, so producing the next item (e.g. parsing the next CSV chunk
+    in iter_data_chunks) overlaps with the caller's work on the current one,
+    such as a database insert. Errors of the producer are raised in the caller.
+
+    Example:
+        for chunk in prefetch(iter_data_chunks(path)):
+            load_review_raw(chunk)
+    """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((done, e))
+            return
+        put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()  # lets the producer exit when the caller stops early
+        thread.join()
+
+@instrumented(rows="df")
 def clean_data(df, date_columns=None):
     """
     Cleans the dataframe by:
@@ -52,5 +145,36 @@ def clean_review_text(text):
     text = re.sub(r"\s+", " ", text).strip()
     return text
 
+# Precompiled patterns for clean_review_column. Tags go first since dropping
+# them can join text into new URLs or mentions; URLs and mentions then share a
+# pass, with mentions stopping where a URL starts so both are removed exactly
+# as the sequential re.sub calls in clean_review_text would.
+_HTML_TAG_RE = re.compile(r"<.*?>")
+_URL_OR_MENTION_RE = re.compile(r"http\S+|www\S+|@(?:(?!http\S|www\S)\w)+")
+
+def _clean_review_fast(text):
+    if not isinstance(text, str):
+        return ""
+    if "<" in text:
+        text = _HTML_TAG_RE.sub("", text)
+    text = _URL_OR_MENTION_RE.sub("", text)
+    return " ".join(text.split())
+
+def map_unique(series, func, default=""):
+    """
+    Applies `func` once per distinct value of `series` and broadcasts the
+    results back, so repeated reviews are only processed once. Missing values
+    map to `default`.
+    """
+    codes, uniques = pd.factorize(series)
+    results = np.array([func(value) for value in uniques] + [default], dtype=object)
+    return pd.Series(results[codes], index=series.index, name=series.name)
 
+@instrumented(rows="series")
+def clean_review_column(series):
+    """
+    Column-level clean_review_text: same output, computed once per distinct
+    text with precompiled patterns (two regex passes instead of four).
+    """
+    return map_unique(series, _clean_review_fast)
 
@@ -0,0 +1,179 @@
+"""
+Deterministic synthetic review corpus for the benchmarks.
+
+Reviews mix English, Amharic (Ge'ez script), emojis, URLs, @mentions and
+HTML in roughly the proportions of the scraped Play Store data: most reviews
+are one short phrase that repeats a lot ("good app", "👍"), a minority are
+long complaints, and ratings lean towards 5 and 1 stars. The same (n, seed)
+always produces the same frame.
+"""
+import os
+import re
+import numpy as np
+import pandas as pd
+from src.utils.utils import clean_review_column, map_unique
+
+BANKS = ["Commercial Bank of Ethiopia (CBE)", "Bank of Abyssinia (BOA)", "Dashen Bank"]
+BANK_WEIGHTS = [0.4, 0.35, 0.25]
+
+POSITIVE = [
+    "good app", "nice", "best mobile banking app in Ethiopia", "very easy to use",
+    "fast and reliable transfers", "I love the new update", "excellent service",
+    "simple interface and quick login", "telebirr transfer works perfectly",
+    "the best bank app so far keep it up", "amazing features for bill payment",
+]
+NEGATIVE = [
+    "the app keeps crashing after the last update", "cannot transfer money to telebirr",
+    "otp never arrives", "very slow loading again", "worst app ever",
+    "login failed many times", "my balance is not showing",
+    "network error every time I open it",
+    "please fix the bug it closes when I take a screenshot",
+    "customer service never answers",
+    "money was deducted but the transfer failed",
+]
+AMHARIC = [
+    "ሰላም ዳሽን ባንክ", "በጣም ጥሩ መተግበሪያ ነው", "አይሰራም", "በጣም ቀርፋፋ ነው", "አመሰግናለሁ",
+    "ገንዘብ መላክ አልቻልኩም", "ጥሩ ነው", "እባካችሁ አስተካክሉት",
+]
+EMOJIS = ["😊", "👍", "🙏", "😡", "💯", "🔥", "😞", "❤️", "🇪🇹"]
+URLS = [
+    "https://boa.com.et/help", "www.cbe.com.et", "http://dashenbanksc.com/support",
+    "https://t.me/cbe_support",
+]
+MENTIONS = ["@dashen", "@CBE_official", "@BoA_support"]
+HTML = ["<b>{}</b>", "<p>{}</p>", "{}<br>", "<i>{}</i>"]
+THEMES = ["Transaction Performance", "User Experience", "Account Access",
+          "App Reliability", "Customer Support", "Feature Requests"]
+
+# Segments per review: single phrases dominate, a few reviews are long
+SEGMENT_COUNTS = np.array([1, 1, 1, 1, 2, 2, 3, 5, 8])
+# Rating distribution given the review's polarity (1..5 stars)
+RATING_PROBS = {
+    True: [0.03, 0.02, 0.05, 0.15, 0.75],
+    False: [0.65, 0.12, 0.1, 0.05, 0.08],
+}
+
+
+def _pick(rng, choices, size):
+    return np.array(choices, dtype=object)[rng.integers(len(choices), size=size)]
+
+
+def _review_texts(rng, positive):
+    """
+    Review texts drawn segment by segment; every random choice is made for
+    the whole corpus at once so a million reviews take seconds.
+    """
+    n = len(positive)
+    counts = rng.choice(SEGMENT_COUNTS, size=n)
+    owner_positive = np.repeat(positive, counts)
+    roll = rng.random(len(owner_positive))
+    emoji_runs = _pick(rng, EMOJIS, len(roll)) * rng.integers(1, 4, size=len(roll))
+    phrases = np.where(
+        owner_positive, _pick(rng, POSITIVE, len(roll)), _pick(rng, NEGATIVE, len(roll))
+    )
+    segments = np.where(
+        roll < 0.7,
+        phrases,
+        np.where(roll < 0.85, _pick(rng, AMHARIC, len(roll)), emoji_runs)
+    )
+    first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    html = rng.random(n) < 0.05
+    segments[first[html]] = [template.format(text) for template, text in
+                             zip(_pick(rng, HTML, html.sum()), segments[first[html]])]
+    texts = [
+        " ".join(segments[start:start + count]) for start, count in zip(first, counts)
+    ]
+
+    suffixes = [(URLS, 0.04, False), (MENTIONS, 0.03, True), (EMOJIS, 0.15, False)]
+    for choices, rate, prefix in suffixes:
+        rows = np.flatnonzero(rng.random(n) < rate)
+        for row, extra in zip(rows, _pick(rng, choices, len(rows))):
+            texts[row] = f"{extra} {texts[row]}" if prefix else f"{texts[row]} {extra}"
+    for row in np.flatnonzero(rng.random(n) < 0.02):
+        texts[row] = texts[row].upper()
+    return np.array(texts, dtype=object)
+
+
+def synthetic_reviews(n, seed=42, start_date="2024-01-01", days=540):
+    """
+    Scraped-review frame (review_id, review, rating, date, bank, source) of
+    n rows. About 1% of the reviews are missing, like deleted review texts.
+    """
+    rng = np.random.default_rng(seed)
+    positive = rng.random(n) < 0.6
+    reviews = _review_texts(rng, positive)
+    reviews[rng.random(n) < 0.01] = None
+
+    ratings = np.empty(n, dtype=np.int64)
+    for polarity, probs in RATING_PROBS.items():
+        mask = positive == polarity
+        ratings[mask] = rng.choice(np.arange(1, 6), size=mask.sum(), p=probs)
+
+    offsets = pd.to_timedelta(rng.integers(0, days, size=n), unit="D")
+    dates = pd.Timestamp(start_date) + offsets
+    banks = np.array(BANKS, dtype=object)[
+        rng.choice(len(BANKS), size=n, p=BANK_WEIGHTS)
+    ]
+    return pd.DataFrame({
+        "review_id": [f"synth-{seed}-{i:08d}" for i in range(n)],
+        "review": reviews,
+        "rating": ratings,
+        "date": dates.strftime("%Y-%m-%d"),
+        "bank": banks,
+        "source": "Google Play",
+    })
+
+
+def with_processed_columns(df, seed=42):
+    """
+    Adds the columns of the processed dataset (review_clean, sentiment_label,
+    sentiment_score, keyword_ready, identified_theme) with plausible values,
+    without running the models, for benchmarks of the downstream stages.
+    """
+    rng = np.random.default_rng(seed + 1)
+    df = df.dropna(subset=["review"]).reset_index(drop=True)
+    clean = clean_review_column(df["review"])
+    labels = np.where(df["rating"].to_numpy() >= 3, "POSITIVE", "NEGATIVE")
+    # 3 distinct themes per review
+    picks = rng.random((len(df), len(THEMES))).argsort(axis=1)[:, :3]
+    combos, codes = np.unique(picks, axis=0, return_inverse=True)
+    theme_strings = np.array(
+        [str([THEMES[i] for i in combo]) for combo in combos], dtype=object
+    )
+    return df.assign(
+        review_clean=clean,
+        sentiment_label=labels.astype(object),
+        sentiment_score=rng.uniform(0.5, 1.0, size=len(df)).round(4),
+        keyword_ready=map_unique(
+            clean, lambda text: " ".join(re.sub(r"[^a-z ]+", " ", text.lower()).split())
+        ),
+        identified_theme=theme_strings[codes.ravel()],
+    )
+
+def tiny_sentiment_pipeline(vocab_dir):
+    """
+    A randomly initialised one-layer DistilBERT classifier with a WordPiece
+    vocabulary built from the corpus phrases: the shape of the production
+    pipeline at a fraction of its cost, and no download. Needs torch and
+    transformers.
+    """
+    import torch
+    import transformers
+
+    words = sorted({
+        word.lower() for phrase in POSITIVE + NEGATIVE + AMHARIC
+        for word in phrase.split()
+    })
+    vocab_file = os.path.join(vocab_dir, "vocab.txt")
+    with open(vocab_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+    tokenizer = transformers.DistilBertTokenizerFast(vocab_file=vocab_file)
+    config = transformers.DistilBertConfig(
+        vocab_size=tokenizer.vocab_size, dim=32, hidden_dim=64, n_layers=1, n_heads=2,
+        id2label={0: "NEGATIVE", 1: "POSITIVE"}, label2id={"NEGATIVE": 0, "POSITIVE": 1}
+    )
+    torch.manual_seed(0)
+    model = transformers.DistilBertForSequenceClassification(config).eval()
+    return transformers.pipeline(
+        "sentiment-analysis", model=model, tokenizer=tokenizer, device=-1
+    )
@@ -0,0 +1,51 @@
+"""
+Rows/sec of the exact + MinHash/LSH duplicate detection stage at two
+corpus sizes (near-linear scaling expected), and how many planted
+near-duplicates it recovers.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import random
+import time
+import pytest
+from src.utils.dedup import find_duplicate_groups
+
+N_ROWS = int(os.getenv("BENCH_DEDUP_ROWS", "1000000"))
+
+WORDS = (
+    "app bank transfer crash slow update login otp telebirr money account fast "
+    "nice good bad fix please service branch network ሰላም ባንክ 😊 https://cbe.com.et"
+).split()
+
+def _corpus(n, seed=7):
+    """
+    A third of the rows copy an earlier review verbatim or with a small
+    edit (one word appended, or case/punctuation changed); the rest are new.
+    Returns the texts and the planted (copy, original) pairs.
+    """
+    rng = random.Random(seed)
+    texts, planted = [], []
+    for i in range(n):
+        if texts and rng.random() < 0.33:
+            j = rng.randrange(len(texts))
+            edit = rng.choice(["", " " + rng.choice(WORDS), "!!"])
+            texts.append(texts[j].upper() + edit if edit == "!!" else texts[j] + edit)
+            planted.append((i, j))
+        else:
+            texts.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))))
+    return texts, planted
+
+@pytest.mark.slow
+def test_bench_find_duplicate_groups():
+    for n in sorted({min(100_000, N_ROWS), N_ROWS}):
+        texts, planted = _corpus(n)
+        start = time.perf_counter()
+        groups = find_duplicate_groups(texts)
+        elapsed = time.perf_counter() - start
+        recall = sum(groups[i] == groups[j] for i, j in planted) / len(planted)
+        print(
+            f"\n{n:>9,} rows: {n / elapsed:>10,.0f} rows/sec, "
+            f"{groups.max() + 1:,} groups, planted duplicates recovered {recall:.1%}"
+        )
+        assert recall > 0.95
@@ -0,0 +1,85 @@
+"""
+Peak RSS of loading and cleaning a large synthetic review CSV eagerly
+(load_data + clean_data + clean_review_column) vs chunk by chunk with
+iter_data_chunks and compact dtypes. Each variant runs in its own
+interpreter so the peaks do not mix.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import random
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+import pytest
+import pandas as pd
+
+pytest.importorskip("resource")  # ru_maxrss is Unix only
+
+ROOT = Path(__file__).resolve().parents[2]
+N_ROWS = int(os.getenv("BENCH_INGEST_ROWS", "2000000"))
+
+EAGER = """
+from src.utils.utils import load_data, clean_data, clean_review_column
+df = clean_data(load_data(PATH))
+df["review_clean"] = clean_review_column(df["review"])
+rows = len(df)
+"""
+
+STREAMING = """
+from src.utils.utils import iter_data_chunks, clean_data, clean_review_column
+rows = 0
+for chunk in iter_data_chunks(PATH, chunksize=100_000):
+    chunk = clean_data(chunk)
+    chunk = chunk.assign(review_clean=clean_review_column(chunk["review"]))
+    rows += len(chunk)
+"""
+
+def _write_synthetic_csv(path, n):
+    rng = random.Random(7)
+    banks = [
+        "Commercial Bank of Ethiopia (CBE)", "Bank of Abyssinia (BOA)", "Dashen Bank"
+    ]
+    words = (
+        "app good bad slow fast transfer otp login update crash easy best worst ሰላም"
+    ).split()
+    for start in range(0, n, 500_000):
+        size = min(500_000, n - start)
+        pd.DataFrame({
+            "review_id": [f"gp:{start + i:012d}" for i in range(size)],
+            "review": [
+                " ".join(rng.choices(words, k=rng.randint(1, 30))) for _ in range(size)
+            ],
+            "rating": [rng.randint(1, 5) for _ in range(size)],
+            "date": [
+                f"2025-0{rng.randint(1, 7)}-{rng.randint(10, 28)}" for _ in range(size)
+            ],
+            "bank": [rng.choice(banks) for _ in range(size)],
+            "source": "Google Play"
+        }).to_csv(path, mode="a", header=(start == 0), index=False)
+
+def _peak_rss_mb(snippet, path):
+    code = f"PATH = {str(path)!r}\n" + textwrap.dedent(snippet) + textwrap.dedent("""
+        import resource, sys
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(rows, peak_kb / 1024 if sys.platform != "darwin" else peak_kb / 1024 ** 2)
+    """)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout.split()
+    return int(out[0]), float(out[1])
+
+@pytest.mark.slow
+def test_bench_streaming_ingestion_peak_rss(tmp_path):
+    path = tmp_path / "reviews.csv"
+    _write_synthetic_csv(path, N_ROWS)
+    size_mb = path.stat().st_size / 1024 ** 2
+
+    eager_rows, eager_mb = _peak_rss_mb(EAGER, path)
+    stream_rows, stream_mb = _peak_rss_mb(STREAMING, path)
+    print(f"\n{N_ROWS:,} rows, {size_mb:,.0f} MB CSV")
+    print(f"eager load_data     : peak RSS {eager_mb:>8,.0f} MB")
+    print(f"iter_data_chunks    : peak RSS {stream_mb:>8,.0f} MB "
+          f"({eager_mb / stream_mb:.1f}x lower)")
+    assert stream_rows <= eager_rows  # duplicates are only dropped within a chunk
+    assert stream_mb < eager_mb
@@ -0,0 +1,69 @@
+"""
+Rows/sec of the batched loader vs the previous per-row loop, against the
+in-memory stand-in database with a simulated network round trip.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import time
+import pytest
+import pandas as pd
+from src.core.oracle_core import load_review_processed, INSERT_REVIEW_PROCESSED_SQL
+from tests.fake_oracle import FakeOracleDB
+
+N_ROWS = int(os.getenv("BENCH_ROWS", "20000"))
+ROUND_TRIP_LATENCY = float(os.getenv("BENCH_ROUND_TRIP", "0.0002"))
+
+def _make_processed(n):
+    return pd.DataFrame({
+        "review_id": [f"rev-{i}" for i in range(n)],
+        "review": ["The app keeps crashing after the last update"] * n,
+        "rating": [(i % 5) + 1 for i in range(n)],
+        "date": ["2025-07-01"] * n,
+        "bank": ["Dashen Bank"] * n,
+        "source": ["Google Play"] * n,
+        "review_clean": ["The app keeps crashing after the last update"] * n,
+        "sentiment_label": ["NEGATIVE"] * n,
+        "sentiment_score": [0.98] * n,
+        "keyword_ready": ["app keep crashing last update"] * n,
+        "identified_theme": ["['App Crashes', 'Trust Issues', 'Mixed Feedback']"] * n
+    })
+
+def _per_row_load(conn, df):
+    # The loader as it was before batching: one execute per iterrows() row
+    cursor = conn.cursor()
+    for _, row in df.iterrows():
+        cursor.execute(INSERT_REVIEW_PROCESSED_SQL, (
+            row["review_id"], row["review"], row["rating"], row["date"],
+            row["bank"], row["source"], row["review_clean"],
+            row["sentiment_label"], row["sentiment_score"],
+            row["keyword_ready"], row["identified_theme"]
+        ))
+    conn.commit()
+
+def _rows_per_sec(fn, n):
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+@pytest.mark.slow
+def test_bench_bulk_vs_per_row_load():
+    df = _make_processed(N_ROWS)
+
+    per_row_db = FakeOracleDB(round_trip_latency=ROUND_TRIP_LATENCY)
+    per_row = _rows_per_sec(lambda: _per_row_load(per_row_db.connect(), df), N_ROWS)
+
+    results = {}
+    for batch_size in (500, 5000):
+        db = FakeOracleDB(round_trip_latency=ROUND_TRIP_LATENCY)
+        results[batch_size] = _rows_per_sec(
+            lambda: load_review_processed(df, batch_size=batch_size, conn=db.connect()),
+            N_ROWS
+        )
+        assert len(db.table("review_processed")) == N_ROWS
+
+    print(f"\nper-row iterrows/execute: {per_row:>12,.0f} rows/sec")
+    for batch_size, rate in results.items():
+        print(f"executemany batch={batch_size:<5}: {rate:>12,.0f} rows/sec "
+              f"({rate / per_row:.1f}x)")
+    assert min(results.values()) > per_row
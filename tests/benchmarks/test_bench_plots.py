@@ -0,0 +1,82 @@
+"""
+Render time of the plot_utils figures against corpus size. Each plot
+aggregates first, so its time should stay nearly flat from 10K to 1M reviews
+(only the vectorized groupby grows); the former raw-data seaborn paths
+(lineplot bootstrapping CIs over every review, one scatter marker per
+review, WordCloud re-tokenizing one joined string per bank) are timed at the
+smallest size for reference.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import time
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+import seaborn as sns
+from wordcloud import WordCloud
+from src.utils import plot_utils
+from tests.benchmarks.corpus import synthetic_reviews, with_processed_columns
+
+SIZES = [
+    int(n) for n in os.getenv("BENCH_PLOT_SIZES", "10000,100000,1000000").split(",")
+]
+
+PLOTS = {
+    "sentiment_trends": plot_utils.plot_sentiment_trends,
+    "sentiment_vs_rating": plot_utils.plot_sentiment_vs_rating,
+    "keyword_clouds": plot_utils.plot_keyword_clouds,
+    "theme_distributions": plot_utils.plot_theme_distributions,
+}
+
+def _legacy_trends(df):
+    plt.figure(figsize=(10, 6))
+    sns.lineplot(data=df.assign(date=pd.to_datetime(df["date"]).dt.date),
+                 x="date", y="sentiment_score", hue="bank")
+
+def _legacy_scatter(df):
+    plt.figure(figsize=(10, 6))
+    sns.scatterplot(data=df, x="rating", y="sentiment_score", hue="bank")
+
+def _legacy_clouds(df):
+    for bank in df["bank"].unique():
+        text = " ".join(df[df["bank"] == bank]["keyword_ready"].dropna())
+        plt.figure(figsize=(10, 6))
+        cloud = WordCloud(width=800, height=400, background_color="white")
+        plt.imshow(cloud.generate(text))
+
+LEGACY = {
+    "sentiment_trends": _legacy_trends,
+    "sentiment_vs_rating": _legacy_scatter,
+    "keyword_clouds": _legacy_clouds,
+}
+
+def _render_seconds(plot, df):
+    start = time.perf_counter()
+    plot(df)
+    plt.gcf().canvas.draw()
+    elapsed = time.perf_counter() - start
+    plt.close("all")
+    return elapsed
+
+@pytest.mark.slow
+def test_bench_plot_render_time_by_rows():
+    timings = {}
+    for n in SIZES:
+        df = with_processed_columns(synthetic_reviews(n))
+        for name, plot in PLOTS.items():
+            timings[name, n] = _render_seconds(plot, df)
+        if n == min(SIZES):
+            for name, plot in LEGACY.items():
+                timings[f"{name} (raw seaborn)", n] = _render_seconds(plot, df)
+
+    print()
+    for (name, n), seconds in timings.items():
+        print(f"{name:>35} {n:>9,} rows: {seconds:7.2f}s")
+    smallest, largest = min(SIZES), max(SIZES)
+    for name in PLOTS:
+        # aggregation grows with the rows, drawing does not
+        allowed = timings[name, smallest] * (1 + largest / smallest / 10)
+        assert timings[name, largest] < allowed
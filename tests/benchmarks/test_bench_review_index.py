@@ -0,0 +1,75 @@
+"""
+Query latency of the ReviewIndex vs the pandas scan it replaces
+(str.contains on keyword_ready / identified_theme plus boolean filters) on
+a 1M-review synthetic corpus, and the index build, load and disk size.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import time
+import pandas as pd
+import pytest
+from src.utils.review_index import ReviewIndex
+from tests.benchmarks.corpus import synthetic_reviews, with_processed_columns
+
+N_ROWS = int(os.getenv("BENCH_INDEX_ROWS", "1000000"))
+BOA = "Bank of Abyssinia (BOA)"
+
+QUERIES = {
+    "negative BOA reviews mentioning otp since June": (
+        {
+            "keywords": ["otp"], "bank": BOA, "sentiment": "NEGATIVE",
+            "since": "2025-06-01"
+        },
+        lambda df: df["keyword_ready"].str.contains(r"\botp\b") & (df["bank"] == BOA)
+        & (df["sentiment_label"] == "NEGATIVE") & (df["date"] >= "2025-06-01")
+    ),
+    "theme Customer Support": (
+        {"themes": ["Customer Support"]},
+        lambda df: df["identified_theme"].str.contains(
+            "'Customer Support'", regex=False
+        )
+    ),
+    "1-star reviews mentioning crash or slow": (
+        {"keywords": ["crash", "slow"], "rating": 1, "match": "any"},
+        lambda df: df["keyword_ready"].str.contains(r"\b(?:crash|slow)\b")
+        & (df["rating"] == 1)
+    ),
+}
+
+def _timed(fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+def _size_mb(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    ) / 1e6
+
+@pytest.mark.slow
+def test_bench_index_vs_pandas_scan(tmp_path):
+    df = with_processed_columns(synthetic_reviews(N_ROWS))
+    df["date"] = pd.to_datetime(df["date"])
+    _, build = _timed(lambda: ReviewIndex.from_frame(df).save(tmp_path))
+    index, load = _timed(lambda: ReviewIndex.load(tmp_path))
+    _, docs = _timed(lambda: index.rows(keywords=["otp"]))  # reads docs.parquet once
+    print(
+        f"\n{N_ROWS:,} reviews: build + save {build:.1f}s, load {load:.2f}s, "
+        f"first rows() {docs:.2f}s, {_size_mb(tmp_path):.0f} MB on disk"
+    )
+
+    for name, (query, scan) in QUERIES.items():
+        found, index_seconds = _timed(lambda: index.search(**query), repeat=20)
+        expected, scan_seconds = _timed(
+            lambda: df.loc[scan(df).fillna(False), "review_id"]
+        )
+        assert set(found) == set(expected)
+        _, rows_seconds = _timed(lambda: index.rows(**query), repeat=5)
+        print(
+            f"{name:>50}: {len(found):>7,} hits, index {index_seconds * 1000:7.2f} ms "
+            f"(rows {rows_seconds * 1000:7.2f} ms), "
+            f"pandas scan {scan_seconds * 1000:8.1f} ms"
+        )
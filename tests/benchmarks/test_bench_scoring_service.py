@@ -0,0 +1,138 @@
+"""
+p50 / p99 latency and throughput of the scoring service
+(src/services/scoring_service.py) under a local load generator: concurrent
+keep-alive clients, each posting one review at a time, against the service
+without batching (max_batch 1) and with micro-batching (max_batch 32,
+max_wait 5 ms). The models are a tiny local DistilBERT and per-bank topic
+models fitted on the synthetic corpus, so torch, transformers and the NLTK
+corpora are needed.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import numpy as np
+import pytest
+from src.pipeline import BANK_KEYS
+from src.services.scoring_service import ReviewScorer, ScoringService
+from tests.benchmarks.corpus import (
+    THEMES,
+    synthetic_reviews,
+    with_processed_columns,
+    tiny_sentiment_pipeline
+)
+
+N_REQUESTS = int(os.getenv("BENCH_SERVICE_REQUESTS", "2000"))
+CONCURRENCY = [
+    int(n) for n in os.getenv("BENCH_SERVICE_CONCURRENCY", "1,16,64").split(",")
+]
+POLICIES = {"no batching": (1, 0.0), "micro-batching": (32, 0.005)}
+
+
+class ServiceThread:
+    """
+    Runs a ScoringService on its own event loop in a background thread, so
+    the load generator's loop in the test thread only drives the clients.
+    """
+
+    def __init__(self, scorer, max_batch, max_wait):
+        self.service = ScoringService(scorer, max_batch, max_wait)
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self._serve(),), daemon=True
+        )
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        _, self.port = await self.service.start("127.0.0.1", 0)
+        self._ready.set()
+        await self._stopped.wait()
+        await self.service.stop()
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join()
+
+async def _client(port, items, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for item in items:
+        body = json.dumps({"reviews": [item]}).encode("utf-8")
+        start = time.perf_counter()
+        head = f"POST /score HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n"
+        writer.write(head.encode() + body)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        assert head.startswith(b"HTTP/1.1 200")
+    writer.close()
+
+async def generate_load(port, items, concurrency):
+    """
+    Splits items over `concurrency` clients and returns (latencies, seconds).
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(port, items[i::concurrency], latencies) for i in range(concurrency)
+    ))
+    return np.array(latencies), time.perf_counter() - start
+
+def report(name, concurrency, latencies, seconds, stats):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(
+        f"{name:>15} x{concurrency:<3}: p50 {p50:7.1f} ms, p99 {p99:7.1f} ms, "
+        f"{len(latencies) / seconds:8.0f} reviews/sec, "
+        f"mean batch {stats['mean_batch_size']:5.1f}"
+    )
+
+
+@pytest.fixture(scope="module")
+def scorer(tmp_path_factory):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from src.models.sentiments import SentimentScorer
+    from src.models.keyword_and_topicmodeling import BankTopicModel
+
+    df = with_processed_columns(synthetic_reviews(20_000))
+    topic_models = {}
+    for bank, key in BANK_KEYS.items():
+        model = BankTopicModel(key, lda_params={"max_iter": 10})
+        model.fit(df.loc[df["bank"] == bank, "keyword_ready"])
+        model.theme_labels = dict(enumerate(THEMES[:model.lda.n_components]))
+        topic_models[key] = model
+    sentiment = tiny_sentiment_pipeline(tmp_path_factory.mktemp("tiny_sentiment"))
+    scorer = ReviewScorer(SentimentScorer(sentiment, batch_size=32), topic_models)
+    try:
+        scorer.warm_up()
+    except LookupError as e:
+        pytest.skip(f"NLTK data missing: {e}")
+    return scorer
+
+@pytest.mark.slow
+def test_bench_scoring_service_latency_and_throughput(scorer):
+    reviews = synthetic_reviews(N_REQUESTS, seed=7)
+    items = [
+        {"review": review, "bank": bank}
+        for review, bank in zip(reviews["review"], reviews["bank"])
+    ]
+
+    print()
+    for concurrency in CONCURRENCY:
+        for name, (max_batch, max_wait) in POLICIES.items():
+            with ServiceThread(scorer, max_batch, max_wait) as server:
+                latencies, seconds = asyncio.run(
+                    generate_load(server.port, items, concurrency)
+                )
+                stats = server.service.batcher.stats()
+            assert len(latencies) == len(items)
+            report(name, concurrency, latencies, seconds, stats)
@@ -0,0 +1,108 @@
+"""
+CPU throughput (reviews/sec) of SentimentScorer vs the notebook's
+one-review-per-call pipeline usage, scaling of the process-pool mode from
+1 to N workers, and latency / throughput / label agreement of the
+quantized and ONNX backends against fp32 PyTorch.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import time
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from src.models.sentiments import (
+    load_sentiment_model,
+    SentimentScorer,
+    score_sentiments_parallel,
+    label_agreement,
+    BACKENDS
+)
+
+N_REVIEWS = int(os.getenv("BENCH_REVIEWS", "2000"))
+
+SAMPLE_REVIEWS = [
+    "good app",
+    "nice",
+    "The app keeps crashing after the last update, "
+    "I can't even log in to check my balance.",
+    "Best mobile banking app in Ethiopia, transfers are fast and easy.",
+    "Why do I need an OTP every single time? "
+    "Very slow and frustrating experience overall.",
+    "ok",
+    "Please bring back the screenshot feature, "
+    "it is needed to share receipts with customers.",
+]
+
+def _corpus(n):
+    return [SAMPLE_REVIEWS[i % len(SAMPLE_REVIEWS)] for i in range(n)]
+
+def _reviews_per_sec(fn, n):
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+@pytest.mark.slow
+def test_bench_sentiment_scorer_throughput():
+    texts = _corpus(N_REVIEWS)
+    model = load_sentiment_model()
+
+    per_review = _reviews_per_sec(lambda: [model(t)[0] for t in texts[:200]], 200)
+    print(f"\nper-review pipeline calls: {per_review:>10,.1f} reviews/sec")
+
+    for batch_size in (16, 64, 128):
+        scorer = SentimentScorer(model, batch_size=batch_size)
+        rate = _reviews_per_sec(lambda: scorer.score(texts), N_REVIEWS)
+        print(
+            f"SentimentScorer batch={batch_size:<4}: {rate:>10,.1f} reviews/sec "
+            f"({rate / per_review:.1f}x, {torch.get_num_threads()} threads)"
+        )
+
+@pytest.mark.slow
+def test_bench_sentiment_worker_scaling():
+    texts = _corpus(N_REVIEWS * 4)
+    max_workers = int(os.getenv("BENCH_MAX_WORKERS", str(os.cpu_count())))
+    workers = sorted({1, 2, 4, 8, max_workers} & set(range(1, max_workers + 1)))
+
+    baseline = None
+    print()
+    for n in workers:
+        rate = _reviews_per_sec(
+            lambda: score_sentiments_parallel(texts, workers=n, shard_size=500),
+            len(texts)
+        )
+        baseline = baseline or rate
+        print(f"{n:>2} worker(s): {rate:>10,.1f} reviews/sec ({rate / baseline:.2f}x, "
+              f"{rate / baseline / n:.0%} efficiency; includes model load per worker)")
+
+@pytest.mark.slow
+def test_bench_sentiment_backends():
+    texts = _corpus(N_REVIEWS)
+    reference = None
+    print()
+    for backend in BACKENDS:
+        try:
+            model = load_sentiment_model(backend=backend)
+        except ImportError as e:
+            print(f"{backend:<10} skipped: {e}")
+            continue
+        scorer = SentimentScorer(model, batch_size=64)
+
+        start = time.perf_counter()
+        for text in texts[:100]:
+            scorer.score([text])
+        latency_ms = (time.perf_counter() - start) / 100 * 1000
+
+        start = time.perf_counter()
+        result = scorer.score(texts)
+        rate = len(texts) / (time.perf_counter() - start)
+
+        reference = reference or result
+        report = label_agreement(reference, result)
+        print(
+            f"{backend:<10} {latency_ms:>7.1f} ms/review (batch 1) "
+            f"{rate:>9,.1f} reviews/sec (batch 64) "
+            f"agreement {report['agreement']:.2%} ({report['flipped']} flipped, "
+            f"max score diff {report['max_score_diff']:.4f})"
+        )
@@ -0,0 +1,79 @@
+"""
+Read time and on-disk size of the processed review dataset as CSV vs the
+partitioned Parquet store, for a full read and for a stage that only needs
+review_clean.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import random
+import time
+import pytest
+import pandas as pd
+from src.utils.parquet_store import write_reviews, read_reviews, parse_theme_list
+
+N_ROWS = int(os.getenv("BENCH_STORAGE_ROWS", "500000"))
+
+def _processed(n, seed=3):
+    rng = random.Random(seed)
+    banks = [
+        "Commercial Bank of Ethiopia (CBE)", "Bank of Abyssinia (BOA)", "Dashen Bank"
+    ]
+    themes = ["App Crashes", "Trust Issues", "Speed", "UX", "Feature Requests"]
+    words = (
+        "app good bad slow fast transfer otp login update crash easy best worst"
+    ).split()
+    text = [" ".join(rng.choices(words, k=rng.randint(1, 25))) for _ in range(n)]
+    return pd.DataFrame({
+        "review_id": [f"gp:{i:012d}" for i in range(n)],
+        "review": text,
+        "rating": [rng.randint(1, 5) for _ in range(n)],
+        "date": [f"2025-0{rng.randint(1, 7)}-{rng.randint(10, 28)}" for _ in range(n)],
+        "bank": [rng.choice(banks) for _ in range(n)],
+        "source": "Google Play",
+        "review_clean": text,
+        "sentiment_label": [rng.choice(["POSITIVE", "NEGATIVE"]) for _ in range(n)],
+        "sentiment_score": [rng.random() for _ in range(n)],
+        "keyword_ready": text,
+        "identified_theme": [str(rng.sample(themes, 3)) for _ in range(n)]
+    })
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def _dir_size_mb(path):
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path) for f in files
+    ) / 1024 ** 2
+
+@pytest.mark.slow
+def test_bench_csv_vs_parquet(tmp_path):
+    df = _processed(N_ROWS)
+    csv_path, parquet_root = tmp_path / "processed.csv", str(tmp_path / "processed")
+    df.to_csv(csv_path, index=False)
+    write_reviews(df, parquet_root, "processed", scrape_date="2025-07-26")
+
+    def csv_full():
+        # What every stage does today: full parse, then re-parse dates and themes
+        out = pd.read_csv(csv_path, parse_dates=["date"])
+        out["identified_theme"] = out["identified_theme"].map(parse_theme_list)
+        return out
+
+    _, csv_full_s = _timed(csv_full)
+    _, pq_full_s = _timed(lambda: read_reviews(parquet_root))
+    _, csv_col_s = _timed(lambda: pd.read_csv(csv_path, usecols=["review_clean"]))
+    _, pq_col_s = _timed(lambda: read_reviews(parquet_root, columns=["review_clean"]))
+    dashen, pq_filter_s = _timed(lambda: read_reviews(
+        parquet_root, columns=["review_clean"], filters=[("bank", "=", "Dashen Bank")]
+    ))
+
+    print(f"\n{N_ROWS:,} processed reviews")
+    print(f"size      CSV {csv_path.stat().st_size / 1024 ** 2:>8.1f} MB | "
+          f"Parquet {_dir_size_mb(parquet_root):>8.1f} MB")
+    print(f"full read CSV {csv_full_s:>8.2f} s  | Parquet {pq_full_s:>8.2f} s")
+    print(f"review_clean only CSV {csv_col_s:>6.2f} s | Parquet {pq_col_s:>6.2f} s | "
+          f"+ bank filter {pq_filter_s:.2f} s ({len(dashen):,} rows)")
+    assert pq_col_s < csv_col_s
@@ -0,0 +1,145 @@
+"""
+Per-stage benchmark suite on the synthetic review corpus
+(tests/benchmarks/corpus.py) at 10K, 100K and 1M reviews, timed with
+pytest-benchmark: text cleaning, keyword preprocessing, clean_data, TF-IDF +
+LDA fitting, theme mapping, sentiment scoring with a tiny local model and the
+Oracle loaders against the in-memory stand-in database.
+
+Run, save the results under .benchmarks/ and compare with the last saved run:
+    make benchmark-suite
+
+BENCH_SUITE_SIZES resizes the corpora (comma separated); the model stages
+(LDA fit, sentiment) are capped at BENCH_SUITE_MODEL_ROWS reviews.
+"""
+import os
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+from src.utils.utils import clean_data, clean_review_text, clean_review_column
+from src.models.keyword_and_topicmodeling import BankTopicModel, map_topics_to_labels
+from src.core.oracle_core import (
+    load_review_raw,
+    load_review_processed,
+    load_bank_detail
+)
+from tests.benchmarks.corpus import (
+    synthetic_reviews,
+    with_processed_columns,
+    tiny_sentiment_pipeline
+)
+from tests.fake_oracle import FakeOracleDB
+
+SIZES = [
+    int(n) for n in os.getenv("BENCH_SUITE_SIZES", "10000,100000,1000000").split(",")
+]
+MODEL_MAX_ROWS = int(os.getenv("BENCH_SUITE_MODEL_ROWS", "100000"))
+# Theme mapping uses one model fitted on this many reviews at every size
+TOPIC_FIT_ROWS = 10_000
+THEME_LABELS = {i: f"Topic {i + 1}" for i in range(5)}
+
+
+def _size_id(n):
+    return f"{n // 1_000_000}M" if n % 1_000_000 == 0 else f"{n // 1000}K"
+
+@pytest.fixture(scope="module", params=SIZES, ids=_size_id)
+def corpus(request):
+    return synthetic_reviews(request.param)
+
+@pytest.fixture(scope="module")
+def processed(corpus):
+    return with_processed_columns(corpus)
+
+@pytest.fixture(scope="module")
+def topic_model(processed):
+    # mapping cost does not depend on how converged the model is
+    model = BankTopicModel("bench", lda_params={"max_iter": 10})
+    return model.fit(processed["keyword_ready"][:TOPIC_FIT_ROWS])
+
+def _run(benchmark, fn, rows, setup=None, rounds=None):
+    """
+    Times fn with rounds scaled to the corpus size (10 at 10K, 1 from 100K)
+    unless given, and stores rows and rows/sec with the saved results.
+    """
+    rounds = rounds or max(1, 100_000 // rows)
+    if setup is None:
+        result = benchmark.pedantic(fn, rounds=rounds, iterations=1)
+    else:
+        result = benchmark.pedantic(fn, setup=setup, rounds=rounds)
+    benchmark.extra_info["rows"] = rows
+    benchmark.extra_info["rows_per_second"] = rows / benchmark.stats.stats.mean
+    return result
+
+def _skip_over_model_cap(rows):
+    if rows > MODEL_MAX_ROWS:
+        pytest.skip(f"{rows} rows is above BENCH_SUITE_MODEL_ROWS={MODEL_MAX_ROWS}")
+
+
+@pytest.mark.slow
+def test_bench_clean_review_text(benchmark, corpus):
+    texts = corpus["review"].tolist()
+    _run(benchmark, lambda: [clean_review_text(text) for text in texts], len(texts))
+
+@pytest.mark.slow
+def test_bench_clean_review_column(benchmark, corpus):
+    _run(benchmark, lambda: clean_review_column(corpus["review"]), len(corpus))
+
+@pytest.mark.slow
+def test_bench_preprocess_for_keywords(benchmark, processed):
+    try:
+        from src.utils.keyword_text_processor import preprocess_for_keywords
+        preprocess_for_keywords("warm up the NLTK corpora")
+    except LookupError as e:
+        pytest.skip(f"NLTK data missing: {e}")
+    texts = processed["review_clean"].tolist()
+    _run(benchmark, lambda: [preprocess_for_keywords(text) for text in texts],
+         len(texts))
+
+@pytest.mark.slow
+def test_bench_clean_data(benchmark, corpus):
+    _run(benchmark, lambda: clean_data(corpus, date_columns=["date"]), len(corpus))
+
+@pytest.mark.slow
+def test_bench_topic_model_fit(benchmark, processed):
+    _skip_over_model_cap(len(processed))
+    # the production LDA_PARAMS (70 batch iterations) make one round enough
+    _run(benchmark, lambda: BankTopicModel("bench").fit(processed["keyword_ready"]),
+         len(processed), rounds=1)
+
+@pytest.mark.slow
+def test_bench_map_topics_to_labels(benchmark, processed, topic_model):
+    tfidf_matrix = topic_model.vectorizer.transform(processed["keyword_ready"])
+    labels = _run(
+        benchmark,
+        lambda: map_topics_to_labels(topic_model.lda, tfidf_matrix, THEME_LABELS),
+        len(processed)
+    )
+    assert len(labels) == len(processed)
+
+
+@pytest.fixture(scope="module")
+def tiny_sentiment_model(tmp_path_factory):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    return tiny_sentiment_pipeline(tmp_path_factory.mktemp("tiny_sentiment"))
+
+@pytest.mark.slow
+def test_bench_sentiment_score(benchmark, processed, tiny_sentiment_model):
+    _skip_over_model_cap(len(processed))
+    from src.models.sentiments import SentimentScorer
+
+    scorer = SentimentScorer(tiny_sentiment_model, batch_size=64)
+    labels, _ = _run(benchmark, lambda: scorer.score(processed["review_clean"]),
+                     len(processed))
+    assert set(labels) <= {"NEGATIVE", "POSITIVE"}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "loader", [load_review_raw, load_review_processed, load_bank_detail],
+    ids=lambda loader: loader.__name__
+)
+def test_bench_oracle_loader(benchmark, processed, loader):
+    # a fresh stand-in database per round, created outside the timing
+    def setup():
+        return (processed,), {"conn": FakeOracleDB().connect()}
+    _run(benchmark, loader, len(processed), setup=setup)
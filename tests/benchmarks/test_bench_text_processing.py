@@ -0,0 +1,78 @@
+"""
+Rows/sec of the column-level text cleaners (single process and process
+pool) vs the row-wise Series.apply path on a synthetic review corpus
+(1M rows by default).
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import random
+import time
+import pytest
+import pandas as pd
+from src.utils.utils import clean_review_text, clean_review_column
+
+N_ROWS = int(os.getenv("BENCH_TEXT_ROWS", "1000000"))
+# The row-wise baseline is measured on a prefix to keep the run bounded
+N_BASELINE = int(os.getenv("BENCH_TEXT_BASELINE_ROWS", "100000"))
+
+FRAGMENTS = [
+    "good app", "nice", "The app keeps crashing after the last update",
+    "<b>Best</b> mobile banking app in Ethiopia", "visit https://boa.com.et/help",
+    "@dashen please fix the OTP", "ሰላም ዳሽን ባንክ", "😊😊", "Wow!!! 100% amazing",
+    "I cannot transfer money to telebirr", "slow   loading\n again", "www.cbe.com.et",
+]
+
+def _synthetic_reviews(n, seed=42):
+    rng = random.Random(seed)
+    # Short reviews repeat heavily in the real data, long ones rarely do
+    return pd.Series([
+        " ".join(rng.choice(FRAGMENTS) for _ in range(rng.choice([1, 1, 1, 2, 3, 5])))
+        + ("" if rng.random() < 0.5 else f" {rng.randint(0, 10**6)}")
+        for _ in range(n)
+    ])
+
+def _rate(fn, n):
+    start = time.perf_counter()
+    result = fn()
+    return result, n / (time.perf_counter() - start)
+
+@pytest.mark.slow
+def test_bench_clean_review_column():
+    texts = _synthetic_reviews(N_ROWS)
+    baseline, row_rate = _rate(
+        lambda: texts[:N_BASELINE].apply(clean_review_text), N_BASELINE
+    )
+    result, column_rate = _rate(lambda: clean_review_column(texts), N_ROWS)
+    assert result[:N_BASELINE].tolist() == baseline.tolist()
+    print(f"\nclean_review_text apply : {row_rate:>12,.0f} rows/sec")
+    print(f"clean_review_column     : {column_rate:>12,.0f} rows/sec "
+          f"({column_rate / row_rate:.1f}x)")
+
+@pytest.mark.slow
+def test_bench_preprocess_column_for_keywords():
+    try:
+        from src.utils.keyword_text_processor import (
+            preprocess_for_keywords,
+            preprocess_column_for_keywords,
+            preprocess_column_parallel
+        )
+        preprocess_for_keywords("warm up the NLTK corpora")
+    except LookupError as e:
+        pytest.skip(f"NLTK data missing: {e}")
+    texts = _synthetic_reviews(N_ROWS)
+    baseline, row_rate = _rate(
+        lambda: texts[:N_BASELINE].apply(preprocess_for_keywords), N_BASELINE
+    )
+    result, column_rate = _rate(lambda: preprocess_column_for_keywords(texts), N_ROWS)
+    assert result[:N_BASELINE].tolist() == baseline.tolist()
+    print(f"\npreprocess_for_keywords apply : {row_rate:>12,.0f} rows/sec")
+    print(f"preprocess_column_for_keywords: {column_rate:>12,.0f} rows/sec "
+          f"({column_rate / row_rate:.1f}x)")
+    for workers in (2, os.cpu_count()):
+        parallel, rate = _rate(
+            lambda: preprocess_column_parallel(texts, workers=workers), N_ROWS
+        )
+        assert parallel.tolist() == result.tolist()
+        print(f"preprocess_column_parallel x{workers:<3}: {rate:>10,.0f} rows/sec "
+              f"({rate / row_rate:.1f}x)")
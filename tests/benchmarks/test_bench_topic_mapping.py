@@ -0,0 +1,74 @@
+"""
+Vectorized map_topics_to_labels / extract_topic_keywords vs the former
+per-row argsort loops, at 1M documents and a 500K n-gram vocabulary. The
+LDA transform itself is stubbed with precomputed distributions so only the
+label selection is timed.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import os
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.models.keyword_and_topicmodeling import (
+    map_topics_to_labels,
+    extract_topic_keywords
+)
+
+N_DOCS = int(os.getenv("BENCH_MAPPING_DOCS", "1000000"))
+N_FEATURES = int(os.getenv("BENCH_MAPPING_FEATURES", "500000"))
+THEMES = {0: "Speed", 1: "Reliability", 2: "Transfers", 3: "UX", 4: "Support"}
+
+def _loop_map_topics_to_labels(distributions, theme_labels):
+    top_labels = []
+    for dist in distributions:
+        if np.all(dist == 0):
+            continue
+        idxs = dist.argsort()[-3:][::-1]
+        top_labels.append([theme_labels[i] for i in idxs])
+    return top_labels
+
+def _loop_extract_topic_keywords(components, feature_names, top_n):
+    return {
+        f"Topic {topic_idx + 1}": [
+            feature_names[i] for i in topic.argsort()[:-top_n - 1:-1]
+        ]
+        for topic_idx, topic in enumerate(components)
+    }
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+@pytest.mark.slow
+def test_bench_map_topics_to_labels():
+    rng = np.random.default_rng(0)
+    distributions = rng.dirichlet(np.ones(len(THEMES)), size=N_DOCS)
+    rows = np.arange(N_DOCS)[:, np.newaxis]  # stands in for the TF-IDF rows
+    lda = SimpleNamespace(transform=lambda X: distributions[X[:, 0]])
+
+    baseline, loop_s = _timed(
+        lambda: _loop_map_topics_to_labels(distributions, THEMES)
+    )
+    result, vector_s = _timed(lambda: map_topics_to_labels(lda, rows, THEMES))
+    assert result == baseline
+    print(f"\nmap_topics_to_labels, {N_DOCS:,} docs: loop {loop_s:.1f}s, "
+          f"vectorized {vector_s:.1f}s ({loop_s / vector_s:.1f}x)")
+
+@pytest.mark.slow
+def test_bench_extract_topic_keywords():
+    rng = np.random.default_rng(1)
+    components = rng.gamma(1.0, 1.0, size=(len(THEMES), N_FEATURES))
+    names = np.array([f"ngram {i}" for i in range(N_FEATURES)], dtype=object)
+    model = SimpleNamespace(components_=components)
+
+    baseline, loop_s = _timed(
+        lambda: _loop_extract_topic_keywords(components, names, 20)
+    )
+    result, vector_s = _timed(lambda: extract_topic_keywords(model, names, 20))
+    assert result == baseline
+    print(f"\nextract_topic_keywords, {N_FEATURES:,} n-grams: "
+          f"argsort {loop_s * 1000:.0f} ms, partition {vector_s * 1000:.0f} ms "
+          f"({loop_s / vector_s:.1f}x)")
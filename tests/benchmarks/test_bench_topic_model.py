@@ -0,0 +1,84 @@
+"""
+Wall time and peak RSS of keeping a bank's topic model current as daily
+review deltas arrive: a full BankTopicModel refit on the cumulative corpus
+every day vs OnlineBankTopicModel.partial_fit on each day's delta only.
+Each variant runs in its own interpreter so the peaks do not mix.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+import pytest
+
+pytest.importorskip("resource")  # ru_maxrss is Unix only
+
+ROOT = Path(__file__).resolve().parents[2]
+N_ROWS = int(os.getenv("BENCH_TOPIC_ROWS", "10000"))
+N_DAYS = int(os.getenv("BENCH_TOPIC_DAYS", "5"))
+
+CORPUS = """
+import random, time
+WORDS = (
+    "app crash update login otp transfer money telebirr account fast slow easy use "
+    "best worst mobile banking service network screenshot feature branch balance "
+    "error fix"
+).split()
+rng = random.Random(11)
+texts = [
+    " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14)))
+    for _ in range(N_ROWS)
+]
+day_size = N_ROWS // N_DAYS
+times = []
+"""
+
+REFIT = """
+from src.models.keyword_and_topicmodeling import BankTopicModel
+for day in range(1, N_DAYS + 1):
+    start = time.perf_counter()
+    BankTopicModel("bench").fit(texts[:day * day_size])
+    times.append(time.perf_counter() - start)
+"""
+
+ONLINE = """
+from src.models.keyword_and_topicmodeling import OnlineBankTopicModel
+model = OnlineBankTopicModel("bench")
+for day in range(1, N_DAYS + 1):
+    start = time.perf_counter()
+    model.partial_fit(texts[(day - 1) * day_size:day * day_size])
+    times.append(time.perf_counter() - start)
+"""
+
+def _run(snippet):
+    report = textwrap.dedent("""
+        import json, resource, sys
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak_kb / 1024 if sys.platform != "darwin" else peak_kb / 1024 ** 2
+        print(json.dumps({"times": times, "peak_mb": peak_mb}))
+    """)
+    code = (
+        f"N_ROWS, N_DAYS = {N_ROWS}, {N_DAYS}\n"
+        + textwrap.dedent(CORPUS) + textwrap.dedent(snippet) + report
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+@pytest.mark.slow
+def test_bench_online_vs_refit():
+    refit, online = _run(REFIT), _run(ONLINE)
+    day_size = N_ROWS // N_DAYS
+    print(f"\n{N_DAYS} daily deltas of {day_size:,} reviews")
+    days = enumerate(zip(refit["times"], online["times"]), start=1)
+    for day, (refit_s, online_s) in days:
+        print(f"day {day} ({day * day_size:>9,} reviews): "
+              f"refit {refit_s:7.1f}s   online update {online_s:7.1f}s")
+    print(f"total                       : refit {sum(refit['times']):7.1f}s   "
+          f"online update {sum(online['times']):7.1f}s")
+    print(f"peak RSS                    : refit {refit['peak_mb']:6.0f} MB   "
+          f"online update {online['peak_mb']:6.0f} MB")
+    assert sum(online["times"]) < sum(refit["times"])
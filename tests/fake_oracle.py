@@ -0,0 +1,210 @@
+"""
+In-memory stand-in for an Oracle connection, used by tests and benchmarks.
+
+Only the slice of the DB-API that src.core.oracle_core relies on is
+implemented. Statements are recognised by their leading keyword and every
+table is a dict keyed by its first column, which mirrors the primary keys in
+scripts/oracle_setup.py. Tables named *_stage behave like the ON COMMIT
+DELETE ROWS staging tables, private to each connection, and MERGE follows
+the content_hash rule used by oracle_core.upsert_reviews. Single-row MERGEs
+of bind values (USING SELECT ... FROM dual) replace the row with the same ON
+key. FakePool stands in for the oracledb session pool. An optional
+per-round-trip latency makes the per-row vs batched cost difference visible
+without a real server.
+"""
+import re
+import threading
+import time
+
+_INSERT_RE = re.compile(r"INSERT\s+INTO\s+([\w.]+)\s*\(([^)]*)\)", re.I | re.S)
+_MERGE_RE = re.compile(r"MERGE\s+INTO\s+([\w.]+)\s+\w+\s+USING\s+([\w.]+)", re.I | re.S)
+_MERGE_BINDS_RE = re.compile(
+    r"MERGE\s+INTO\s+([\w.]+)\s+\w+\s+USING\s+"
+    r"\(\s*SELECT\s+(.*?)\s+FROM\s+dual\s*\)\s+\w+\s+ON\s+\((.*?)\)",
+    re.I | re.S
+)
+
+
+class FakeBatchError:
+    def __init__(self, offset, message):
+        self.offset = offset
+        self.message = message
+
+
+class FakeIntegrityError(Exception):
+    pass
+
+
+class FakeOracleDB:
+    """Shared server state: tables plus counters for round trips and commits."""
+
+    def __init__(self, round_trip_latency=0.0):
+        self.round_trip_latency = round_trip_latency
+        self.tables = {}
+        self.round_trips = 0
+        self.commits = 0
+        self.input_sizes = None
+        self._lock = threading.Lock()
+
+    def connect(self):
+        return FakeConnection(self)
+
+    def create_pool(self, min=1, max=4, increment=1):
+        return FakePool(self, min, max)
+
+    def table(self, name):
+        return self.tables.setdefault(name.lower().split(".")[-1], {})
+
+    def _round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        if self.round_trip_latency:
+            time.sleep(self.round_trip_latency)
+
+
+class FakePool:
+    """
+    Stand-in for oracledb.ConnectionPool: acquire() blocks once `max`
+    sessions are out, and the peak number of sessions in use is recorded.
+    """
+
+    def __init__(self, db, min=1, max=4):
+        self.db = db
+        self.min = min
+        self.max = max
+        self.busy = 0
+        self.max_busy = 0
+        self.acquired = 0
+        self.closed = False
+        self._slots = threading.BoundedSemaphore(max)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            self.busy += 1
+            self.acquired += 1
+            self.max_busy = max(self.max_busy, self.busy)
+        return FakeConnection(self.db, pool=self)
+
+    def _release(self):
+        with self._lock:
+            self.busy -= 1
+        self._slots.release()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, db, pool=None):
+        self.db = db
+        self.pool = pool
+        self.closed = False
+        # global temporary tables: rows are private to the session
+        self.stage_tables = {}
+
+    def cursor(self):
+        return FakeCursor(self.db, self)
+
+    def table(self, name):
+        name = name.lower().split(".")[-1]
+        if name.endswith("_stage"):
+            return self.stage_tables.setdefault(name, {})
+        return self.db.table(name)
+
+    def commit(self):
+        self.db._round_trip()
+        with self.db._lock:
+            self.db.commits += 1
+        for table in self.stage_tables.values():
+            table.clear()
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        if self.pool is not None and not self.closed:
+            self.pool._release()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeCursor:
+    def __init__(self, db, conn):
+        self.db = db
+        self.conn = conn
+        self.rowcount = 0
+        self._batch_errors = []
+
+    def setinputsizes(self, *sizes):
+        self.db.input_sizes = sizes
+
+    def getbatcherrors(self):
+        return self._batch_errors
+
+    def execute(self, sql, params=()):
+        self.db._round_trip()
+        self._apply(sql, params)
+
+    def executemany(self, sql, rows, batcherrors=False):
+        self.db._round_trip()
+        self._batch_errors = []
+        for offset, params in enumerate(rows):
+            try:
+                self._apply(sql, params)
+            except FakeIntegrityError as e:
+                if not batcherrors:
+                    raise
+                self._batch_errors.append(FakeBatchError(offset, str(e)))
+
+    def _apply(self, sql, params):
+        upsert = _MERGE_BINDS_RE.search(sql)
+        if upsert:
+            self._upsert(
+                self.conn.table(upsert.group(1)), upsert.group(2), upsert.group(3),
+                params
+            )
+            return
+        merge = _MERGE_RE.search(sql)
+        if merge:
+            self._merge(
+                self.conn.table(merge.group(1)), self.conn.table(merge.group(2))
+            )
+            return
+        match = _INSERT_RE.search(sql)
+        if not match:
+            raise NotImplementedError(f"Unsupported statement: {sql.strip()[:40]}")
+        table = self.conn.table(match.group(1))
+        columns = [col.strip() for col in match.group(2).split(",")]
+        if len(columns) != len(params):
+            raise ValueError(f"Expected {len(columns)} binds, got {len(params)}")
+        row = dict(zip(columns, params))
+        key = params[0]
+        if key in table:
+            raise FakeIntegrityError(f"ORA-00001: unique constraint violated ({key})")
+        table[key] = row
+
+    def _upsert(self, target, select, on, params):
+        # MERGE of one row of binds; keyed by the ON columns
+        # (a tuple for composite keys)
+        columns = re.findall(r"AS\s+(\w+)", select, re.I)
+        keys = re.findall(r"t\.(\w+)\s*=", on)
+        row = dict(zip(columns, params))
+        key = tuple(row[col] for col in keys)
+        target[key[0] if len(key) == 1 else key] = row
+        self.rowcount = 1
+
+    def _merge(self, target, source):
+        self.rowcount = 0
+        for key, row in source.items():
+            current = target.get(key)
+            if current and current.get("content_hash") == row["content_hash"]:
+                continue
+            target[key] = dict(row)
+            self.rowcount += 1
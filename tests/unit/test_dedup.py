@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+from src.utils.dedup import (
+    normalize_for_dedup,
+    minhash_signatures,
+    find_duplicate_groups,
+    assign_dup_groups,
+    group_representatives,
+    fan_out
+)
+
+def _jaccard(a, b, k=5):
+    sa = {a[i:i + k] for i in range(len(a) - k + 1)}
+    sb = {b[i:i + k] for i in range(len(b) - k + 1)}
+    return len(sa & sb) / len(sa | sb)
+
+def test_normalize_for_dedup():
+    assert normalize_for_dedup("  Great   APP!! ") == "great app"
+    assert normalize_for_dedup("😊 ሰላም") == "😊 ሰላም"
+    assert normalize_for_dedup(None) == ""
+
+def test_minhash_estimates_jaccard():
+    a = "the app keeps crashing after the last update please fix the login"
+    b = "the app keeps crashing after the latest update please fix login"
+    signatures, eligible = minhash_signatures([a, b, "ok"], num_perm=256)
+    assert eligible.tolist() == [True, True, False]
+    estimate = (signatures[0] == signatures[1]).mean()
+    assert abs(estimate - _jaccard(a, b)) < 0.1
+    assert not signatures[2].any()
+
+def test_find_duplicate_groups_exact_and_near():
+    texts = [
+        "Great app!!",
+        "The app keeps crashing after the last update, please fix it now",
+        "great  app",
+        "the app keeps crashing after the last update please fix it now!!!",
+        "Cannot transfer money to telebirr since yesterday",
+        "the app keeps crashing after the last update please fix it now thanks",
+        None
+    ]
+    groups = find_duplicate_groups(texts)
+    assert groups.tolist() == [0, 1, 0, 1, 2, 1, 3]
+
+def test_unrelated_texts_stay_apart():
+    rng = np.random.default_rng(0)
+    words = "app bank transfer crash slow update login otp money account".split()
+    words = np.array(words)
+    texts = [" ".join(rng.choice(words, 12)) for _ in range(300)]
+    groups = find_duplicate_groups(texts, threshold=0.9)
+    assert len(set(groups)) == len(set(texts))
+
+def test_representatives_fan_out():
+    df = pd.DataFrame({
+        "review_clean": ["good app", "Good app!", "slow"], "rating": [5, 4, 1]
+    })
+    df = assign_dup_groups(df)
+    reps = group_representatives(df)
+    assert len(reps) == 2
+    scored = reps.assign(sentiment_label=["POSITIVE", "NEGATIVE"])
+    result = fan_out(df, scored, ["sentiment_label"])
+    assert result["sentiment_label"].tolist() == ["POSITIVE", "POSITIVE", "NEGATIVE"]
+    assert result.index.equals(df.index)
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BATCH_MODULES = ["src.utils.utils", "src.utils.keyword_text_processor"]
+# Loaded on first use only; importing them eagerly costs seconds per process
+LAZY_MODULES = {
+    "seaborn", "matplotlib", "nltk", "emoji", "wordcloud", "torch", "transformers"
+}
+# Generous on purpose (pandas alone is most of it); override on slow machines
+BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+def _importtime(modules):
+    """
+    Runs `python -X importtime` in a fresh interpreter and returns
+    {module: cumulative microseconds}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+def test_batch_modules_do_not_import_heavy_dependencies():
+    timings = _importtime(BATCH_MODULES)
+    loaded = {name.split(".")[0] for name in timings}
+    assert not loaded & LAZY_MODULES
+
+def test_batch_modules_import_within_budget():
+    timings = _importtime(BATCH_MODULES)
+    total_ms = sum(timings[name] for name in BATCH_MODULES) / 1000
+    assert total_ms < BUDGET_MS, (
+        f"startup took {total_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+    )
@@ -0,0 +1,64 @@
+import json
+import time
+import pytest
+from src.utils import instrumentation
+from src.utils.instrumentation import instrumented, measure
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    saved = instrumentation.current_config()
+    instrumentation.reset()
+    yield
+    instrumentation.configure(**saved)
+    instrumentation.reset()
+
+@instrumented(rows="items", batch_size="batch_size")
+def process(items, batch_size=10):
+    time.sleep(0.02)
+    return [item * 2 for item in items]
+
+def _metrics(stage):
+    return next(
+        record for record in instrumentation.snapshot() if record["stage"] == stage
+    )
+
+def test_instrumented_records_rows_time_memory_and_batch_size():
+    assert process([1, 2, 3]) == [2, 4, 6]
+    process(list(range(7)), batch_size=4)
+    metrics = _metrics("process")
+    assert metrics["calls"] == 2
+    assert metrics["rows"] == 10
+    assert metrics["seconds"] >= 0.04
+    assert metrics["rows_per_second"] == pytest.approx(10 / metrics["seconds"])
+    assert metrics["batch_size"] == 4
+    assert metrics["peak_memory_bytes"] > 0
+
+def test_measure_and_disable():
+    with measure("block") as record:
+        record.rows = 5
+    assert _metrics("block")["rows"] == 5
+
+    instrumentation.configure(enabled=False)
+    process([1])
+    stages = [record["stage"] for record in instrumentation.snapshot()]
+    assert "process" not in stages
+
+def test_exports(tmp_path):
+    process([1, 2])
+    instrumentation.export_metrics(str(tmp_path / "metrics.json"))
+    instrumentation.export_metrics(str(tmp_path / "metrics.prom"))
+    assert json.loads((tmp_path / "metrics.json").read_text())[0]["stage"] == "process"
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE cea_stage_seconds_total counter" in prom
+    assert 'cea_stage_rows_total{stage="process"} 2' in prom
+
+def test_merge_adds_worker_metrics():
+    process([1])
+    instrumentation.merge([dict(_metrics("process"), calls=3, rows=30)])
+    assert _metrics("process")["calls"] == 4
+    assert _metrics("process")["rows"] == 31
+
+def test_profile_hook_writes_cprofile_stats(tmp_path):
+    instrumentation.configure(profile_stage="process", profile_dir=str(tmp_path))
+    process([1])
+    assert (tmp_path / "process.prof").exists()
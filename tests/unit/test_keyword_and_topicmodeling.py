@@ -1,5 +1,11 @@
 import numpy as np
-from src.models.keyword_and_topicmodeling import extract_topic_keywords, map_topics_to_labels
+from types import SimpleNamespace
+from src.models.keyword_and_topicmodeling import (
+    extract_topic_keywords,
+    map_topics_to_labels,
+    BankTopicModel,
+    OnlineBankTopicModel
+)
 
 class MockLDA:
     def __init__(self):
@@ -21,4 +27,115 @@ def test_map_topics_to_labels():
     X = np.zeros((2, 3))
     theme_labels = {0: "Fruit", 1: "Veggie"}
     labels = map_topics_to_labels(lda, X, theme_labels)
-    assert labels == [["Veggie", "Fruit"], ["Fruit", "Veggie"]] 
\ No newline at end of file
+    assert labels == [["Veggie", "Fruit"], ["Fruit", "Veggie"]] 
+
+def test_bank_topic_model_round_trip(tmp_path):
+    texts = [
+        "app keep crashing after update", "cannot transfer money telebirr today",
+        "best mobile banking app ethiopia", "app keep crashing every login",
+        "transfer money telebirr fail again", "best mobile banking app ever"
+    ] * 5
+    model = BankTopicModel(
+        "dashen", tfidf_params={"max_df": 1.0},
+        lda_params={"n_components": 2, "max_iter": 10}
+    )
+    model.fit(texts)
+    model.theme_labels = {0: "Reliability", 1: "Transfers"}
+    expected = model.transform(texts[:3])
+    model.save(str(tmp_path))
+
+    assert (tmp_path / "dashen_theme_map.json").exists()
+    loaded = BankTopicModel.load("dashen", str(tmp_path))
+    assert loaded.theme_labels == {0: "Reliability", 1: "Transfers"}
+    assert loaded.transform(texts[:3]) == expected
+    unseen = loaded.transform(["totally unseen words here"])
+    assert all(len(themes) == 2 for themes in unseen)
+
+def _topic_corpus(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    phrases = [
+        [
+            "app keep crashing after update", "crash every login screen",
+            "app crash open again"
+        ],
+        [
+            "transfer money telebirr fail", "cannot send money account",
+            "transfer failed money deducted"
+        ],
+        [
+            "best mobile banking app", "excellent easy use app",
+            "great fast simple service"
+        ]
+    ]
+    return [" ".join(rng.choice(phrases[rng.integers(3)], 2)) for _ in range(n)]
+
+def test_online_topic_model_keeps_batch_topics(tmp_path):
+    texts = _topic_corpus()
+    batch = BankTopicModel(
+        "cbe", tfidf_params={"max_df": 1.0},
+        lda_params={"n_components": 3, "max_iter": 10}
+    )
+    batch.fit(texts)
+    batch.theme_labels = {0: "Crashes", 1: "Transfers", 2: "Praise"}
+    reference = [themes[0] for themes in batch.transform(texts[:300])]
+
+    online = OnlineBankTopicModel.from_batch(
+        batch, hashing_params={"n_features": 2**14}, max_df=1.0
+    )
+    online.fit(_topic_corpus(seed=1), chunk_size=200)
+    updated = [themes[0] for themes in online.transform(texts[:300])]
+    assert np.mean(np.array(updated) == np.array(reference)) > 0.9
+
+    online.save(str(tmp_path))
+    loaded = OnlineBankTopicModel.load("cbe", str(tmp_path))
+    assert loaded.n_docs == online.n_docs
+    assert [themes[0] for themes in loaded.transform(texts[:300])] == updated
+    assert len(loaded.topic_keywords(top_n=3)["Topic 1"]) == 3
+
+def test_online_partial_fit_only_analyses_texts_with_new_buckets():
+    online = OnlineBankTopicModel(
+        "cbe", hashing_params={"n_features": 2**14}, lda_params={"n_components": 3}
+    )
+    hashed = []
+    buckets = online._buckets
+    online._buckets = lambda terms: hashed.append(sorted(terms)) or buckets(terms)
+    texts = _topic_corpus(200)
+    online.partial_fit(texts)
+    online.partial_fit(texts[::-1])
+    assert len(hashed) == 1 and hashed[0]  # the repeat pass hashes nothing
+
+    new_text = "brand new words appear here today"
+    online.partial_fit(texts[:50] + [new_text])
+    assert hashed[-1] == sorted(online.vectorizer.build_analyzer()(new_text))
+    assert len(online.bucket_terms) <= online.vectorizer.n_features
+    assert not hasattr(online, "seen_terms")
+
+class ZeroRowLDA(MockLDA):
+    def transform(self, X):
+        return np.array([[0.2, 0.8], [0.0, 0.0], [0.7, 0.3]])[:X.shape[0]]
+
+def test_map_topics_to_labels_keeps_empty_docs_aligned():
+    labels = map_topics_to_labels(
+        ZeroRowLDA(), np.zeros((3, 3)), {0: "Fruit", 1: "Veggie"}
+    )
+    assert labels == [["Veggie", "Fruit"], None, ["Fruit", "Veggie"]]
+
+def test_vectorized_top_k_matches_argsort():
+    rng = np.random.default_rng(3)
+    components = rng.integers(0, 5, size=(6, 40)).astype(float)  # plenty of ties
+    names = [f"w{i}" for i in range(40)]
+    result = extract_topic_keywords(
+        SimpleNamespace(components_=components), names, top_n=7
+    )
+    for topic_idx, topic in enumerate(components):
+        expected = [names[i] for i in topic.argsort(kind="stable")[:-8:-1]]
+        assert result[f"Topic {topic_idx + 1}"] == expected
+
+    distributions = rng.dirichlet(np.ones(5), size=500)
+    lda = SimpleNamespace(transform=lambda X: distributions[X[:, 0].astype(int)])
+    chunked = map_topics_to_labels(
+        lda, np.arange(500)[:, None], dict(enumerate("ABCDE")), chunk_size=64
+    )
+    assert chunked == [
+        ["ABCDE"[i] for i in dist.argsort()[-3:][::-1]] for dist in distributions
+    ]
@@ -8,4 +8,32 @@ def test_preprocess_for_keywords():
     assert "run" in result  # lemmatized
     assert "%" not in result
     assert "😊" not in result
-    assert "this" not in result  # stopword 
\ No newline at end of file
+    assert "this" not in result  # stopword 
+
+def test_preprocess_column_for_keywords_matches_row_function():
+    import pandas as pd
+    from src.utils.keyword_text_processor import preprocess_column_for_keywords
+    texts = pd.Series([
+        "Wow! This is 100% amazing 😊. Running, runs, ran.",
+        "I cannot login ℹ️ gonna uninstall",
+        "Wow! This is 100% amazing 😊. Running, runs, ran.",
+        "ሰላም 1️⃣ dashen",
+        None,
+    ])
+    result = preprocess_column_for_keywords(texts)
+    assert result.tolist() == [preprocess_for_keywords(t) for t in texts]
+
+def test_preprocess_column_parallel_keeps_order_and_index():
+    import pandas as pd
+    from src.utils.keyword_text_processor import (
+        preprocess_column_parallel,
+        iter_preprocessed_chunks
+    )
+    texts = pd.Series(["Running fast!", None, "Amazing app 😊", "Running fast!"] * 3,
+                      index=range(100, 112), name="review_clean")
+    result = preprocess_column_parallel(texts, chunk_size=5, workers=2)
+    assert result.index.equals(texts.index)
+    assert result.tolist() == [preprocess_for_keywords(t) for t in texts]
+    chunks = iter_preprocessed_chunks(iter(texts.tolist()), chunk_size=5, workers=2)
+    chunks = list(chunks)
+    assert [len(c) for c in chunks] == [5, 5, 2]
@@ -0,0 +1,217 @@
+import threading
+import oracledb
+import pandas as pd
+import pytest
+from src.core import oracle_core
+from src.core.oracle_core import (
+    bulk_execute,
+    load_review_raw,
+    load_review_processed,
+    load_bank_detail,
+    load_rollups,
+    upsert_reviews,
+    incremental_load,
+    load_chunks,
+    load_concurrently,
+    read_high_water_marks,
+    content_hash,
+    INSERT_REVIEW_RAW_SQL,
+    REVIEW_RAW_COLUMNS
+)
+from src.utils.rollups import ReviewRollup
+from tests.fake_oracle import FakeOracleDB
+
+def _processed_df(n=5):
+    banks = ["Dashen Bank", "Bank of Abyssinia (BOA)", "Dashen Bank",
+             "Commercial Bank of Ethiopia (CBE)", "Dashen Bank"]
+    labels = ["POSITIVE", "NEGATIVE", "POSITIVE", "NEGATIVE", "POSITIVE"]
+    return pd.DataFrame({
+        "review_id": [f"id-{i}" for i in range(n)],
+        "review": ["Great app!"] * n,
+        "rating": [5 - i % 5 for i in range(n)],
+        "date": ["2025-07-01"] * n,
+        "bank": [banks[i % 5] for i in range(n)],
+        "source": ["Google Play"] * n,
+        "review_clean": ["Great app!"] * n,
+        "sentiment_label": [labels[i % 5] for i in range(n)],
+        "sentiment_score": [0.9] * n,
+        "keyword_ready": ["great app"] * n,
+        "identified_theme": ["['A', 'B', 'C']"] * n
+    })
+
+def test_bulk_execute_batches_and_commits():
+    db = FakeOracleDB()
+    df = _processed_df(10)
+    conn = db.connect()
+    errors = bulk_execute(
+        conn, INSERT_REVIEW_RAW_SQL, df, REVIEW_RAW_COLUMNS, batch_size=4
+    )
+    assert errors == []
+    assert len(db.table("review_raw")) == 10
+    assert db.commits == 3  # 4 + 4 + 2
+
+def test_bulk_execute_reports_rejected_rows():
+    db = FakeOracleDB()
+    df = _processed_df(5)
+    load_review_raw(df.iloc[:2], conn=db.connect())
+    errors = load_review_raw(df, batch_size=3, conn=db.connect())
+    assert [e["key"] for e in errors] == ["id-0", "id-1"]
+    assert [e["row"] for e in errors] == [0, 1]
+    assert len(db.table("review_raw")) == 5
+
+def test_load_review_processed_binds_clobs_and_dates():
+    db = FakeOracleDB()
+    df = _processed_df(5)
+    df["date"] = pd.to_datetime(df["date"])
+    df.loc[0, "sentiment_score"] = None
+    load_review_processed(df, conn=db.connect())
+    row = db.table("review_processed")["id-0"]
+    assert row["review_date"] == "2025-07-01"
+    assert row["sentiment_score"] is None
+    assert db.input_sizes[1] is oracledb.DB_TYPE_CLOB  # review
+    assert db.input_sizes[10] is oracledb.DB_TYPE_CLOB  # identified_theme
+    assert db.input_sizes[2] is None  # rating
+
+def test_load_bank_detail_summarizes_per_bank():
+    db = FakeOracleDB()
+    load_bank_detail(_processed_df(5), conn=db.connect())
+    table = db.table("bank_detail")
+    assert set(table) == {"BOA", "CBE", "Dashen"}
+    assert table["Dashen"]["num_reviews"] == 3
+    assert table["Dashen"]["positive_sentiment_count"] == 3
+    assert table["BOA"]["negative_sentiment_count"] == 1
+
+def test_load_bank_detail_of_chunks_keeps_totals():
+    db = FakeOracleDB()
+    df = _processed_df(5)
+    rollup = ReviewRollup()
+    for chunk in (df.iloc[:2], df.iloc[2:], df.iloc[3:]):  # the last one reloaded
+        load_bank_detail(chunk, conn=db.connect(), rollup=rollup)
+    assert db.table("bank_detail")["Dashen"]["num_reviews"] == 3
+    assert sum(row["num_reviews"] for row in db.table("bank_detail").values()) == 5
+
+def test_load_rollups_upserts_bank_detail_and_daily_rows():
+    db = FakeOracleDB()
+    df = _processed_df(5)
+    df.loc[4, "date"] = "2025-07-02"
+    rollup = ReviewRollup.from_frame(df)
+    assert load_rollups(rollup, conn=db.connect()) == []
+    rollup.update(_processed_df(5).assign(review_id=[f"new-{i}" for i in range(5)]))
+    # reload replaces, no key collisions
+    assert load_rollups(rollup, conn=db.connect()) == []
+    assert db.table("bank_detail")["Dashen"]["num_reviews"] == 6
+    daily = db.table("bank_review_daily")
+    assert set(daily) == {("BOA", "2025-07-01"), ("CBE", "2025-07-01"),
+                          ("Dashen", "2025-07-01"), ("Dashen", "2025-07-02")}
+    assert daily[("Dashen", "2025-07-01")]["num_reviews"] == 5
+    assert daily[("Dashen", "2025-07-02")]["sentiment_score_std"] == 0
+
+def test_upsert_reviews_is_idempotent_and_skips_unchanged():
+    db = FakeOracleDB()
+    df = _processed_df(5)
+    first = upsert_reviews(df, "review_processed", batch_size=2, conn=db.connect())
+    assert first["merged"] == 5
+    rerun = upsert_reviews(df, "review_processed", batch_size=2, conn=db.connect())
+    assert rerun["merged"] == 0
+    df.loc[3, "review_clean"] = "Edited review"
+    conn = db.connect()
+    edited = upsert_reviews(df, "review_processed", conn=conn)
+    assert edited["merged"] == 1
+    assert db.table("review_processed")["id-3"]["review_clean"] == "Edited review"
+    assert conn.table("review_processed_stage") == {}
+
+def test_content_hash_ignores_dtype_of_equal_values():
+    ints = pd.DataFrame({"rating": [5, 4], "note": ["a", None],
+                         "date": ["2025-07-01", "2025-07-02"]})
+    floats = pd.DataFrame({"rating": [5.0, 4.0], "note": ["a", float("nan")],
+                           "date": pd.to_datetime(["2025-07-01", "2025-07-02"])})
+    columns = ["rating", "note", "date"]
+    assert (content_hash(ints, columns).tolist()
+            == content_hash(floats, columns).tolist())
+    text = ints.assign(note=["a", "None"], rating=[5.5, 4])
+    assert content_hash(text, columns)[1] != content_hash(ints, columns)[1]
+    assert content_hash(text, columns)[0] != content_hash(ints, columns)[0]
+
+def test_incremental_load_only_touches_delta(tmp_path):
+    db = FakeOracleDB()
+    state_path = str(tmp_path / "marks.json")
+    df = _processed_df(5)
+    incremental_load(df, "review_raw", state_path, conn=db.connect())
+    marks = read_high_water_marks(state_path)
+    assert marks["review_raw"]["Dashen Bank"] == "2025-07-01"
+
+    new = _processed_df(2).assign(
+        review_id=["new-0", "new-1"], date=["2025-06-01", "2025-07-02"]
+    )
+    result = incremental_load(
+        pd.concat([df, new]), "review_raw", state_path, conn=db.connect()
+    )
+    assert result["staged"] == 6  # mark day is re-staged, the June review is skipped
+    assert result["merged"] == 1
+    assert "new-0" not in db.table("review_raw")
+    marks = read_high_water_marks(state_path)["review_raw"]
+    assert marks["Bank of Abyssinia (BOA)"] == "2025-07-02"
+    assert marks["Dashen Bank"] == "2025-07-01"
+
+def test_list_themes_are_bound_as_text():
+    db = FakeOracleDB()
+    df = _processed_df(2)
+    df["identified_theme"] = [None, ["A", "B"]]
+    load_review_processed(df, conn=db.connect())
+    assert db.table("review_processed")["id-1"]["identified_theme"] == "['A', 'B']"
+    assert db.table("review_processed")["id-0"]["identified_theme"] is None
+
+@pytest.fixture
+def pooled_db():
+    db = FakeOracleDB(round_trip_latency=0.02)
+    pool = oracle_core.init_pool(pool=db.create_pool(min=1, max=2))
+    yield db, pool
+    oracle_core.close_pool()
+
+def test_loaders_borrow_from_one_pool(pooled_db):
+    db, pool = pooled_db
+    assert oracle_core.init_pool() is pool  # created once per process
+    load_review_raw(_processed_df(3))
+    load_review_processed(_processed_df(3))
+    assert pool.acquired == 2 and pool.busy == 0
+    assert len(db.table("review_raw")) == len(db.table("review_processed")) == 3
+
+def test_load_concurrently_overlaps_pooled_sessions(pooled_db):
+    _, pool = pooled_db
+    df = _processed_df(5)
+    # each job holds its session until the other has one too, so the
+    # barrier only opens (instead of timing out) if the jobs overlap
+    both_connected = threading.Barrier(2, timeout=10)
+
+    def job(chunks, table):
+        def load(conn):
+            both_connected.wait()
+            return load_chunks(chunks, table, conn, batch_size=1)
+        return load
+
+    results = load_concurrently({
+        "review_raw": job([df.iloc[:2], df.iloc[2:]], "review_raw"),
+        "review_processed": job([df], "review_processed")
+    })
+    assert results == {"review_raw": 5, "review_processed": 5}
+    assert pool.max_busy == 2 and pool.busy == 0
+
+def test_incremental_load_chunks_filters_against_starting_marks(tmp_path):
+    db = FakeOracleDB()
+    state_path = str(tmp_path / "marks.json")
+    oracle_core.write_high_water_marks(state_path, {
+        "review_raw": {"Dashen Bank": "2025-06-15"},
+        "review_processed": {"Dashen Bank": "2025-06-10"}
+    })
+    late = _processed_df(1).assign(review_id=["late"], date=["2025-07-01"])
+    early = _processed_df(1).assign(review_id=["early"], date=["2025-06-20"])
+    stale = _processed_df(1).assign(review_id=["stale"], date=["2025-06-01"])
+    sent = load_chunks(
+        [late, early, stale], "review_raw", db.connect(), state_path=state_path
+    )
+    assert sent == 2
+    assert set(db.table("review_raw")) == {"late", "early"}
+    marks = read_high_water_marks(state_path)
+    assert marks["review_raw"] == {"Dashen Bank": "2025-07-01"}
+    # other tables kept
+    assert marks["review_processed"] == {"Dashen Bank": "2025-06-10"}
@@ -0,0 +1,55 @@
+from datetime import date
+import pandas as pd
+from src.utils.parquet_store import (
+    write_reviews,
+    read_reviews,
+    parse_theme_list,
+    scrape_date_from_path
+)
+
+def _processed_df():
+    return pd.DataFrame({
+        "review_id": ["a", "b", "c"],
+        "review": ["Great app", "Too slow", "ok"],
+        "rating": [5, 1, 3],
+        "date": ["2025-07-01", "2025-06-02", "2025-07-03"],
+        "bank": ["Dashen Bank", "Commercial Bank of Ethiopia (CBE)", "Dashen Bank"],
+        "source": ["Google Play"] * 3,
+        "review_clean": ["Great app", "Too slow", "ok"],
+        "sentiment_label": ["POSITIVE", "NEGATIVE", "POSITIVE"],
+        "sentiment_score": [0.99, 0.95, 0.6],
+        "keyword_ready": ["great app", "slow", "ok"],
+        "identified_theme": ["['Speed', 'UX']", "['Speed']", None]
+    })
+
+def test_parse_theme_list():
+    assert parse_theme_list("['A', 'B']") == ["A", "B"]
+    assert parse_theme_list(["A"]) == ["A"]
+    assert parse_theme_list(None) is None
+
+def test_scrape_date_from_path():
+    path = "raw/all_bank_reviews_20250726_131601.csv"
+    assert scrape_date_from_path(path) == date(2025, 7, 26)
+    assert scrape_date_from_path("cleaned_reviews.csv") is None
+
+def test_write_and_read_roundtrip_with_partitions(tmp_path):
+    root = str(tmp_path / "processed")
+    write_reviews(_processed_df(), root, "processed", scrape_date="2025-07-26")
+    df = read_reviews(root).sort_values("review_id").reset_index(drop=True)
+    assert df["identified_theme"].tolist() == [["Speed", "UX"], ["Speed"], None]
+    assert df["rating"].dtype.name.lower() == "int8"
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert set(df["scrape_date"]) == {"2025-07-26"}
+    assert sorted(p.name for p in (tmp_path / "processed").iterdir()) == [
+        "bank=Commercial%20Bank%20of%20Ethiopia%20%28CBE%29", "bank=Dashen%20Bank"
+    ]
+
+def test_read_reviews_projection_and_pushdown(tmp_path):
+    root = str(tmp_path / "processed")
+    write_reviews(_processed_df(), root, "processed", scrape_date="2025-07-26")
+    df = read_reviews(
+        root, columns=["review_id", "review_clean"],
+        filters=[("bank", "=", "Dashen Bank"), ("date", ">=", date(2025, 7, 2))]
+    )
+    assert list(df.columns) == ["review_id", "review_clean"]
+    assert df["review_id"].tolist() == ["c"]
@@ -0,0 +1,155 @@
+import os
+import time
+import pandas as pd
+import pytest
+import src.pipeline
+from src.utils import keyword_text_processor
+from src.pipeline import (
+    Stage,
+    Pipeline,
+    combine,
+    bank_themes,
+    build_pipeline,
+    fit_topic_models,
+    load_reviews,
+    stage_source_files
+)
+
+def make_numbers(n):
+    return list(range(n))
+
+def square(numbers):
+    return [x * x for x in numbers]
+
+def slow_sum(numbers, delay):
+    time.sleep(delay)
+    return sum(numbers)
+
+def meeting_sum(numbers, name, other, marker_dir, timeout=30):
+    # returns only once the `other` branch has started too, so two branches
+    # calling this finish only if they run at the same time
+    open(os.path.join(marker_dir, name), "w").close()
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(os.path.join(marker_dir, other)):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{other} never started while {name} was running")
+        time.sleep(0.01)
+    return sum(numbers)
+
+def total(a, b):
+    return a + b
+
+def _pipeline(tmp_path, n=4, delay=0.5):
+    return Pipeline([
+        Stage("numbers", make_numbers, params={"n": n}),
+        Stage("squares", square, ["numbers"]),
+        Stage("sum_a", slow_sum, ["squares"], {"delay": delay}),
+        Stage("sum_b", slow_sum, ["numbers"], {"delay": delay}),
+        Stage("total", total, ["sum_a", "sum_b"], in_process=True)
+    ], cache_dir=str(tmp_path), workers=2)
+
+def test_pipeline_runs_branches_in_parallel(tmp_path):
+    marker_dir = tmp_path / "markers"
+    marker_dir.mkdir()
+    meet = {"marker_dir": str(marker_dir)}
+    pipeline = Pipeline([
+        Stage("numbers", make_numbers, params={"n": 4}),
+        Stage("squares", square, ["numbers"]),
+        Stage("sum_a", meeting_sum, ["squares"], {**meet, "name": "a", "other": "b"}),
+        Stage("sum_b", meeting_sum, ["numbers"], {**meet, "name": "b", "other": "a"}),
+        Stage("total", total, ["sum_a", "sum_b"], in_process=True)
+    ], cache_dir=str(tmp_path / "cache"), workers=2)
+    results = pipeline.run()
+    assert results["total"] == (0 + 1 + 4 + 9) + (0 + 1 + 2 + 3)
+    assert {t["stage"] for t in pipeline.timings} == {
+        "numbers", "squares", "sum_a", "sum_b", "total"
+    }
+
+def test_pipeline_skips_cached_stages(tmp_path):
+    _pipeline(tmp_path).run()
+    rerun = _pipeline(tmp_path)
+    assert rerun.run()["total"] == 20
+    assert all(t["cached"] for t in rerun.timings)
+
+    changed = _pipeline(tmp_path, n=5)
+    assert changed.run()["total"] == 30 + 10
+    assert not any(t["cached"] for t in changed.timings)
+
+def test_pipeline_rejects_unknown_dependency(tmp_path):
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", square, ["missing"])], cache_dir=str(tmp_path))
+
+def test_fingerprint_follows_the_modules_a_stage_imports(tmp_path, monkeypatch):
+    paths = stage_source_files(bank_themes)
+    files = {path.replace("\\", "/").split("src/")[-1] for path in paths}
+    # imported in the body, and transitively through keyword_text_processor
+    assert {"models/keyword_and_topicmodeling.py", "utils/utils.py"} <= files
+    assert "models/__init__.py" in files
+    assert "models/sentiments.py" not in files
+
+    pipeline = Pipeline([
+        Stage("load", load_reviews, params={"path": "in.csv", "source_hash": None}),
+        Stage("themes", bank_themes, ["load"], {"bank": "Dashen Bank"})
+    ], cache_dir=str(tmp_path))
+    stages = pipeline.stages.items()
+    before = {name: pipeline.fingerprint(stage, []) for name, stage in stages}
+    fingerprint = src.pipeline.file_fingerprint
+    monkeypatch.setattr(src.pipeline, "file_fingerprint", lambda path: (
+        "edited" if path.endswith("keyword_and_topicmodeling.py") else fingerprint(path)
+    ))
+    after = {name: pipeline.fingerprint(stage, []) for name, stage in stages}
+    assert after["load"] == before["load"] and after["themes"] != before["themes"]
+
+def test_topic_models_are_fitted_before_the_cached_theme_stages(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        keyword_text_processor, "preprocess_column_for_keywords",
+        lambda texts: texts.str.lower()
+    )
+    reviews = tmp_path / "reviews.csv"
+    pd.DataFrame({
+        "review": [f"app crash{i} again{i} slow{i} login{i}" for i in range(40)],
+        "bank": "Dashen Bank"
+    }).to_csv(reviews, index=False)
+    themes_dir = tmp_path / "themes"
+    fit = dict(
+        input_path=str(reviews), themes_dir=str(themes_dir), banks=["Dashen Bank"]
+    )
+    assert fit_topic_models(**fit) == ["dashen"]
+    assert fit_topic_models(**fit) == []
+    assert (themes_dir / "dashen_topic_model.joblib").exists()
+
+    def run():
+        pipeline = build_pipeline(
+            str(reviews), str(themes_dir), str(tmp_path / "cache"),
+            banks=["Dashen Bank"], sentiment=False
+        )
+        return pipeline, pipeline.run()
+
+    _, results = run()
+    assert results["combine"]["identified_theme"][0][0].startswith("Topic ")
+    rerun, _ = run()
+    assert all(t["cached"] for t in rerun.timings)
+    # placeholder labels are not saved as if they were a theme map
+    assert not (themes_dir / "dashen_theme_map.json").exists()
+
+def test_combine_aligns_sentiment_and_themes():
+    df = pd.DataFrame({
+        "bank": ["Dashen Bank", "Other", "Bank of Abyssinia (BOA)"],
+        "review_clean": ["a", "b", "c"]
+    })
+    sentiment = pd.DataFrame({
+        "sentiment_label": ["POSITIVE", "NEGATIVE", "NEGATIVE"],
+        "sentiment_score": [0.9, 0.8, 0.7]
+    })
+    dashen = pd.DataFrame(
+        {"keyword_ready": ["a"], "identified_theme": [["UX"]]}, index=[0]
+    )
+    boa = pd.DataFrame(
+        {"keyword_ready": ["c"], "identified_theme": [["Speed"]]}, index=[2]
+    )
+    combined = combine(df, sentiment, dashen, boa)
+    assert combined["bank"].tolist() == ["Dashen Bank", "Bank of Abyssinia (BOA)"]
+    assert combined["sentiment_label"].tolist() == ["POSITIVE", "NEGATIVE"]
+    assert combined["identified_theme"].tolist() == [["UX"], ["Speed"]]
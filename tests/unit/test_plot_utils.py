@@ -0,0 +1,82 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils import plot_utils
+from src.utils.rollups import ReviewRollup
+
+def _reviews(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "review_id": [f"id-{i}" for i in range(n)],
+        "bank": rng.choice(["Dashen Bank", "Bank of Abyssinia (BOA)"], size=n),
+        "date": rng.choice(
+            pd.date_range("2025-06-01", periods=30).strftime("%Y-%m-%d"), size=n
+        ),
+        "rating": rng.integers(1, 6, size=n),
+        "sentiment_label": rng.choice(["POSITIVE", "NEGATIVE"], size=n),
+        "sentiment_score": rng.uniform(0.5, 1, size=n),
+        "keyword_ready": rng.choice(
+            ["great app", "slow app crash", "otp fail"], size=n
+        ),
+        "identified_theme": rng.choice(["['Speed', 'Login']", "['Speed']"], size=n)
+    })
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+def test_trend_table_matches_per_bucket_stats_and_rollups():
+    df = _reviews()
+    before = df.copy()
+    table = plot_utils.sentiment_trend_table(df, freq="W").set_index(["bank", "date"])
+    pd.testing.assert_frame_equal(df, before)  # caller's dates are left as text
+
+    dates = pd.to_datetime(df["date"]).dt.to_period("W").dt.start_time
+    expected = df.groupby(["bank", dates])["sentiment_score"].agg(
+        ["mean", lambda x: x.std(ddof=0), "count"]
+    )
+    assert table["mean"].to_numpy() == pytest.approx(expected["mean"].to_numpy())
+    assert table["std"].to_numpy() == pytest.approx(expected["<lambda_0>"].to_numpy())
+    margin = 1.96 * expected["<lambda_0>"] / np.sqrt(expected["count"])
+    ci_high = (expected["mean"] + margin).to_numpy()
+    assert table["ci_high"].to_numpy() == pytest.approx(ci_high)
+
+    from_rollups = plot_utils.sentiment_trend_table(
+        ReviewRollup.from_frame(df).daily_summary(), freq="W"
+    )
+    assert from_rollups["mean"].to_numpy() == pytest.approx(table["mean"].to_numpy())
+
+def test_keyword_frequencies_count_tokens_per_bank():
+    df = _reviews()
+    frequencies = plot_utils.keyword_frequencies(df)
+    for bank, texts in df.groupby("bank")["keyword_ready"]:
+        expected = pd.Series(" ".join(texts).split()).value_counts().to_dict()
+        assert dict(frequencies[bank]) == expected
+
+def test_theme_and_density_tables():
+    df = _reviews()
+    themes = plot_utils.theme_count_table(df, min_count=0) \
+                       .set_index(["bank", "identified_theme"])["count"]
+    assert themes.xs("Speed", level="identified_theme").sum() == len(df)
+
+    density = plot_utils.rating_score_density(df, score_bins=10)
+    assert density["count"].sum() == len(df)
+    assert density["score_low"].min() >= 0.5 and density["score_high"].max() <= 1
+
+def test_plots_render_from_raw_and_aggregated_inputs():
+    df = _reviews()
+    rollup = ReviewRollup.from_frame(df)
+    assert plot_utils.plot_sentiment_trends(df) is not None
+    trends = plot_utils.plot_sentiment_trends(rollup.daily_summary(), freq="M")
+    assert trends is not None
+    ratings = plot_utils.plot_rating_distributions(df)
+    assert len(ratings.axes[0].lines) == df["bank"].nunique()  # one KDE per bank
+    assert len(plot_utils.plot_keyword_clouds(df)) == 2
+    assert plot_utils.plot_theme_distributions(df) is not None
+    assert plot_utils.plot_sentiment_counts(df) is not None
+    assert plot_utils.plot_sentiment_variability(rollup.bank_summary()) is not None
+    assert plot_utils.plot_sentiment_vs_rating(df) is not None
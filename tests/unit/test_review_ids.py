@@ -0,0 +1,14 @@
+import numpy as np
+from src.utils.review_ids import id_fingerprints, unseen_mask, with_fingerprints
+
+def test_unseen_mask_skips_known_and_repeated_ids():
+    seen = np.sort(id_fingerprints(["a", "b"]))
+    batch = id_fingerprints(["b", "c", "d", "c"])
+    mask = unseen_mask(seen, batch)
+    assert mask.tolist() == [False, False, True, True]  # the last "c" is kept
+
+    seen = with_fingerprints(seen, batch[mask])
+    assert np.all(np.diff(seen.astype(object)) > 0) and len(seen) == 4
+    assert not unseen_mask(seen, id_fingerprints(["a", "b", "c", "d"])).any()
+    empty = np.empty(0, dtype=np.uint64)
+    assert unseen_mask(empty, batch).tolist() == [True, False, True, True]
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.review_index import ReviewIndex, varbyte_encode, varbyte_decode
+
+WORDS = ["otp", "login", "slow", "transfer", "great", "app", "crash"]
+THEMES = ["Account Access", "Transaction Performance", "User Experience"]
+
+def _reviews(n, start=0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "review_id": [f"id-{i}" for i in range(start, start + n)],
+        "review": ["text"] * n,
+        "rating": rng.integers(1, 6, size=n),
+        "date": rng.choice(
+            pd.date_range("2025-05-01", periods=90).strftime("%Y-%m-%d"), size=n
+        ),
+        "bank": rng.choice(["Dashen Bank", "Bank of Abyssinia (BOA)"], size=n),
+        "sentiment_label": rng.choice(["POSITIVE", "NEGATIVE"], size=n),
+        "sentiment_score": rng.uniform(0.5, 1, size=n),
+        "keyword_ready": [" ".join(rng.choice(WORDS, size=3)) for _ in range(n)],
+        "identified_theme": [
+            str(rng.choice(THEMES, size=2, replace=False).tolist()) for _ in range(n)
+        ]
+    })
+
+def _scan(df, word=None, theme=None, bank=None, sentiment=None, since=None):
+    keep = pd.Series(True, index=df.index)
+    if word:
+        keep &= df["keyword_ready"].str.split().map(lambda words: word in words)
+    if theme:
+        keep &= df["identified_theme"].str.contains(f"'{theme}'", regex=False)
+    if bank:
+        keep &= df["bank"] == bank
+    if sentiment:
+        keep &= df["sentiment_label"] == sentiment
+    if since:
+        keep &= pd.to_datetime(df["date"]) >= since
+    return set(df.loc[keep, "review_id"])
+
+def test_varbyte_round_trip():
+    values = np.array([0, 1, 127, 128, 16383, 16384, 2**28, 2**34])
+    encoded, nbytes = varbyte_encode(values)
+    assert nbytes.tolist() == [1, 1, 1, 2, 2, 3, 5, 5]
+    assert varbyte_decode(encoded).tolist() == values.tolist()
+
+@pytest.mark.parametrize("query", [
+    {"word": "otp"},
+    {
+        "word": "otp", "bank": "Bank of Abyssinia (BOA)", "sentiment": "NEGATIVE",
+        "since": "2025-06-01"
+    },
+    {"theme": "Account Access", "sentiment": "POSITIVE"},
+    {"bank": "Dashen Bank", "since": "2025-07-01"},
+])
+def test_search_matches_a_pandas_scan(query):
+    df = _reviews(500)
+    index = ReviewIndex.from_frame(df)
+    found = index.search(
+        keywords=query.get("word", ()), themes=query.get("theme", ()),
+        bank=query.get("bank"), sentiment=query.get("sentiment"),
+        since=query.get("since")
+    )
+    assert len(found) == len(set(found))
+    assert set(found) == _scan(df, **query)
+
+def test_any_match_rating_filter_and_rows():
+    df = _reviews(300)
+    index = ReviewIndex.from_frame(df)
+    found = set(index.search(keywords=["otp", "crash"], rating=[1, 2], match="any"))
+    expected = _scan(df, word="otp") | _scan(df, word="crash")
+    assert found == expected & set(df.loc[df["rating"] <= 2, "review_id"])
+
+    rows = index.rows(themes=["User Experience"], until="2025-05-31",
+                      columns=["review_id", "identified_theme"])
+    assert all("User Experience" in themes for themes in rows["identified_theme"])
+    assert len(index.search(keywords=["unknownword"])) == 0
+
+def test_incremental_updates_save_load_and_compact(tmp_path):
+    df = _reviews(400)
+    index = ReviewIndex()
+    assert index.update(df.iloc[:250]) == 250
+    index.save(tmp_path)
+    index = ReviewIndex.load(tmp_path)
+    assert index.update(df.iloc[200:]) == 150  # id-200..id-249 were indexed already
+    assert len(index.segments) == 2
+    expected = _scan(df, word="login", bank="Dashen Bank")
+    assert set(index.search(keywords="login", bank="Dashen Bank")) == expected
+
+    index.save(tmp_path, max_segments=1)  # compacts into one segment
+    loaded = ReviewIndex.load(tmp_path)
+    assert len(loaded.segments) == 1 and len(loaded) == 400
+    assert set(loaded.search(keywords="login", bank="Dashen Bank")) == expected
+    assert len(list(tmp_path.glob("segment-*"))) == 1
+    assert ReviewIndex.load(tmp_path / "missing").update(df.iloc[:10]) == 10
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.utils.rollups import ReviewRollup
+
+def _reviews(n, start=0, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "review_id": [f"id-{i}" for i in range(start, start + n)],
+        "bank": rng.choice(["Dashen Bank", "Bank of Abyssinia (BOA)"], size=n),
+        "date": rng.choice(["2025-07-01", "2025-07-02", "2025-07-03"], size=n),
+        "rating": rng.integers(1, 6, size=n),
+        "sentiment_label": rng.choice(["POSITIVE", "NEGATIVE"], size=n),
+        "sentiment_score": rng.uniform(0.5, 1, size=n)
+    })
+
+def test_incremental_updates_match_a_full_recompute():
+    df = _reviews(300)
+    rollup = ReviewRollup()
+    for start in range(0, 300, 70):
+        rollup.update(df.iloc[start:start + 70])
+    summary = rollup.bank_summary().set_index("bank")
+
+    expected = df.groupby("bank").agg(
+        num_reviews=("review_id", "count"),
+        avg_rating=("rating", "mean"),
+        avg_sentiment_score=("sentiment_score", "mean"),
+        sentiment_score_std=("sentiment_score", lambda x: x.std(ddof=0))
+    )
+    for column in expected:
+        assert summary[column].to_numpy() == pytest.approx(expected[column].to_numpy())
+    positives = (df["sentiment_label"] == "POSITIVE").groupby(df["bank"]).sum()
+    assert summary["positive_count"].tolist() == positives.tolist()
+    assert len(rollup.daily_summary()) == 6
+
+def test_reloading_reviews_does_not_double_count():
+    rollup = ReviewRollup()
+    assert rollup.update(_reviews(50)) == 50
+    assert rollup.update(_reviews(60)) == 10  # id-0..id-49 were folded already
+    assert rollup.bank_summary()["num_reviews"].sum() == 60
+
+def test_merged_shards_equal_one_rollup():
+    left, right = _reviews(40, seed=1), _reviews(40, start=40, seed=2)
+    merged = ReviewRollup.from_frame(left).merge(ReviewRollup.from_frame(right))
+    whole = ReviewRollup.from_frame(pd.concat([left, right]))
+    pd.testing.assert_frame_equal(merged.daily, whole.daily)
+    assert merged.update(right) == 0
+
+def test_save_and_load_round_trip(tmp_path):
+    rollup = ReviewRollup.from_frame(_reviews(30))
+    rollup.save(tmp_path)
+    loaded = ReviewRollup.load(tmp_path)
+    pd.testing.assert_frame_equal(loaded.daily, rollup.daily)
+    assert loaded.update(_reviews(30)) == 0
+    assert ReviewRollup.load(tmp_path / "missing").daily.empty
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+import numpy as np
+from src.models.keyword_and_topicmodeling import BankTopicModel
+from src.services.scoring_service import MicroBatcher, ReviewScorer, ScoringService
+
+class LengthSentiment:
+    """POSITIVE for texts with an even number of characters."""
+    def score(self, texts):
+        even = np.array([len(text) % 2 == 0 for text in texts])
+        labels = np.where(even, "POSITIVE", "NEGATIVE").astype(object)
+        return labels, np.where(even, 0.9, 0.8)
+
+def _topic_model():
+    texts = [
+        "app keep crashing after update", "cannot transfer money telebirr today",
+        "best mobile banking app ethiopia", "app keep crashing every login",
+        "transfer money telebirr fail again", "best mobile banking app ever"
+    ] * 5
+    model = BankTopicModel(
+        "dashen", tfidf_params={"max_df": 1.0},
+        lda_params={"n_components": 3, "max_iter": 10}
+    )
+    model.fit(texts)
+    model.theme_labels = {0: "Reliability", 1: "Transfers", 2: "Experience"}
+    return model
+
+async def _request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+    )
+    writer.write(head.encode() + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    response = json.loads(await reader.read())
+    writer.close()
+    return int(head.split()[1]), response
+
+def test_micro_batcher_groups_concurrent_submits():
+    sizes = []
+
+    def process(items):
+        sizes.append(len(items))
+        return [item * 10 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch=4, max_wait=0.05)
+        batcher.start()
+        results = await asyncio.gather(*(batcher.submit([i]) for i in range(10)))
+        start = time.perf_counter()
+        alone = await batcher.submit([99])
+        waited = time.perf_counter() - start
+        await batcher.stop()
+        return results, alone, waited, batcher.stats()
+
+    results, alone, waited, stats = asyncio.run(run())
+    assert results == [[i * 10] for i in range(10)]
+    assert sizes[:3] == [4, 4, 2] and alone == [990]
+    assert 0.04 < waited < 0.5  # a lone item waits max_wait for company
+    assert stats["batches"] == 4 and stats["items"] == 11
+
+def test_micro_batcher_fails_every_item_of_a_failed_batch():
+    def process(items):
+        raise RuntimeError("model crashed")
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch=8, max_wait=0.01)
+        batcher.start()
+        outcomes = await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+        )
+        await batcher.stop()
+        return outcomes
+
+    assert all(isinstance(outcome, RuntimeError) for outcome in asyncio.run(run()))
+
+def test_service_scores_reviews_over_http():
+    model = _topic_model()
+    scorer = ReviewScorer(
+        LengthSentiment(), {"dashen": model},
+        keyword_preprocessor=lambda texts: texts.str.lower()
+    )
+
+    async def run():
+        service = ScoringService(scorer, max_batch=16, max_wait=0.01)
+        _, port = await service.start("127.0.0.1", 0)
+        responses = await asyncio.gather(
+            _request(port, "POST", "/score", {"reviews": [
+                {"review": "App keep crashing after update", "bank": "Dashen Bank"},
+                {"review": "<b>nice</b>", "bank": "Unknown Bank"}
+            ]}),
+            _request(port, "POST", "/score",
+                     {"review": "transfer money telebirr fail", "bank": "dashen"}),
+            _request(port, "POST", "/score", {"reviews": "not a list of objects"}),
+            _request(port, "POST", "/score", {"review": "ok", "bank": ["dashen"]}),
+            _request(port, "POST", "/score", {"review": 5, "bank": "dashen"}),
+            _request(port, "GET", "/health"),
+            _request(port, "GET", "/missing")
+        )
+        await service.stop()
+        return responses
+
+    responses = asyncio.run(run())
+    (status, body), (single_status, single), (bad_status, _) = responses[:3]
+    (bank_status, _), (review_status, _) = responses[3:5]
+    (_, health), (missing_status, _) = responses[5:]
+    assert status == single_status == 200
+    first, second = body["results"]
+    expected = model.transform(["app keep crashing after update"], verbose=False)
+    assert first["themes"] == expected[0]
+    assert len(first["themes"]) == 3
+    # "nice", no model
+    assert second == {
+        "sentiment_label": "POSITIVE", "sentiment_score": 0.9, "themes": None
+    }
+    assert single["results"][0]["themes"] is not None
+    assert bad_status == bank_status == review_status == 400
+    assert missing_status == 404
+    assert health["status"] == "ok" and health["banks"] == ["dashen"]
+
+def test_malformed_requests_get_an_error_and_the_connection_closes():
+    async def send(port, raw):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()  # returns once the server closes
+        writer.close()
+        return int(response.split()[1])
+
+    async def run():
+        service = ScoringService(LengthSentiment(), max_wait=0.01)
+        _, port = await service.start("127.0.0.1", 0)
+        statuses = [
+            await send(port, b"GARBAGE\r\n\r\n"),
+            await send(port, b"POST /score HTTP/1.1\r\nContent-Length: ten\r\n\r\n"),
+            await send(port, b"POST /score HTTP/1.1\r\nContent-Length: -5\r\n\r\n"),
+            await send(
+                port, b"GET / HTTP/1.1\r\nX-Pad: " + b"a" * 70_000 + b"\r\n\r\n"
+            ),
+        ]
+        healthy, _ = await _request(port, "GET", "/health")  # the server is still up
+        await service.stop()
+        return statuses, healthy
+
+    statuses, healthy = asyncio.run(run())
+    assert statuses == [400, 400, 400, 413] and healthy == 200
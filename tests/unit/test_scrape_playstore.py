@@ -0,0 +1,183 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from google_play_scraper.features.reviews import _ContinuationToken
+from scripts import scrape_playstore
+from scripts.scrape_playstore import (
+    ScrapeCheckpoint,
+    CsvPageWriter,
+    SeenReviewIndex,
+    RateLimiter,
+    scrape_app,
+    scrape_all,
+    with_retries
+)
+
+class FakePlayStore:
+    """Serves `total` reviews per app in pages, optionally failing at one call."""
+
+    def __init__(self, total, fail_on_call=None):
+        self.entries = [
+            {
+                "reviewId": str(i), "content": f"review {i}", "score": 5,
+                "at": datetime(2025, 7, 1)
+            }
+            for i in range(total)
+        ]
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def __call__(self, app_id, lang, country, sort, count, filter_score_with,
+                 continuation_token=None):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("connection reset")
+        if continuation_token is not None:
+            start, count = int(continuation_token.token), continuation_token.count
+        else:
+            start = 0
+        page = [
+            dict(entry, reviewId=f"{app_id}-{entry['reviewId']}")
+            for entry in self.entries[start:start + count]
+        ]
+        end = start + len(page)
+        token = _ContinuationToken(
+            str(end) if end < len(self.entries) else None,
+            lang, country, sort, count, filter_score_with, None
+        )
+        return page, token
+
+def _scrape(tmp_path, fetch, checkpoint=None, **kwargs):
+    tmp_path.mkdir(exist_ok=True)
+    checkpoint = checkpoint or ScrapeCheckpoint(
+        str(tmp_path / "checkpoint.json"), str(tmp_path / "out.csv")
+    )
+    counts = scrape_all(
+        {"Bank A": "app.a", "Bank B": "app.b"},
+        checkpoint,
+        requests_per_second=1000,
+        page_size=4,
+        fetch=fetch,
+        backoff=0,
+        **kwargs
+    )
+    return counts, checkpoint
+
+def test_scrape_all_pages_every_app(tmp_path):
+    counts, checkpoint = _scrape(tmp_path, FakePlayStore(total=10))
+    df = pd.read_csv(checkpoint.output_file)
+    assert counts == {"Bank A": 10, "Bank B": 10}
+    assert len(df) == 20 and df["review_id"].is_unique
+    assert list(df.columns) == [
+        "review_id", "review", "rating", "date", "bank", "source"
+    ]
+    assert all(state["done"] for state in checkpoint.state["apps"].values())
+
+def test_max_reviews_caps_each_app(tmp_path):
+    counts, _ = _scrape(tmp_path, FakePlayStore(total=10), max_reviews=6)
+    assert counts == {"Bank A": 6, "Bank B": 6}
+
+def test_interrupted_run_resumes_without_duplicates(tmp_path):
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    writer_path = str(tmp_path / "out.csv")
+    checkpoint = ScrapeCheckpoint(checkpoint_path, writer_path)
+    writer = CsvPageWriter(writer_path)
+    limiter = RateLimiter(1000)
+
+    with pytest.raises(ConnectionError):
+        scrape_app("app.a", "Bank A", writer, checkpoint, limiter, page_size=4,
+                   fetch=FakePlayStore(total=10, fail_on_call=2), retries=0)
+    assert ScrapeCheckpoint.load(checkpoint_path).get("app.a")["count"] == 4
+
+    resumed = ScrapeCheckpoint.load(checkpoint_path)
+    counts, _ = _scrape(tmp_path, FakePlayStore(total=10), checkpoint=resumed)
+    df = pd.read_csv(writer_path)
+    assert counts == {"Bank A": 10, "Bank B": 10}
+    assert len(df) == 20 and df["review_id"].is_unique
+
+def test_with_retries_backs_off_exponentially():
+    delays, attempts = [], []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("timeout")
+        return "ok"
+
+    assert with_retries(flaky, retries=3, backoff=0.5, sleep=delays.append) == "ok"
+    assert delays == [0.5, 1.0]
+
+def test_incremental_scrape_emits_only_new_and_edited_reviews(tmp_path):
+    store = FakePlayStore(total=10)
+    index_dir = str(tmp_path / "index")
+    counts, _ = _scrape(tmp_path / "run1", store, index_dir=index_dir)
+    assert counts == {"Bank A": 10, "Bank B": 10}
+
+    store.entries[3] = dict(store.entries[3], content="edited", at=datetime(2025, 7, 3))
+    store.entries.insert(0, {
+        "reviewId": "new", "content": "fresh", "score": 1, "at": datetime(2025, 7, 2)
+    })
+    store.calls = 0
+    counts, checkpoint = _scrape(tmp_path / "run2", store, index_dir=index_dir)
+
+    df = pd.read_csv(checkpoint.output_file)
+    assert counts == {"Bank A": 2, "Bank B": 2}
+    assert sorted(df["review_id"]) == ["app.a-3", "app.a-new", "app.b-3", "app.b-new"]
+    # pages of 4: the first holds the new review, the second the edit,
+    # the third is all known
+    assert store.calls == 6
+    assert SeenReviewIndex(index_dir, "app.a").newest_at == "2025-07-03T00:00:00"
+
+def test_seen_index_is_saved_every_few_pages_not_every_page(tmp_path, monkeypatch):
+    saves = []
+    save = SeenReviewIndex.save
+    monkeypatch.setattr(
+        SeenReviewIndex, "save", lambda self: saves.append(1) or save(self)
+    )
+    output = str(tmp_path / "out.csv")
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"), output)
+    index_dir = str(tmp_path / "index")
+    scrape = dict(page_size=2, index_dir=index_dir, index_save_every=3, backoff=0)
+
+    count = scrape_app("app.a", "Bank A", CsvPageWriter(output), checkpoint,
+                       RateLimiter(1000), fetch=FakePlayStore(total=10), **scrape)
+    assert count == 10 and len(saves) == 2  # after page 3 and after the last (5th)
+    assert len(SeenReviewIndex(index_dir, "app.a").reviews) == 10
+
+    saves.clear()
+    with pytest.raises(ConnectionError):
+        scrape_app("app.b", "Bank B", CsvPageWriter(output), checkpoint,
+                   RateLimiter(1000), fetch=FakePlayStore(total=10, fail_on_call=3),
+                   retries=0, **scrape)
+    assert len(saves) == 1  # a failed app keeps the index in step with its checkpoint
+    assert len(SeenReviewIndex(index_dir, "app.b").reviews) == 4
+
+def test_failed_requests_are_retried_not_taken_for_the_last_page(
+    tmp_path, monkeypatch
+):
+    calls = []
+
+    def fetch_items(url, app_id, sort, count, score, device, token):
+        calls.append(token)
+        if len(calls) in (2, 3):
+            # google_play_scraper.reviews would turn this into ([], null token)
+            raise ConnectionError("connection reset")
+        start = int(token or 0)
+        end = min(start + count, 10)
+        # raw rows: [reviewId, user, score, _, content, [timestamp]]
+        items = [
+            [f"r{i}", None, 4, None, f"review {i}", [1751328000]]
+            for i in range(start, end)
+        ]
+        return items, str(end) if end < 10 else None
+
+    monkeypatch.setattr(scrape_playstore, "_fetch_review_items", fetch_items)
+    output = str(tmp_path / "out.csv")
+    checkpoint = ScrapeCheckpoint(str(tmp_path / "checkpoint.json"), output)
+    count = scrape_app("app.a", "Bank A", CsvPageWriter(output), checkpoint,
+                       RateLimiter(1000), page_size=4, retries=2, backoff=0)
+
+    df = pd.read_csv(checkpoint.output_file)
+    assert count == 10 and checkpoint.get("app.a")["done"]
+    assert df["review_id"].tolist() == [f"r{i}" for i in range(10)]
+    assert calls == [None, "4", "4", "4", "8"]
@@ -0,0 +1,27 @@
+from src.models.sentiment_cache import SentimentCache, normalize_text
+
+def test_normalize_text():
+    assert normalize_text("  Good   APP \n") == "good app"
+    assert normalize_text(None) == ""
+
+def test_cache_keys_depend_on_model_and_revision():
+    cache = SentimentCache(":memory:", "distilbert", "abc")
+    other = SentimentCache(":memory:", "distilbert", "def")
+    assert cache.key("good app") == cache.key("Good  app")
+    assert cache.key("good app") != other.key("good app")
+
+def test_cache_persists_and_counts(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SentimentCache(path, "distilbert", max_memory_items=1)
+    keys = [cache.key("nice"), cache.key("bad")]
+    assert cache.get_many(keys) == {}
+    cache.put_many({keys[0]: ("POSITIVE", 0.99), keys[1]: ("NEGATIVE", 0.97)})
+    assert len(cache._memory) == 1  # LRU evicted the older entry
+    expected = {keys[0]: ("POSITIVE", 0.99), keys[1]: ("NEGATIVE", 0.97)}
+    assert cache.get_many(keys) == expected
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+    cache.close()
+
+    reopened = SentimentCache(path, "distilbert", max_memory_items=0)
+    assert reopened.get_many(keys[:1]) == {keys[0]: ("POSITIVE", 0.99)}
+    assert reopened.stats()["hit_rate"] == 1.0
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from src.models.sentiments import SentimentScorer
+
+class FakeTokenizer:
+    """Encodes each text as its character codes so batches need padding."""
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        width = max(len(t) for t in texts) or 1
+        ids = torch.zeros((len(texts), width), dtype=torch.long)
+        for row, text in enumerate(texts):
+            ids[row, :len(text)] = torch.tensor([ord(c) for c in text[:max_length]])
+        self.widths.append(width)
+        return FakeEncoding(input_ids=ids)
+
+    def __init__(self):
+        self.widths = []
+
+class FakeEncoding(dict):
+    def to(self, device):
+        return self
+
+class FakeModel(torch.nn.Module):
+    """POSITIVE when the text has an even number of characters."""
+    def __init__(self):
+        super().__init__()
+        self.config = type("Config", (), {"id2label": {0: "NEGATIVE", 1: "POSITIVE"}})
+
+    def forward(self, input_ids):
+        lengths = (input_ids > 0).sum(dim=1)
+        even = (lengths % 2 == 0).float()
+        logits = torch.stack([1 - even, even], dim=1) * 4
+        return type("Output", (), {"logits": logits})
+
+class FakePipeline:
+    def __init__(self):
+        self.tokenizer = FakeTokenizer()
+        self.model = FakeModel()
+        self.device = torch.device("cpu")
+
+def test_sentiment_scorer_keeps_input_order():
+    texts = ["good", "bad app", "nice", None, "terrible service"]
+    scorer = SentimentScorer(FakePipeline(), batch_size=2)
+    labels, scores = scorer.score(texts)
+    assert list(labels) == ["POSITIVE", "NEGATIVE", "POSITIVE", "POSITIVE", "POSITIVE"]
+    assert scores.shape == (5,)
+    assert np.all((scores > 0.5) & (scores <= 1))
+
+def test_sentiment_scorer_buckets_by_length():
+    model = FakePipeline()
+    texts = ["a" * 50, "b", "c" * 49, "d"]
+    SentimentScorer(model, batch_size=2).score(texts)
+    assert model.tokenizer.widths == [1, 50]
+
+def test_sentiment_scorer_only_infers_unseen_texts():
+    from src.models.sentiment_cache import SentimentCache
+    model = FakePipeline()
+    cache = SentimentCache(":memory:", "fake")
+    scorer = SentimentScorer(model, batch_size=8, cache=cache)
+    first, _ = scorer.score(["good", "Good ", "bad app"])
+    assert list(first) == ["POSITIVE", "POSITIVE", "NEGATIVE"]
+    assert len(model.tokenizer.widths) == 1
+    labels, _ = scorer.score(["bad app", "good"])
+    assert list(labels) == ["NEGATIVE", "POSITIVE"]
+    assert len(model.tokenizer.widths) == 1  # served entirely from the cache
+    assert scorer.cache.stats()["misses"] == 2
+
+def test_score_sentiments_parallel_matches_single_process():
+    from src.models.sentiments import score_sentiments_parallel
+    texts = ["good", "bad app", "nice", "terrible service", "ok", "fine"] * 5
+    expected, _ = SentimentScorer(FakePipeline()).score(texts)
+    labels, scores = score_sentiments_parallel(
+        iter(texts), workers=2, shard_size=4, batch_size=3, model_loader=FakePipeline
+    )
+    assert list(labels) == list(expected)
+    assert len(scores) == len(texts)
+
+def test_load_sentiment_model_rejects_unknown_backend():
+    from src.models.sentiments import load_sentiment_model
+    with pytest.raises(ValueError):
+        load_sentiment_model(backend="tensorrt")
+
+def test_label_agreement():
+    from src.models.sentiments import label_agreement
+    reference = (
+        np.array(["POSITIVE", "NEGATIVE", "POSITIVE"]), np.array([0.9, 0.8, 0.7])
+    )
+    candidate = (
+        np.array(["POSITIVE", "POSITIVE", "POSITIVE"]), np.array([0.85, 0.6, 0.7])
+    )
+    report = label_agreement(reference, candidate)
+    assert report["agreement"] == pytest.approx(2 / 3)
+    assert report["flipped"] == 1
+    assert report["max_score_diff"] == pytest.approx(0.05)
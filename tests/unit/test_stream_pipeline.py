@@ -0,0 +1,26 @@
+import pandas as pd
+from scripts.stream_pipeline import main
+from src.core.oracle_core import read_high_water_marks
+from tests.fake_oracle import FakeOracleDB
+
+def test_incremental_stream_loads_every_chunk_of_a_newest_first_csv(tmp_path):
+    csv_path, output = tmp_path / "all_bank_reviews.csv", tmp_path / "out.csv"
+    dates = [f"2025-07-0{day}" for day in range(6, 0, -1)]
+    pd.DataFrame({
+        "review_id": [f"id-{i}" for i in range(6)],
+        "review": [f"review number {i}" for i in range(6)],
+        "rating": [5, 4, 3, 2, 1, 5],
+        "date": dates,
+        "bank": ["Dashen Bank"] * 6,
+        "source": ["Google Play"] * 6
+    }).to_csv(csv_path, index=False)
+    state_path = tmp_path / "marks.json"
+    db = FakeOracleDB()
+
+    main([str(csv_path), "--output", str(output), "--chunksize", "2", "--no-score",
+          "--load", "--state-path", str(state_path)], conn=db.connect())
+
+    assert len(pd.read_csv(output)) == 6
+    assert len(db.table("review_raw")) == 6
+    marks = read_high_water_marks(str(state_path))
+    assert marks["review_raw"] == {"Dashen Bank": "2025-07-06"}
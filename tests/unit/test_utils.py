@@ -29,4 +29,63 @@ def test_clean_review_text():
     assert "<b>" not in cleaned
     assert "http" not in cleaned
     assert "@user" not in cleaned
-    assert "Hello" in cleaned 
\ No newline at end of file
+    assert "Hello" in cleaned 
+
+def test_clean_review_column_matches_clean_review_text():
+    from src.utils.utils import clean_review_column
+    texts = pd.Series([
+        "<b>Hello</b> visit http://test.com @user!",
+        "@<b>bob</b> hi",
+        "@http://x.com ok",
+        "@abchttp://x.com   spaced\nout ",
+        "<b>Hello</b> visit http://test.com @user!",
+        None,
+        "ሰላም 😊 www.boa.com.et",
+    ], index=[10, 11, 12, 13, 14, 15, 16])
+    cleaned = clean_review_column(texts)
+    assert cleaned.index.equals(texts.index)
+    assert cleaned.tolist() == [clean_review_text(t) for t in texts]
+
+def test_iter_data_chunks_uses_compact_dtypes(tmp_path):
+    from src.utils.utils import iter_data_chunks
+    csv_path = tmp_path / "reviews.csv"
+    pd.DataFrame({
+        "review_id": ["a", "b", "c"],
+        "review": ["good", "bad", None],
+        "rating": [5, 1, 3],
+        "date": ["2025-07-01", "2025-07-02", "2025-07-03"],
+        "bank": ["Dashen Bank", "Dashen Bank", "Bank of Abyssinia (BOA)"],
+        "source": ["Google Play"] * 3
+    }).to_csv(csv_path, index=False)
+    chunks = list(iter_data_chunks(str(csv_path), chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    first = chunks[0]
+    assert first["rating"].dtype == "Int8"
+    assert isinstance(first["bank"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_string_dtype(first["review"])
+    assert pd.api.types.is_datetime64_any_dtype(first["date"])
+
+def test_prefetch_reads_ahead_in_order_and_reraises():
+    import threading
+    from src.utils.utils import prefetch
+    produced = []
+    second_ready = threading.Event()
+
+    def numbers():
+        for i in range(3):
+            produced.append(i)
+            if i == 1:
+                second_ready.set()
+            yield i
+
+    iterator = prefetch(numbers())
+    assert next(iterator) == 0
+    assert second_ready.wait(timeout=5)  # produced while the caller holds item 0
+    assert list(iterator) == [1, 2]
+
+    def failing():
+        yield 1
+        raise ValueError("bad chunk")
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        list(prefetch(failing()))